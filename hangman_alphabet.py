@@ -0,0 +1,145 @@
+"""Per-language alphabets and Unicode normalisation of words.
+
+An Alphabet lists the letters a player can guess (at most 32, so the guessed
+and missing letter masks still fit the 64-bit session records). Every other
+character that folds to one of those letters - upper case, accented,
+full-width, final sigma - maps to the same bit, so guessing "e" also reveals
+"é" and "É" in a French word while Spanish keeps "ñ" as a letter of its own.
+
+Words are stored casefolded and NFC-composed with their accents; matching is
+accent-insensitive through fold(). normalize_batch() does a whole chunk of
+words at once: they are joined into one string so casefolding, NFC and the
+whitespace check each run as a single C-level pass; only chunks with stray
+whitespace fall back to collapsing word by word.
+"""
+
+import re
+import string
+import unicodedata
+
+MAX_LETTERS = 32
+NORMALIZE_VERSION = 2   # bump when normalize() changes (invalidates cached imports)
+
+# code points checked for letter variants: Latin (+ supplements and
+# extensions), Greek, Cyrillic, Latin / Greek extended, full-width forms
+_VARIANT_RANGES = ((0x41, 0x250), (0x370, 0x530), (0x1E00, 0x2000), (0xFF21, 0xFF5B))
+
+_SEP = "\0"
+# whitespace that normalize() would change: anything but single inner spaces
+_ODD_SPACE = re.compile(r"[^\S ]|  |^ | $| \0|\0 ")
+
+
+def _casefold(text):
+    # casefold() spells ß as "ss", but German plays ß as a letter of its own
+    if "ß" not in text and "ẞ" not in text:
+        return text.casefold()
+    return "ß".join(part.casefold() for part in text.replace("ẞ", "ß").split("ß"))
+
+
+def _strip_marks(text):
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+def normalize(text):
+    """Casefolded, NFC-composed, whitespace-collapsed form of a word or guess."""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    return " ".join(unicodedata.normalize("NFC", _casefold(text)).split())
+
+
+def normalize_batch(words):
+    """normalize() for a list of words at once."""
+    if not words:
+        return []
+    text = _SEP.join(words)
+    if text.count(_SEP) != len(words) - 1:
+        return [normalize(w) for w in words]     # a word with a NUL in it
+    text = text.lower() if text.isascii() else unicodedata.normalize("NFC", _casefold(text))
+    out = text.split(_SEP)
+    if _ODD_SPACE.search(text):
+        out = [" ".join(w.split()) for w in out]
+    return out
+
+
+class Alphabet:
+    def __init__(self, name, letters):
+        if len(letters) > MAX_LETTERS:
+            raise ValueError(f"alphabet {name!r} has more than {MAX_LETTERS} letters")
+        self.name = name
+        self.letters = letters
+        self.letter_bits = {ch: 1 << i for i, ch in enumerate(letters)}
+        # letters are a superset of a-z: plain ASCII words need no letter check
+        self.latin = set(string.ascii_lowercase) <= set(letters)
+        # every character that counts as a letter -> the letter it guesses
+        self.canonical = dict(zip(letters, letters))
+        for lo, hi in _VARIANT_RANGES:
+            for cp in range(lo, hi):
+                ch = chr(cp)
+                if ch not in self.canonical:
+                    letter = self._fold_char(ch)
+                    if letter is not None:
+                        self.canonical[ch] = letter
+        self.bits = {ch: self.letter_bits[letter] for ch, letter in self.canonical.items()}
+        self._any_letter = re.compile("[" + re.escape("".join(self.canonical)) + "]")
+
+    def _fold_char(self, ch):
+        folded = _casefold(ch)
+        if folded in self.letter_bits:
+            return folded
+        folded = _strip_marks(folded)
+        return folded if folded in self.letter_bits else None
+
+    def word_mask(self, word):
+        bits = self.bits
+        mask = 0
+        for ch in word:
+            mask |= bits.get(ch, 0)
+        return mask
+
+    def mask_letters(self, mask):
+        return [ch for ch, bit in self.letter_bits.items() if mask & bit]
+
+    def fold(self, text):
+        """Accent-insensitive key: every letter variant replaced by its letter."""
+        canonical = self.canonical
+        return "".join(canonical.get(ch, ch) for ch in text)
+
+    def has_letters(self, word):
+        return self._any_letter.search(word) is not None
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {self.letters!r})"
+
+
+# Known alphabets; the position in ALPHABET_NAMES is the code stored in word
+# packs and replay logs, so only ever append to it.
+ALPHABET_NAMES = ("en", "es", "de", "el", "ru")
+_LETTERS = {
+    "en": string.ascii_lowercase,
+    "es": string.ascii_lowercase + "ñ",
+    "de": string.ascii_lowercase + "äöüß",
+    "el": "αβγδεζηθικλμνξοπρστυφχψω",
+    "ru": "абвгдежзийклмнопрстуфхцчшщъыьэюя",    # ё is folded to е
+}
+_alphabets = {}
+
+
+def get_alphabet(name):
+    """Alphabet by name ("en", "es", ...) or pack code (0, 1, ...)."""
+    if isinstance(name, int):
+        if not 0 <= name < len(ALPHABET_NAMES):
+            raise ValueError(f"unknown alphabet code {name}")
+        name = ALPHABET_NAMES[name]
+    alphabet = _alphabets.get(name)
+    if alphabet is None:
+        if name not in _LETTERS:
+            raise ValueError(f"unknown alphabet {name!r} (known: {', '.join(ALPHABET_NAMES)})")
+        alphabet = _alphabets[name] = Alphabet(name, _LETTERS[name])
+    return alphabet
+
+
+def alphabet_code(alphabet):
+    return ALPHABET_NAMES.index(alphabet.name)
+
+
+ENGLISH = get_alphabet("en")
@@ -0,0 +1,479 @@
+"""Streaming analytics over replay logs.
+
+Logs (see hangman_replay.py) are read a block at a time. Every CHUNK games
+become columns: arrays of pool, outcome, wrong attempts, hints, moves and
+play time per game, and one row per letter guess. The columns are folded
+into histograms with Counter / compress / bytes.translate, which do the
+per-row work in C. Totals are kept in a small SQLite database together with
+how far each log has been read, in one transaction per flush, so a re-run
+only reads the games appended since and an interrupted run loses nothing.
+Memory is bounded by the block size and the number of distinct words, not
+by the number of games.
+
+The report has per-word solve rates, letter-guess frequency by guess
+number, hint usage and average wrong attempts per difficulty and category,
+and time-to-solve percentiles per difficulty. Rebalancing re-buckets the
+difficulty of the words played at least --min-games times by the hardness
+score of hangman_scoring.py, and writes a CSV or word pack for choose_word.
+
+    python hangman_analytics.py games.hmr                   # read new games, print the report
+    python hangman_analytics.py games.hmr --json
+    python hangman_analytics.py games.hmr --min-games 20 --out rebalanced.csv --out-pack words.pack
+"""
+
+import json
+import os
+import sqlite3
+import time
+from array import array
+from collections import Counter
+from itertools import chain, compress, repeat
+
+from hangman_engine import INVALID, OVER, REPEAT, HangmanEngine
+from hangman_replay import (ABANDONED, GAME, HINT, LETTER, LOST, MAGIC, OUTCOME_NAMES, VERSION, WON, WORD,
+                            decode_game)
+from hangman_session import CATEGORY_CODES, CATEGORY_NAMES, DIFFICULTY_CODES
+from hangman_words import DIFFICULTIES, any_categories, pair_flags
+
+DEFAULT_DB = os.path.join(os.path.expanduser("~"), ".hangman_analytics.db")
+BLOCK = 1 << 22         # bytes read at a time
+CHUNK = 100_000         # games per column block
+FLUSH = 2_000_000       # games between commits to the database
+MAX_POSITION = 20       # letter guesses after the 20th are counted as the 20th
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    head BLOB NOT NULL,
+    games INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    hints INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counts (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (name, key)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_WORD = """
+INSERT INTO words VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (word) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    wrong = wrong + excluded.wrong,
+    moves = moves + excluded.moves,
+    hints = hints + excluded.hints
+"""
+
+_UPSERT_COUNT = """
+INSERT INTO counts VALUES (?, ?, ?)
+ON CONFLICT (name, key) DO UPDATE SET n = n + excluded.n
+"""
+
+_WON = bytes(int(i == WON) for i in range(256))           # translate tables over outcome bytes
+_FINISHED = bytes(int(i != ABANDONED) for i in range(256))
+
+
+def ms_bucket(ms):
+    """Log-linear histogram bucket: four per power of two (about 19% wide)."""
+    b = ms.bit_length()
+    if b <= 3:
+        return ms
+    return (b - 2) * 4 + ((ms >> (b - 3)) & 3)
+
+
+def bucket_floor(k):
+    """Smallest ms of bucket k."""
+    if k < 8:
+        return k
+    return (4 + k % 4) << (k // 4 - 1)
+
+
+# Reading
+
+class GameColumns:
+    """A block of games as columns."""
+
+    def __init__(self):
+        self.words = []
+        self.pool = array("B")          # difficulty code * 4 + category code
+        self.outcome = array("B")
+        self.wrong = array("B")
+        self.hints = array("B")
+        self.moves = array("H")
+        self.ms = array("I")            # play time up to the last event
+        # one row per letter guess
+        self.position = array("B")      # 1 = first letter guessed in the game
+        self.letters = []
+
+    def __len__(self):
+        return len(self.outcome)
+
+
+def _add_game(logged, game, cols):
+    """Play a decoded game through `game` (a HangmanEngine) and add it to the columns.
+
+    Same dispatch as GameScreen.submit_guess; invalid and repeated guesses
+    are not moves.
+    """
+    game.alphabet = logged.alphabet
+    game.max_attempts = logged.max_attempts
+    game.new_game(logged.word)
+    moves = hints = ms = letter_no = 0
+    positions = cols.position
+    letters = cols.letters
+    for kind, delta, value in logged.events:
+        ms += delta
+        if kind == LETTER or kind == WORD:
+            single = len(value) == 1
+            result = game.guess_letter(value) if single else game.guess_word(value)
+            if result in (INVALID, REPEAT, OVER):
+                continue
+            moves += 1
+            if single:
+                letter_no += 1
+                positions.append(letter_no if letter_no < MAX_POSITION else MAX_POSITION)
+                letters.append(value)
+        elif kind == HINT and not game.over:
+            game.reveal(letter=value)
+            hints += 1
+    cols.words.append(logged.word)
+    cols.pool.append(DIFFICULTY_CODES[logged.difficulty] << 2 | CATEGORY_CODES[logged.category])
+    cols.outcome.append(WON if game.won else LOST if game.lost else ABANDONED)
+    cols.wrong.append(min(game.wrong_attempts, 255))
+    cols.hints.append(min(hints, 255))
+    cols.moves.append(min(moves, 0xFFFF))
+    cols.ms.append(min(ms, 0xFFFFFFFF))
+
+
+def scan(path, offset=0, block=BLOCK, chunk=CHUNK):
+    """Yield (GameColumns, offset after them) for the complete games of a log from `offset` on.
+
+    The last game of the log is only read once it has ended or another game
+    follows it, so a re-run from the returned offset picks it up then.
+    """
+    game = HangmanEngine()
+    with open(path, "rb") as f:
+        head = f.read(5)
+        if head[:4] != MAGIC or len(head) < 5 or head[4] != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} replay log")
+        offset = max(offset, 5)
+        f.seek(offset)
+        data = b""
+        base = offset       # file offset of data[0]
+        pos = 0
+        cols = GameColumns()
+        while True:
+            more = f.read(block)
+            data = data[pos:] + more
+            base += pos
+            pos = 0
+            end = len(data)
+            while pos < end:
+                if data[pos] >> 5 != GAME:
+                    raise ValueError(f"{path}: expected a game at byte {base + pos}")
+                try:
+                    logged, new, ended = decode_game(data, pos)
+                except IndexError:
+                    break       # a varint or header cut off by the block end
+                if not ended:
+                    break       # may go on in the next block
+                _add_game(logged, game, cols)
+                pos = new
+                if len(cols) >= chunk:
+                    yield cols, base + pos
+                    cols = GameColumns()
+            if not more:
+                break
+        if len(cols):
+            yield cols, base + pos
+
+
+# Aggregating
+
+def _weighted(keys, weights):
+    # each key counted `weight` times, all in C
+    return Counter(chain.from_iterable(map(repeat, keys, weights)))
+
+
+class Totals:
+    """Aggregates of the games read since the last flush."""
+
+    def __init__(self):
+        self.games = 0
+        self.words = {}         # word -> [games, wins, wrong, moves, hints] of finished games
+        self.counts = Counter()  # (name, key) -> n
+
+    def add(self, cols):
+        self.games += len(cols)
+        finished = cols.outcome.tobytes().translate(_FINISHED)
+        won = cols.outcome.tobytes().translate(_WON)
+        words = list(compress(cols.words, finished))
+        games = Counter(words)
+        wins = Counter(compress(cols.words, won))
+        wrong = _weighted(words, compress(cols.wrong, finished))
+        moves = _weighted(words, compress(cols.moves, finished))
+        hints = _weighted(words, compress(cols.hints, finished))
+        table = self.words
+        for word, n in games.items():
+            row = table.get(word)
+            if row is None:
+                row = table[word] = [0, 0, 0, 0, 0]
+            row[0] += n
+            row[1] += wins[word]
+            row[2] += wrong[word]
+            row[3] += moves[word]
+            row[4] += hints[word]
+
+        counts = self.counts
+        pool = cols.pool
+        for (p, o), n in Counter(zip(pool, cols.outcome)).items():
+            counts[(f"outcome:{_pool_name(p)}", OUTCOME_NAMES[o])] += n
+        for (p, w), n in Counter(zip(pool, cols.wrong)).items():
+            counts[(f"wrong:{_pool_name(p)}", str(w))] += n
+        for (p, h), n in Counter(zip(pool, cols.hints)).items():
+            counts[(f"hints:{_pool_name(p)}", str(h))] += n
+        solved = compress(zip(pool, map(ms_bucket, cols.ms)), won)
+        for (p, k), n in Counter(solved).items():
+            counts[(f"solve_ms:{DIFFICULTIES[p >> 2]}", str(k))] += n
+        for (pos, letter), n in Counter(zip(cols.position, cols.letters)).items():
+            counts[(f"letter:{pos}", letter)] += n
+
+
+def _pool_name(code):
+    return f"{DIFFICULTIES[code >> 2]}/{CATEGORY_NAMES[code & 3]}"
+
+
+class Analytics:
+    def __init__(self, path=DEFAULT_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _flush(self, totals, source, offset, head, games):
+        with self.conn:
+            self.conn.executemany(_UPSERT_WORD, [(w, *row) for w, row in totals.words.items()])
+            self.conn.executemany(_UPSERT_COUNT, [(name, key, n) for (name, key), n in totals.counts.items()])
+            self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", (source, offset, head, games))
+
+    def update(self, path, progress=None):
+        """Read the games added to a log since the last run; returns how many were read.
+
+        Raises ValueError if the log was rewritten since (it no longer starts
+        with the bytes seen before, or is shorter than what was read).
+        """
+        source = os.path.abspath(path)
+        with open(path, "rb") as f:
+            head = f.read(64)
+        size = os.path.getsize(path)
+        row = self.conn.execute("SELECT offset, head, games FROM sources WHERE path = ?", (source,)).fetchone()
+        offset, games = 0, 0
+        if row is not None:
+            offset, seen, games = row
+            if size < offset or head[:len(seen)] != seen:
+                raise ValueError(f"{path}: log was rewritten since the last run (use a new --db)")
+        totals = Totals()
+        read = 0
+        for cols, end in scan(path, offset):
+            totals.add(cols)
+            read += len(cols)
+            offset = end
+            if progress is not None:
+                progress(read)
+            if totals.games >= FLUSH:
+                games += totals.games
+                self._flush(totals, source, offset, head, games)
+                totals = Totals()
+        games += totals.games
+        self._flush(totals, source, offset, head, games)
+        return read
+
+    # reading the totals
+
+    def counts(self, prefix):
+        """{name suffix: {key: n}} of the counts whose name starts with prefix + ":"."""
+        out = {}
+        for name, key, n in self.conn.execute(
+                "SELECT name, key, n FROM counts WHERE name >= ? AND name < ?", (prefix + ":", prefix + ";")):
+            out.setdefault(name[len(prefix) + 1:], {})[key] = n
+        return out
+
+    def word_rows(self, min_games=1):
+        return self.conn.execute("SELECT word, games, wins, wrong, moves, hints FROM words WHERE games >= ?",
+                                 (min_games,))
+
+    def report(self, min_games=10, top=10):
+        games = self.conn.execute("SELECT coalesce(sum(games), 0) FROM sources").fetchone()[0]
+        pools = {}
+        for pool, outcomes in self.counts("outcome").items():
+            wrong = self.counts("wrong").get(pool, {})
+            hints = self.counts("hints").get(pool, {})
+            n = sum(outcomes.values())
+            hinted = n - hints.get("0", 0)
+            pools[pool] = {
+                "games": n,
+                "won": outcomes.get("won", 0),
+                "lost": outcomes.get("lost", 0),
+                "abandoned": outcomes.get("abandoned", 0),
+                "avg_wrong": sum(int(k) * v for k, v in wrong.items()) / n,
+                "avg_hints": sum(int(k) * v for k, v in hints.items()) / n,
+                "hinted_share": hinted / n,
+            }
+        solve = {}
+        for d, hist in self.counts("solve_ms").items():
+            solve[d] = _percentiles({int(k): v for k, v in hist.items()})
+        letters = {}
+        for pos, hist in self.counts("letter").items():
+            total = sum(hist.values())
+            letters[int(pos)] = [(ch, n / total) for ch, n in Counter(hist).most_common(5)]
+        rates = sorted(((wins / g, wrong / g, g, w) for w, g, wins, wrong, _, _ in self.word_rows(min_games)))
+        return {
+            "games": games,
+            "pools": pools,
+            "time_to_solve_ms": solve,
+            "letters_by_position": dict(sorted(letters.items())),
+            "words_rated": len(rates),
+            "hardest_words": [{"word": w, "games": g, "solve_rate": s, "avg_wrong": a} for s, a, g, w in rates[:top]],
+            "easiest_words": [{"word": w, "games": g, "solve_rate": s, "avg_wrong": a}
+                              for s, a, g, w in rates[::-1][:top]],
+        }
+
+
+def _percentiles(hist, points=(0.5, 0.9, 0.99)):
+    total = sum(hist.values())
+    out = {"solved": total}
+    buckets = sorted(hist.items())
+    for p in points:
+        need = p * total
+        seen = 0
+        for k, n in buckets:
+            seen += n
+            if seen >= need:
+                out[f"p{int(p * 100)}"] = bucket_floor(k)
+                break
+    return out
+
+
+# Rebalancing
+
+def rebalance(analytics, index, min_games):
+    """(ScoredWords, solve rates, avg wrong, scores, words re-bucketed) for a WordIndex.
+
+    Words played at least min_games times get a difficulty from their
+    hardness quantile among those words; the rest keep theirs.
+    """
+    from hangman_scoring import ScoredWords, bucket_thresholds, difficulty_flags, hardness
+    played = {w: (wins / g, wrong / g, moves / g) for w, g, wins, wrong, moves, _ in analytics.word_rows(min_games)}
+    words = index.words
+    n = len(words)
+    nan = float("nan")
+    solve = array("d", [nan]) * n
+    wrong = array("d", [nan]) * n
+    scores = array("d", [nan]) * n
+    ids = []
+    for i in range(n):
+        stats = played.get(words[i])
+        if stats is not None:
+            solve[i], wrong[i] = stats[0], stats[1]
+            scores[i] = hardness(*stats)
+            ids.append(i)
+    dflags = array("B", index.difficulty_flags)
+    cflags = array("B", index.category_flags)
+    if ids:
+        picked = array("d", (scores[i] for i in ids))
+        picked_words = [words[i] for i in ids]
+        thresholds = bucket_thresholds(picked, picked_words)
+        for i, f in zip(ids, difficulty_flags(picked, thresholds, picked_words)):
+            dflags[i] = f
+            cflags[i] = pair_flags(f, any_categories(cflags[i]))
+    scored = ScoredWords(words, dflags, cflags, index.alphabet)
+    return scored, solve, wrong, scores, len(ids)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Aggregate replay logs into play statistics.")
+    parser.add_argument("logs", nargs="*", help="replay logs to read (only games added since the last run)")
+    parser.add_argument("--db", default=DEFAULT_DB, help="where the totals and read offsets are kept")
+    parser.add_argument("--min-games", type=int, default=10, help="games a word needs to be rated")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--pack", help="word pack to rebalance (default: built-in lists)")
+    parser.add_argument("--out", help="write the rebalanced word,difficulty,category CSV here")
+    parser.add_argument("--out-pack", help="compile the rebalanced words into this word pack")
+    args = parser.parse_args(argv)
+
+    analytics = Analytics(args.db)
+    try:
+        for path in args.logs:
+            start = time.perf_counter()
+            try:
+                read = analytics.update(path)
+            except ValueError as e:
+                parser.exit(1, f"error: {e}\n")
+            seconds = time.perf_counter() - start
+            if not args.json:
+                print(f"{path}: {read:,} new games in {seconds:.2f}s ({read / seconds if seconds else 0:,.0f} games/s)")
+        report = analytics.report(args.min_games, args.top)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_report(report)
+
+        if args.out or args.out_pack:
+            from hangman_scoring import write_csv
+            if args.pack:
+                from hangman_pack import open_index
+                index = open_index(args.pack)
+            else:
+                from hangman_words import WORD_INDEX
+                index = WORD_INDEX
+            scored, solve, wrong, scores, rated = rebalance(analytics, index, args.min_games)
+            if not args.json:
+                print(f"rebalanced {rated} of {len(scored)} words")
+            if args.out:
+                write_csv(args.out, scored, solve, wrong, scores)
+            if args.out_pack:
+                from hangman_pack import compile_pack
+                compile_pack(args.out_pack, scored)
+    finally:
+        analytics.close()
+
+
+def _print_report(r):
+    print(f"{r['games']:,} games")
+    print("pool                 games    win%  avg wrong  avg hints  hinted%")
+    for pool, p in sorted(r["pools"].items()):
+        finished = p["won"] + p["lost"]
+        win = p["won"] / finished if finished else 0.0
+        print(f"{pool:<18} {p['games']:>8,} {win:>7.1%} {p['avg_wrong']:>10.2f} {p['avg_hints']:>10.2f}"
+              f" {p['hinted_share']:>8.1%}")
+    print("time to solve (won games)")
+    for d in DIFFICULTIES:
+        s = r["time_to_solve_ms"].get(d)
+        if s:
+            print(f"  {d:<8} {s['solved']:>8,} solved  p50 {s['p50'] / 1000:.1f}s  "
+                  f"p90 {s['p90'] / 1000:.1f}s  p99 {s['p99'] / 1000:.1f}s")
+    print("most guessed letters by guess number")
+    for pos, top in r["letters_by_position"].items():
+        label = f"{pos}+" if pos == MAX_POSITION else str(pos)
+        print(f"  {label:>3}: " + "  ".join(f"{ch} {share:.0%}" for ch, share in top))
+    print(f"{r['words_rated']:,} words rated")
+    for title, key in (("hardest", "hardest_words"), ("easiest", "easiest_words")):
+        if r[key]:
+            print(f"  {title}: " + ", ".join(f"{w['word']} {w['solve_rate']:.0%} ({w['games']})" for w in r[key]))
+
+
+if __name__ == "__main__":
+    main()
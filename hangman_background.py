@@ -0,0 +1,142 @@
+"""Loading word sources off the Tk thread.
+
+BackgroundLoader builds a SourceWatcher (see hangman_reload.py) on a worker
+thread and passes what it has to the UI through a queue, which the Tk loop
+drains with after() (see HangmanApp.load_words):
+
+    ("progress", bytes read, total bytes, words so far)
+    ("pools", partial WordIndex, ready pool keys)   a pool got big enough to play
+    ("done", watcher)                               everything is loaded
+    ("error", message)
+
+A pool is ready once its own words (before fallbacks) number min_pool, so
+the game can start on it while the rest is still loading. Partial pools are
+a subset of the final ones: words only ever gain difficulty / category
+flags, and the final index is rebuilt from all of them. The word store is
+append-only, so the UI can read the words of a partial index while the
+worker keeps adding more.
+
+A thread rather than a process: the store would otherwise have to be copied
+back, and normalising is chunked, so the Tk loop still gets the GIL
+between chunks.
+
+    python hangman_background.py big_words.csv      # print the messages as they come
+"""
+
+import queue
+import threading
+import time
+from array import array
+
+from hangman_alphabet import ENGLISH
+from hangman_loader import DEFAULT_CATEGORY, DEFAULT_DIFFICULTY, add_default_args
+from hangman_reload import SourceWatcher
+from hangman_words import DEFAULT_KEY, WordIndex, base_keys, pool_keys, readonly
+
+MIN_POOL = 50               # words a pool needs before a game can start on it
+PROGRESS_INTERVAL = 0.1     # seconds between progress messages
+
+
+class BackgroundLoader:
+    def __init__(self, paths, alphabet=ENGLISH, min_pool=MIN_POOL, difficulty=DEFAULT_DIFFICULTY,
+                 category=DEFAULT_CATEGORY):
+        self.paths = list(paths)
+        self.alphabet = alphabet
+        self.min_pool = min_pool
+        self.defaults = (difficulty, category)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="hangman-loader", daemon=True)
+        # worker state: base pools of the words seen so far
+        self._base = {key: array("I") for key in pool_keys()}
+        self._seen = 0
+        self._ready = set()
+        self._last_progress = 0.0
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            watcher = SourceWatcher(self.paths, self.alphabet, progress=self._progress,
+                                    difficulty=self.defaults[0], category=self.defaults[1])
+        except ValueError as e:
+            self.queue.put(("error", str(e)))
+        except Exception as e:
+            # anything else would end the thread silently and leave the UI loading forever
+            self.queue.put(("error", f"{type(e).__name__}: {e}"))
+        else:
+            self.queue.put(("done", watcher))
+
+    def _progress(self, store, done, total):
+        # new words only; an older word that gains flags shows up in the final index
+        base = self._base
+        dflags = store.difficulty_flags
+        cflags = store.category_flags
+        n = len(store)
+        for i in range(self._seen, n):
+            for key in base_keys(dflags[i], cflags[i]):
+                base[key].append(i)
+        self._seen = n
+        ready = {key for key, ids in base.items() if len(ids) >= self.min_pool}
+        if ready - self._ready:
+            self._ready = ready
+            self.queue.put(("pools", self._partial_index(store), frozenset(ready)))
+        now = time.monotonic()
+        if now - self._last_progress >= PROGRESS_INTERVAL or done >= total:
+            self._last_progress = now
+            self.queue.put(("progress", done, total, n))
+
+    def _partial_index(self, store):
+        """WordIndex over copies of the ready pools (the live arrays keep growing)."""
+        pools = {key: readonly(array("I", self._base[key])) for key in self._ready}
+        # pools that aren't ready draw from a ready one; the GUI doesn't start games on them
+        stand_in = pools.get(DEFAULT_KEY) or next(iter(pools.values()))
+        for key in pool_keys():
+            pools.setdefault(key, stand_in)
+        pools[DEFAULT_KEY] = stand_in
+        return WordIndex(store, store.difficulty_flags, store.category_flags, pools=pools,
+                         alphabet=self.alphabet)
+
+    def poll(self):
+        """Messages posted since the last call (never blocks)."""
+        out = []
+        while True:
+            try:
+                out.append(self.queue.get_nowait())
+            except queue.Empty:
+                return out
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Load word sources in the background and report progress.")
+    parser.add_argument("sources", nargs="+", help="txt / csv / jsonl files")
+    parser.add_argument("--alphabet", default="en", help="letters the words are played with (en, es, de, el, ru)")
+    parser.add_argument("--min-pool", type=int, default=MIN_POOL)
+    add_default_args(parser)
+    args = parser.parse_args(argv)
+
+    from hangman_alphabet import get_alphabet
+    loader = BackgroundLoader(args.sources, get_alphabet(args.alphabet), args.min_pool,
+                              difficulty=args.difficulty, category=args.category).start()
+    start = time.perf_counter()
+    while True:
+        time.sleep(0.05)
+        for msg in loader.poll():
+            at = f"{time.perf_counter() - start:7.2f}s"
+            if msg[0] == "progress":
+                _, done, total, words = msg
+                print(f"{at}  {done / total if total else 1:5.1%}  {words} words")
+            elif msg[0] == "pools":
+                print(f"{at}  ready: {', '.join(f'{d}/{c}' for d, c in sorted(msg[2]))}")
+            elif msg[0] == "done":
+                print(f"{at}  done: {len(msg[1].store)} words")
+                return
+            else:
+                print(f"{at}  error: {msg[1]}")
+                return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""Micro-benchmarks for the game's hot paths, checked against stored baselines.
+
+Each benchmark times one operation (the median of several repeats, so a
+single noisy repeat doesn't move it either way) and compares it with
+bench_baseline.json. A benchmark that got slower than its baseline by more
+than its threshold is a regression, and the exit status is 1.
+
+--save runs every benchmark several times from a fresh setup and stores, with
+the median, a threshold calibrated from how much the runs varied: steady
+benchmarks get a tight gate, noisy ones a looser one. Baselines without a
+threshold use --threshold (default 30%).
+
+    python hangman_bench.py                  # run and compare
+    python hangman_bench.py -k choose_word   # only benchmarks whose name contains this
+    python hangman_bench.py --save           # record new baselines (after a deliberate change)
+
+The GameScreen / HangmanDrawer benchmarks need Tk. Without a display they
+run under Xvfb if it is installed, otherwise they are reported as skipped.
+Baselines are machine specific; re-save them when moving to other hardware.
+"""
+
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+from hangman_engine import HangmanEngine
+from hangman_scheduler import WordScheduler
+from hangman_words import WORD_INDEX, normalize_list, pool_keys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+THRESHOLD = 0.30
+REPEAT = 15
+CALIBRATE_RUNS = 3
+# calibrated thresholds: NOISE_FACTOR times the observed spread, within these bounds;
+# a benchmark noisier than MAX_THRESHOLD allows is reported at --save, not waved through
+NOISE_FACTOR = 4
+MIN_THRESHOLD = 0.10
+MAX_THRESHOLD = 0.50
+
+# name -> (setup returning the operation to time, needs Tk)
+BENCHMARKS = {}
+
+
+def bench(name, tk=False):
+    def register(setup):
+        BENCHMARKS[name] = (setup, tk)
+        return setup
+    return register
+
+
+def long_phrase(n=40, seed=0):
+    """A phrase of n built-in words, like a long custom "word"."""
+    rng = random.Random(seed)
+    return " ".join(WORD_INDEX.words[rng.randrange(len(WORD_INDEX.words))] for _ in range(n))
+
+
+# Word lists
+
+@bench("normalize_list/100k")
+def _normalize_list():
+    rng = random.Random(0)
+    words = list(WORD_INDEX.words)
+    raw = []
+    for _ in range(100_000):
+        w = rng.choice(words)
+        roll = rng.random()
+        if roll < 0.3:
+            w = w.title()
+        elif roll < 0.4:
+            w = f"  {w.upper()} "
+        elif roll < 0.45:
+            w = w.replace("e", "é")
+        raw.append(w)
+    return lambda: normalize_list(raw)
+
+
+def _choose_word(d, c):
+    # one whole bag cycle per call (the draws and the reshuffle before them), so
+    # every call does the same work however far into the bag the timer started
+    def setup():
+        scheduler = WordScheduler(WORD_INDEX, random.Random(0))
+        draws = range(len(WORD_INDEX.pool(d, c)))
+        choose = scheduler.choose
+
+        def cycle():
+            for _ in draws:
+                choose(d, c)
+        return cycle
+    return setup
+
+
+for _d, _c in pool_keys():
+    bench(f"choose_word/{_d}/{_c}")(_choose_word(_d, _c))
+
+
+# Guess logic (what submit_guess does once the entry is read)
+
+@bench("submit_guess/letters")
+def _guess_letters():
+    game = HangmanEngine(max_attempts=26)
+    phrase = long_phrase()
+    letters = WORD_INDEX.alphabet.letters
+
+    def play():
+        game.new_game(phrase)
+        for ch in letters:
+            game.guess_letter(ch)
+    return play
+
+
+@bench("submit_guess/word")
+def _guess_word():
+    game = HangmanEngine()
+    phrase = long_phrase()
+    wrong = long_phrase(seed=1)
+
+    def play():
+        game.new_game(phrase)
+        game.guess_word(wrong)
+        game.guess_word(phrase.upper())
+    return play
+
+
+@bench("game_view/phrase")
+def _game_view():
+    # GameScreen's display state without the widgets: slots and the sorted guessed list
+    from hangman_gui import GameView
+    game = HangmanEngine(max_attempts=26)
+    phrase = long_phrase()
+    view = GameView()
+    letters = WORD_INDEX.alphabet.letters[::-1]
+
+    def play():
+        game.new_game(phrase)
+        view.new_word(game)
+        for ch in letters:
+            game.guess_letter(ch)
+            view.reveal(game)
+            view.add_guessed(game)
+            view.word_text()
+            view.guessed_text()
+    return play
+
+
+@bench("evil_guess/100k")
+def _evil_guess():
+    # a whole evil-mode game of letter guesses over 100k words of one length
+    from hangman_evil import EvilEngine
+    from hangman_solver import Solver
+    rng = random.Random(0)
+    letters = WORD_INDEX.alphabet.letters
+    words = ["".join(rng.choice(letters) for _ in range(8)) for _ in range(100_000)]
+    game = EvilEngine(Solver(words), max_attempts=26)
+    order = "etaoinshrdlucmfywgpbvkxqjz"
+
+    def play():
+        game.new_game(words[0])
+        for ch in order:
+            game.guess_letter(ch)
+    return play
+
+
+# Tk
+
+_display = None
+
+
+def virtual_display():
+    """Make sure Tk has a display: start Xvfb if there is none. Returns False if impossible."""
+    global _display
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return True
+    if _display is not None:
+        return _display is not False
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        _display = False
+        return False
+    for n in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{n}"):
+            continue
+        proc = subprocess.Popen([xvfb, f":{n}", "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{n}") or proc.poll() is not None:
+                break
+            time.sleep(0.1)
+        if proc.poll() is None:
+            atexit.register(proc.terminate)
+            os.environ["DISPLAY"] = f":{n}"
+            _display = proc
+            return True
+    _display = False
+    return False
+
+
+_app = None
+
+
+def _game_screen(phrase):
+    global _app
+    if _app is None:
+        from hangman_gui import HangmanApp
+        _app = HangmanApp()
+        _app.withdraw()
+        atexit.register(_app.destroy)
+    gs = _app.get_frame("GameScreen")
+    _app.game.max_attempts = 26
+    _app.game.new_game(phrase)
+    gs.index_secret_word()
+    return _app.game, gs
+
+
+@bench("update_word_display/phrase", tk=True)
+def _update_word_display():
+    phrase = long_phrase()
+    game, gs = _game_screen(phrase)
+    letters = game.alphabet.letters
+
+    def reveal():
+        game.new_game(phrase)
+        gs.index_secret_word()
+        for ch in letters:
+            game.guess_letter(ch)
+            gs.update_word_display()
+            gs.render()     # what the idle pass does after each key press
+    return reveal
+
+
+@bench("update_guessed_label/phrase", tk=True)
+def _update_guessed_label():
+    phrase = long_phrase()
+    game, gs = _game_screen(phrase)
+    letters = game.alphabet.letters
+
+    def guess_all():
+        game.new_game(phrase)
+        for ch in letters:
+            game.guess_letter(ch)
+            gs.update_guessed_label()
+            gs.render()
+    return guess_all
+
+
+@bench("drawer/reset+draw_stage", tk=True)
+def _drawer():
+    _, gs = _game_screen("apple")
+    drawer = gs.drawer
+    stages = range(1, len(drawer.PARTS) + 1)
+
+    def game():
+        drawer.reset()
+        for stage in stages:
+            drawer.draw_stage(stage)
+    return game
+
+
+# Running
+
+def samples(op, repeat=REPEAT):
+    """Seconds per call to op, once per repeat."""
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    return [t / number for t in timer.repeat(repeat, number)]
+
+
+def measure(op, repeat=REPEAT):
+    """Median time of one call to op, in seconds."""
+    return statistics.median(samples(op, repeat))
+
+
+def calibrate(setup, runs=CALIBRATE_RUNS, repeat=REPEAT):
+    """(seconds, threshold) from `runs` runs of a benchmark, each from a fresh setup.
+
+    The spread is the larger of how far the run medians are apart and the
+    median absolute deviation of all repeats, relative to the median.
+    """
+    medians = []
+    pooled = []
+    for _ in range(runs):
+        times = samples(setup(), repeat)
+        medians.append(statistics.median(times))
+        pooled.extend(times)
+    seconds = statistics.median(medians)
+    mad = statistics.median(abs(t - seconds) for t in pooled)
+    spread = max(max(medians) - min(medians), mad) / seconds
+    return seconds, min(MAX_THRESHOLD, max(MIN_THRESHOLD, NOISE_FACTOR * spread))
+
+
+def _selected(pattern):
+    """(name, setup) of the benchmarks to run; setup is None where Tk is unavailable."""
+    tk_ok = None
+    for name, (setup, tk) in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        if tk:
+            if tk_ok is None:
+                tk_ok = _tk_available()
+            if not tk_ok:
+                setup = None
+        yield name, setup
+
+
+def run(pattern=None, repeat=REPEAT):
+    """{name: seconds per call, or None if skipped}."""
+    return {name: measure(setup(), repeat) if setup else None for name, setup in _selected(pattern)}
+
+
+def run_calibrated(pattern=None, runs=CALIBRATE_RUNS, repeat=REPEAT):
+    """{name: (seconds per call, threshold), or None if skipped}."""
+    return {name: calibrate(setup, runs, repeat) if setup else None for name, setup in _selected(pattern)}
+
+
+def _tk_available():
+    if not virtual_display():
+        return False
+    import tkinter
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+def load_baseline(path=BASELINE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"benchmarks": {}}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Rows of (name, seconds, baseline seconds, ratio, status)."""
+    rows = []
+    stored = baseline.get("benchmarks", {})
+    for name, seconds in results.items():
+        base = stored.get(name)
+        if seconds is None:
+            rows.append((name, None, None, None, "skipped (no display)"))
+        elif base is None:
+            rows.append((name, seconds, None, None, "no baseline"))
+        else:
+            ratio = seconds / base["seconds"]
+            limit = 1 + min(MAX_THRESHOLD, base.get("threshold", threshold))
+            rows.append((name, seconds, base["seconds"], ratio, "REGRESSION" if ratio > limit else "ok"))
+    return rows
+
+
+def save_baseline(results, path=BASELINE):
+    """Store run_calibrated() results; benchmarks that were not run keep their baselines."""
+    baseline = load_baseline(path)
+    stored = baseline.setdefault("benchmarks", {})
+    for name, result in results.items():
+        if result is not None:
+            seconds, threshold = result
+            stored[name] = {"seconds": seconds, "threshold": round(threshold, 3)}
+    baseline["machine"] = {"python": platform.python_version(), "platform": platform.platform(),
+                           "processor": platform.machine()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _fmt(seconds):
+    if seconds is None:
+        return "-"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths against stored baselines.")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown for baselines without a calibrated threshold, "
+                             "as a fraction (0.3 = 30%%)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baselines, with calibrated thresholds")
+    parser.add_argument("--runs", type=int, default=CALIBRATE_RUNS, help="runs per benchmark with --save")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.save:
+        calibrated = run_calibrated(args.pattern, args.runs, args.repeat)
+        save_baseline(calibrated, args.baseline)
+        noisy = [name for name, result in calibrated.items() if result and result[1] >= MAX_THRESHOLD]
+        if noisy:
+            print(f"too noisy for a tighter threshold than {MAX_THRESHOLD:.0%} (re-save on a quieter "
+                  f"machine): {', '.join(noisy)}", file=sys.stderr)
+        results = {name: result and result[0] for name, result in calibrated.items()}
+    else:
+        results = run(args.pattern, args.repeat)
+    rows = compare(results, load_baseline(args.baseline), args.threshold)
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if args.json:
+        print(json.dumps([{"name": name, "seconds": s, "baseline": b, "ratio": r, "status": status}
+                          for name, s, b, r, status in rows], indent=2))
+    else:
+        width = max(len(row[0]) for row in rows) if rows else 0
+        for name, seconds, base, ratio, status in rows:
+            change = f"{ratio - 1:+.0%}" if ratio is not None else ""
+            print(f"{name:<{width}}  {_fmt(seconds):>10}  {_fmt(base):>10}  {change:>6}  {status}")
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Headless Hangman rules (no tkinter needed).
+
+Guessed letters are kept as a bit mask over the game's alphabet (26 bits for
+English, see hangman_alphabet.py) and the letters still missing from the
+secret word as a second mask, so the win / loss checks are O(1).
+"""
+
+import random
+
+from hangman_alphabet import ENGLISH, normalize
+
+MAX_ATTEMPTS = 6
+
+# results of a move
+INVALID = "invalid"     # not a letter of the alphabet
+REPEAT = "repeat"       # letter was already guessed
+HIT = "hit"             # letter is in the word
+MISS = "miss"           # wrong letter / wrong word
+WIN = "win"             # move solved the word
+LOSS = "loss"           # move used up the last attempt
+OVER = "over"           # game already finished, move ignored
+
+
+class HangmanEngine:
+    def __init__(self, word="", max_attempts=MAX_ATTEMPTS, alphabet=ENGLISH):
+        self.max_attempts = max_attempts
+        self.alphabet = alphabet
+        self.new_game(word)
+
+    def new_game(self, word):
+        self.secret_word = word
+        self.word_mask = self.alphabet.word_mask(word)
+        self.remaining_mask = self.word_mask    # letters still to be found
+        self.guessed_mask = 0
+        self.wrong_attempts = 0
+
+    def restore(self, word, guessed_mask, wrong_attempts):
+        """Resume a game from its guessed-letter mask and wrong attempts."""
+        self.new_game(word)
+        self.guessed_mask = guessed_mask
+        self.remaining_mask = self.word_mask & ~guessed_mask
+        self.wrong_attempts = wrong_attempts
+
+    @property
+    def won(self):
+        return self.remaining_mask == 0
+
+    @property
+    def lost(self):
+        return self.wrong_attempts >= self.max_attempts
+
+    @property
+    def over(self):
+        return self.remaining_mask == 0 or self.wrong_attempts >= self.max_attempts
+
+    @property
+    def guessed_letters(self):
+        return self.alphabet.mask_letters(self.guessed_mask)
+
+    def is_guessed(self, letter):
+        return bool(self.guessed_mask & self.alphabet.bits.get(letter, 0))
+
+    def _miss(self):
+        self.wrong_attempts += 1
+        return LOSS if self.wrong_attempts >= self.max_attempts else MISS
+
+    def guess_letter(self, letter):
+        if self.over:
+            return OVER
+        bit = self.alphabet.bits.get(letter)
+        if bit is None:
+            return INVALID
+        if self.guessed_mask & bit:
+            return REPEAT
+        self.guessed_mask |= bit
+        if self.remaining_mask & bit:
+            self.remaining_mask &= ~bit
+            return HIT if self.remaining_mask else WIN
+        return self._miss()
+
+    def guess_word(self, guess):
+        if self.over:
+            return OVER
+        fold = self.alphabet.fold
+        if fold(normalize(guess)) == fold(normalize(self.secret_word)):
+            self.guessed_mask |= self.word_mask
+            self.remaining_mask = 0
+            return WIN
+        return self._miss()
+
+    def reveal(self, rng=random, letter=None):
+        """Reveal one missing letter (random unless `letter` is given and missing).
+
+        Returns the letter, or None if nothing is left.
+        """
+        if self.over:
+            return None
+        if not self.remaining_mask & self.alphabet.bits.get(letter, 0):
+            letter = rng.choice(self.alphabet.mask_letters(self.remaining_mask))
+        self.guess_letter(letter)
+        return letter
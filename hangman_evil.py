@@ -0,0 +1,268 @@
+"""Evil hangman: the game doesn't commit to a word until it has to.
+
+EvilEngine follows the normal rules (it is a HangmanEngine), but a new game
+only fixes the shape of the word: its length and where any spaces or
+hyphens are. Every pool word of that shape is a candidate. Each letter guess
+splits the candidates into families by the positions where the letter
+occurs, and the game keeps the largest family. Ties go to the family that
+reveals the fewest positions, so a miss wins when it is as large as any hit.
+
+Candidates are a bitset over the pool Solver's bucket of that length (see
+hangman_solver.py). Splitting them is a few big-int AND / XOR operations
+over all candidates at once, and keeping a family is one AND. The word
+lists are never copied or re-bucketed. secret_word is always the first word
+of the current family, so display, hints and the win / loss checks work
+unchanged.
+
+    python hangman_evil.py --difficulty Hard --category Mixed
+"""
+
+import random
+
+from hangman_alphabet import normalize
+from hangman_engine import MAX_ATTEMPTS, HangmanEngine
+from hangman_solver import Solver, _popcount
+
+SCAN = 2048     # hits up to this many are grouped word by word instead of by bitset splits
+
+_NONZERO = bytes([0] + [1] * 255)     # translate table: any set byte -> 1
+
+
+def _ids(x):
+    """Indexes of the set bits of a wide but sparse bitset.
+
+    Each step of peeling bits off a big int costs its full width; scanning
+    its bytes once does not.
+    """
+    data = x.to_bytes((x.bit_length() + 7) // 8, "little")
+    flags = data.translate(_NONZERO)
+    out = []
+    i = flags.find(1)
+    while i >= 0:
+        byte = data[i]
+        while byte:
+            low = byte & -byte
+            out.append(i * 8 + low.bit_length() - 1)
+            byte ^= low
+        i = flags.find(1, i + 1)
+    return out
+
+
+def _from_ids(ids, nbits):
+    # one pass over a bytearray instead of OR-ing a wide 1 << i per id
+    data = bytearray((nbits + 7) // 8)
+    for i in ids:
+        data[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(data, "little")
+
+
+_tables = {}
+
+
+def _scan_families(bucket, hit, letter, best, best_key):
+    table = _tables.get(letter)
+    if table is None:
+        # the letter -> "1", anything else -> "0": a word's family key
+        table = _tables[letter] = {cp: "0" for cp in range(0x41, 0x530)}
+        table[ord(letter)] = "1"
+    words = bucket.words
+    groups = {}
+    for i in _ids(hit):
+        key = words[i].translate(table)
+        ids = groups.get(key)
+        if ids is None:
+            groups[key] = [i]
+        else:
+            ids.append(i)
+    found = None
+    for key, ids in groups.items():
+        rank = (len(ids), -key.count("1"))
+        if rank > best_key:
+            found, best_key = key, rank
+    if found is None:
+        return best
+    mask = sum(1 << p for p, ch in enumerate(found) if ch == "1")
+    return mask, _from_ids(groups[found], hit.bit_length())
+
+
+def largest_family(bucket, candidates, letter, length, hit_only=False):
+    """(position mask, bitset) of the biggest family of `candidates` for `letter`.
+
+    Families are the candidates grouped by the positions where the letter
+    occurs (mask 0: not at all). Among equal sizes the family revealing the
+    fewest positions wins. With hit_only the mask 0 family is left out.
+    Returns None if there is no family.
+    """
+    hit = candidates & bucket.has.get(letter, 0)
+    best = None
+    best_key = (0, 0)
+    if not hit_only and hit != candidates:
+        best = (0, candidates ^ hit)
+        best_key = (_popcount(best[1]), 0)
+    count = _popcount(hit)
+    if count < best_key[0] or not count:
+        # no family of hits can beat the misses
+        return best
+    if count <= SCAN:
+        return _scan_families(bucket, hit, letter, best, best_key)
+    at = bucket.at
+    columns = [(1 << p, at[(p, letter)]) for p in range(length)
+               if (p, letter) in at and hit & at[(p, letter)]]
+    # depth first, bigger half first: a good family is found early and every
+    # block no bigger than it is dropped without being split any further
+    stack = [(hit, count, 0, 0)]
+    while stack:
+        block, size, mask, i = stack.pop()
+        if size < best_key[0] or size == best_key[0] and -_popcount(mask) <= best_key[1]:
+            continue
+        while i < len(columns):
+            bit, column = columns[i]
+            i += 1
+            x = block & column
+            if not x:
+                continue
+            if x == block:
+                mask |= bit
+                continue
+            nx = _popcount(x)
+            rest = (block ^ x, size - nx, mask, i)
+            block, size, mask = x, nx, mask | bit
+            if nx < rest[1]:
+                stack.append((block, size, mask, i))
+                block, size, mask, i = rest
+            else:
+                stack.append(rest)
+            if size < best_key[0]:
+                break
+        else:
+            key = (size, -_popcount(mask))
+            if key > best_key:
+                best, best_key = (mask, block), key
+    return best
+
+
+class EvilEngine(HangmanEngine):
+    def __init__(self, solver, max_attempts=MAX_ATTEMPTS, word=""):
+        self.solver = solver
+        self.bucket = None
+        self.candidates = 0
+        super().__init__(word, max_attempts, solver.alphabet)
+
+    def new_game(self, word):
+        """Start a game over every pool word shaped like `word`.
+
+        Falls back to a normal game on `word` if the solver has no such words.
+        """
+        super().new_game(word)
+        key = self.alphabet.fold(word)
+        self.bucket = bucket = self.solver.buckets.get(len(key))
+        self.candidates = 0
+        if bucket is None:
+            return
+        letters = self.alphabet.letter_bits
+        c = bucket.all
+        for (p, ch), bits in bucket.at.items():
+            if ch not in letters and key[p] in letters:
+                c &= ~bits      # a space or hyphen where the word has a letter
+        for p, ch in enumerate(key):
+            if ch not in letters:
+                c &= bucket.at.get((p, ch), 0)
+        self.candidates = c
+        if c:
+            self._follow()
+
+    @property
+    def candidate_count(self):
+        return _popcount(self.candidates)
+
+    def candidate_words(self, limit=None):
+        words = self.bucket.words if self.bucket else ()
+        ids = _ids(self.candidates)
+        return [words[i] for i in ids[:limit]]
+
+    def _follow(self):
+        # secret_word follows the current family: its first word
+        c = self.candidates
+        word = self.bucket.words[(c & -c).bit_length() - 1]
+        self.secret_word = word
+        self.word_mask = self.alphabet.word_mask(word)
+        self.remaining_mask = self.word_mask & ~self.guessed_mask
+
+    def _narrow(self, letter, hit_only=False):
+        if not self.candidates:
+            return
+        family = largest_family(self.bucket, self.candidates, letter, len(self.secret_word), hit_only)
+        if family is not None:
+            self.candidates = family[1]
+            self._follow()
+
+    def guess_letter(self, letter):
+        bit = self.alphabet.bits.get(letter)
+        if bit is not None and not self.over and not self.guessed_mask & bit:
+            self._narrow(self.alphabet.canonical[letter])
+        return super().guess_letter(letter)
+
+    def guess_word(self, guess):
+        if self.candidates and not self.over:
+            key = self.alphabet.fold(normalize(guess))
+            if len(key) == len(self.secret_word):
+                c = self.candidates
+                at = self.bucket.at
+                for p, ch in enumerate(key):
+                    c &= at.get((p, ch), 0)
+                    if not c:
+                        break
+                if c and c != self.candidates:
+                    # the guess fits, but so does another word: that one becomes the answer
+                    self.candidates ^= c
+                    self._follow()
+        return super().guess_word(guess)
+
+    def reveal(self, rng=random, letter=None):
+        """A hint always reveals: only families containing the letter are kept."""
+        if self.over:
+            return None
+        if not self.remaining_mask & self.alphabet.bits.get(letter, 0):
+            letter = rng.choice(self.alphabet.mask_letters(self.remaining_mask))
+        self._narrow(letter, hit_only=True)
+        HangmanEngine.guess_letter(self, letter)
+        return letter
+
+
+def main(argv=None):
+    import argparse
+    import time
+    from hangman_engine import LOSS, OVER, WIN
+    from hangman_words import MIXED, WORD_INDEX
+    parser = argparse.ArgumentParser(description="Play evil hangman in the terminal.")
+    parser.add_argument("--difficulty", default="Easy")
+    parser.add_argument("--category", default=MIXED)
+    parser.add_argument("--pack", help="word pack to draw from instead of the built-in lists")
+    parser.add_argument("--attempts", type=int, default=MAX_ATTEMPTS)
+    args = parser.parse_args(argv)
+
+    index = WORD_INDEX
+    if args.pack:
+        from hangman_pack import open_index
+        index = open_index(args.pack)
+    solver = Solver.for_pool(index, args.difficulty, args.category)
+    game = EvilEngine(solver, args.attempts, index.choose(args.difficulty, args.category))
+    while not game.over:
+        pattern = " ".join(ch if game.is_guessed(game.alphabet.canonical.get(ch, ch)) or ch not in game.alphabet.bits
+                           else "_" for ch in game.secret_word)
+        print(f"{pattern}   wrong {game.wrong_attempts}/{game.max_attempts}   "
+              f"({game.candidate_count} words still possible)")
+        try:
+            guess = input("guess> ").strip().lower()
+        except EOFError:
+            return
+        start = time.perf_counter()
+        result = game.guess_word(guess) if len(guess) > 1 else game.guess_letter(guess)
+        print(f"  {result} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+        if result in (WIN, LOSS, OVER):
+            break
+    print(f"The word was: {game.secret_word}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,24 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox
+import os
+import queue
 import random
-import string
-
-# Word lists 
-
-easy_fruits = [
-    "apple", "banana", "orange", "grape", "strawberry",
-    "watermelon", "mango", "pineapple", "pear", "peach"
-]
-
-easy_vegetables = [
-    "cucumber", "potato", "carrot", "onion", "sweet potato",
-    "garlic", "beetroot"
-]
-
-medium_fruits = [
-    "kiwifruit", "passion", "pomegranate", "jackfruit", "star fruit"
-]
-
-medium_vegetables = [
-    "cauliflower", "broccoli", "cabbage", "mushrooms", "cucumber",
-    "drumstick", "ladies finger", "sweet potato", "green chilli", "beans"
-]
-
-hard_fruits = [
-    "lychee", "pineapple", "dragon fruit", "pomegranate", "guava",
-    "chikoo", "plum", "blackcurrant", "rambutan", "longan", "sapodilla"
-]
-
-hard_vegetables = [
-    "baby corn", "ginger", "millet", "turmeric", "pumpkin",
-    "asparagus", "artichoke", "zucchini", "radicchio", "kohlrabi"
-]
-
-extreme_fruits = [
-    "ice apple", "jamun", "wood apple",  "avocado",  "miraclefruit"
-]
-
-extreme_vegetables = [
-    "elephant foot", "bottle gourd", "drumsticks",
-    "bitter gourd", "spring onion", "broccoli"
-]
-
-
-def normalize_list(words):
-    seen = set()
-    out = []
-    for w in words:
-        w2 = " ".join(w.lower().strip().split())
-        if w2 not in seen:
-            seen.add(w2)
-            out.append(w2)
-    return out
-
-
-easy_fruits = normalize_list(easy_fruits)
-easy_vegetables = normalize_list(easy_vegetables)
-medium_fruits = normalize_list(medium_fruits)
-medium_vegetables = normalize_list(medium_vegetables)
-hard_fruits = normalize_list(hard_fruits)
-hard_vegetables = normalize_list(hard_vegetables)
-extreme_fruits = normalize_list(extreme_fruits)
-extreme_vegetables = normalize_list(extreme_vegetables)
-
+from bisect import insort
+import sqlite3
+import sys
+import threading
+
+from hangman_alphabet import normalize
+from hangman_engine import HangmanEngine, INVALID, REPEAT, HIT, WIN, LOSS
+from hangman_evil import EvilEngine
+from hangman_instrument import DebugOverlay, Instrumentation
+from hangman_scheduler import WordScheduler
+from hangman_solver import Solver, smart_hint
+from hangman_stats import GameResult, StatsStore
+from hangman_words import WORD_INDEX
 
 # Styling – Colorful Theme
 
@@ -80,26 +35,85 @@ FONT_SUB = ("Segoe UI", 12)
 FONT_TEXT = ("Segoe UI", 11)
 FONT_WORD = ("Consolas", 26)
 
+WINDOW_SIZE = (760, 640)
+PREBUILD_DELAY_MS = 1   # between pre-built screens, so input isn't held up
+
+
+# Startup timing
+
+class StartupTimer:
+    """Import time, time to first frame and time until every screen is built."""
+
+    def __init__(self, import_start, import_done):
+        self.start = import_start
+        self.marks = {"import": import_done}
+        self.budget_ms = None   # warn when "interactive" takes longer
+        self.report = False     # print the timings once interactive
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter()
+        if name == "interactive":
+            if self.report:
+                print(self.summary(), file=sys.stderr)
+            total = self.elapsed_ms("interactive")
+            if self.budget_ms is not None and total > self.budget_ms:
+                print(f"startup budget exceeded: {total:.1f} ms > {self.budget_ms:.1f} ms", file=sys.stderr)
+
+    def elapsed_ms(self, name):
+        t = self.marks.get(name)
+        return None if t is None else (t - self.start) * 1000
+
+    def as_dict(self):
+        return {name: self.elapsed_ms(name) for name in self.marks}
+
+    def summary(self):
+        return "startup: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.as_dict().items())
+
 
 # Main application
 
 class HangmanApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, word_index=None, stats=None, instrumentation=None, replay=None, scheduler=None,
+                 journal=None):
         super().__init__()
         self.title("Hangman Game")
-        self.geometry("760x640")
+        self.geometry("{}x{}".format(*WINDOW_SIZE))
         self.configure(bg=BG)
         self.resizable(False, False)
 
         # Shared state
         self.difficulty = tk.StringVar(value="Easy")
         self.category = tk.StringVar(value="Mixed")
+        self.smart_hints = tk.BooleanVar(value=False)
+        self.evil_mode = tk.BooleanVar(value=False)
         self.max_attempts = 6
-
-        # Game state
-        self.secret_word = ""
-        self.guessed_letters = set()
-        self.wrong_attempts = 0
+        # built-in lists, or a memory-mapped word pack (see hangman_pack.py)
+        self.word_index = word_index if word_index is not None else WORD_INDEX
+        # finished games are recorded here if set (see hangman_stats.py)
+        self.stats = stats
+        # every move is appended here if set (see hangman_replay.py)
+        self.replay = replay
+        # the game in progress, so a restart can put it back (see hangman_journal.py)
+        self.journal = journal
+        # shuffle bag per pool, so "Play Again" doesn't repeat words (see hangman_scheduler.py)
+        self.scheduler = scheduler if scheduler is not None else WordScheduler(self.word_index)
+        # each game gets its own seeded RNG for random hints, so a replay log can reproduce it
+        self.rng = random.Random()
+        self.game_seed = 0
+        self.game_rng = random.Random(0)
+
+        # Game state (rules live in the headless engine)
+        self.game = HangmanEngine(max_attempts=self.max_attempts, alphabet=self.word_index.alphabet)
+        self.plain_game = self.game
+
+        # solvers for smart hints, built per (difficulty, category) on first use
+        self._solvers = {}
+
+        # word files loading in the background (see load_words): the pools a game
+        # can start on so far (None: all of them) and a progress line for the menus
+        self.loader = None
+        self.pools_ready = None
+        self.load_status = tk.StringVar(value="")
 
         # track current frame name (for pause logic)
         self.current_frame_name = None
@@ -108,23 +122,66 @@ class HangmanApp(tk.Tk):
         self.container = tk.Frame(self, bg=BG)
         self.container.pack(fill="both", expand=True)
 
-        # frames dictionary
+        # opt-in handler timing / stall detection (see hangman_instrument.py);
+        # patched before any screen is built so their bindings get the timed methods
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.patch(HangmanApp, "show_frame", "toggle_pause")
+            instrumentation.patch(GameScreen, "submit_guess", "reveal_one_letter", "on_key_press",
+                                  "setup_new_game", "render")
+            instrumentation.patch(HangmanDrawer, "reset", "draw_stage")
+            instrumentation.start(self)
+            self.debug_overlay = DebugOverlay(self, instrumentation)
+
+        # screens are built the first time they are shown (see get_frame);
+        # the rest are pre-built one per event-loop turn once the window is drawn
+        self.screen_classes = {F.__name__: F for F in (
+            MainMenu, DifficultyScreen, CategoryScreen, GameScreen, GameOverScreen,
+            PauseScreen, InstructionsScreen, CreditsScreen)}
         self.frames = {}
-
-        # instantiate frames (include PauseScreen)
-        for F in (MainMenu, DifficultyScreen, CategoryScreen, InstructionsScreen,
-                  CreditsScreen, GameScreen, GameOverScreen, PauseScreen):
-            frame = F(parent=self.container, controller=self)
-            self.frames[F.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self._prebuild = [name for name in self.screen_classes if name != "MainMenu"]
 
         self.show_frame("MainMenu")
 
         # key binding for ESC -> toggle pause
         self.bind("<Escape>", lambda e: self.toggle_pause())
 
+        self.startup = StartupTimer(_IMPORT_START, _IMPORT_DONE)
+        self.bind("<Expose>", self._on_expose)
+
+    def _on_expose(self, event):
+        # the window is on screen and its widgets redraw on the next idle pass;
+        # first_frame is stamped on the pass after that, once they are drawn
+        self.unbind("<Expose>")
+        self.after_idle(self.after_idle, self._first_paint)
+
+    def _first_paint(self):
+        self.startup.mark("first_frame")
+        self.after(PREBUILD_DELAY_MS, self._prebuild_next)
+
+    def _prebuild_next(self):
+        # timer events, not idle callbacks: "update idletasks" must not run the
+        # whole chain, and input is handled between two screens
+        while self._prebuild:
+            name = self._prebuild.pop(0)
+            if name not in self.frames:
+                self.get_frame(name)
+                break
+        if self._prebuild:
+            self.after(PREBUILD_DELAY_MS, self._prebuild_next)
+        else:
+            self.startup.mark("interactive")
+
+    def get_frame(self, name):
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.screen_classes[name](parent=self.container, controller=self)
+            self.frames[name] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        return frame
+
     def show_frame(self, name):
-        frame = self.frames[name]
+        frame = self.get_frame(name)
         frame.tkraise()
         self.current_frame_name = name
 
@@ -133,59 +190,139 @@ class HangmanApp(tk.Tk):
         if self.current_frame_name == "PauseScreen":
             # resume to previous game if available (go back to GameScreen)
             self.show_frame("GameScreen")
+            if self.replay is not None:
+                self.replay.resume()
+            if self.journal is not None:
+                self.journal.resume()
             # focus entry on resume
-            gs: GameScreen = self.frames["GameScreen"]
+            gs: GameScreen = self.get_frame("GameScreen")
             gs.entry.focus_set()
         elif self.current_frame_name == "GameScreen":
             self.show_frame("PauseScreen")
-
-    def choose_word(self):
-        d = self.difficulty.get()
-        c = self.category.get()
-        pool = []
-
-        if d == "Easy":
-            if c == "Fruits":
-                pool = easy_fruits
-            elif c == "Vegetables":
-                pool = easy_vegetables
+            if self.replay is not None:
+                self.replay.pause()
+            if self.journal is not None:
+                self.journal.pause()
+
+    def set_word_index(self, index):
+        """Swap in a reloaded word index; the game in progress keeps its word."""
+        self.word_index = index
+        self.scheduler.index = index
+        self.plain_game.alphabet = index.alphabet
+        self._solvers.clear()
+
+    def load_words(self, loader, interval_ms=50):
+        """Play with the words of a BackgroundLoader (see hangman_background.py) as they load."""
+        self.loader = loader
+        self.pools_ready = frozenset()
+        self.load_status.set("Loading words...")
+        loader.start()
+        self.after(interval_ms, self._poll_loader, interval_ms)
+
+    def _poll_loader(self, interval_ms):
+        for msg in self.loader.poll():
+            kind = msg[0]
+            if kind == "progress":
+                _, done, total, words = msg
+                self.load_status.set(f"Loading words... {done / total if total else 1:.0%} ({words:,} words)")
+            elif kind == "pools":
+                self.set_word_index(msg[1])
+                self.set_pools_ready(msg[2])
+            elif kind == "done":
+                watcher = msg[1]
+                self.set_word_index(watcher.index)
+                self.set_pools_ready(None)
+                self.load_status.set("")
+                self.loader = None
+                self.watch_words(watcher)
+                return
             else:
-                pool = easy_fruits + easy_vegetables
-
-        elif d == "Medium":
-            if c == "Fruits":
-                pool = medium_fruits or easy_fruits
-            elif c == "Vegetables":
-                pool = medium_vegetables or easy_vegetables
-            else:
-                pool = medium_fruits + medium_vegetables
-                if not pool:
-                    pool = easy_fruits + easy_vegetables
-
-        elif d == "Hard":
-            if c == "Fruits":
-                pool = hard_fruits or medium_fruits or easy_fruits
-            elif c == "Vegetables":
-                pool = hard_vegetables or medium_vegetables or easy_vegetables
-            else:
-                pool = hard_fruits + hard_vegetables
-                if not pool:
-                    pool = medium_fruits + medium_vegetables
-
-        elif d == "Extreme":
-            if c == "Fruits":
-                pool = extreme_fruits or hard_fruits or medium_fruits
-            elif c == "Vegetables":
-                pool = extreme_vegetables or hard_vegetables or medium_vegetables
+                # play with the built-in lists instead
+                self.set_word_index(WORD_INDEX)
+                self.set_pools_ready(None)
+                self.load_status.set(f"Couldn't load the word files: {msg[1]}")
+                self.loader = None
+                return
+        self.after(interval_ms, self._poll_loader, interval_ms)
+
+    def set_pools_ready(self, ready):
+        self.pools_ready = ready
+        category_screen = self.frames.get("CategoryScreen")
+        if category_screen is not None:
+            category_screen.update_start()
+
+    def pool_ready(self, difficulty, category):
+        return self.pools_ready is None or (difficulty, category) in self.pools_ready
+
+    def watch_words(self, watcher, interval_ms=2000):
+        """Poll the word sources of a SourceWatcher (see hangman_reload.py).
+
+        Re-reading and diffing a changed file runs on a worker thread; the Tk
+        loop only picks up the finished index and swaps it in.
+        """
+        self.word_watcher = watcher
+        self.word_updates = queue.Queue()
+        threading.Thread(target=self._watch_words, args=(watcher, interval_ms / 1000),
+                         name="hangman-watch", daemon=True).start()
+        self.after(interval_ms, self._poll_words, interval_ms)
+
+    def _watch_words(self, watcher, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                index = watcher.poll()
+            except Exception as e:
+                # keep watching; the next edit of the file may well fix it
+                watcher.last_error = f"{type(e).__name__}: {e}"
+                index = None
+            if index is not None:
+                self.word_updates.put(("index", index))
+            if watcher.last_error:
+                # e.g. one of several files failed to parse while the others reloaded
+                self.word_updates.put(("error", watcher.last_error))
+                watcher.last_error = None
+
+    def _poll_words(self, interval_ms):
+        index = error = None
+        while True:
+            try:
+                kind, value = self.word_updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "index":
+                index, error = value, None
             else:
-                pool = extreme_fruits + extreme_vegetables
-                if not pool:
-                    pool = hard_fruits + hard_vegetables
+                error = value
+        if index is not None:
+            self.set_word_index(index)
+            self.load_status.set("")
+        if error is not None:
+            # shown under the menus until the next good reload
+            self.load_status.set(f"Couldn't reload the word files: {error}")
+        self.after(interval_ms, self._poll_words, interval_ms)
+
+    def pick_engine(self):
+        """Engine for the next game: evil mode needs one over the whole pool (see hangman_evil.py)."""
+        if self.evil_mode.get():
+            solver = self.get_solver()
+            if not isinstance(self.game, EvilEngine) or self.game.solver is not solver:
+                self.game = EvilEngine(solver, self.max_attempts)
+        else:
+            self.game = self.plain_game
+        return self.game
 
-        if not pool:
-            pool = easy_fruits + easy_vegetables
+    def get_solver(self):
+        key = (self.difficulty.get(), self.category.get())
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = self._solvers[key] = Solver.for_pool(self.word_index, *key)
+        return solver
 
-        return random.choice(pool)
+    def choose_word(self):
+        # pools and their fallbacks are resolved once in WORD_INDEX
+        self.game_seed = self.rng.getrandbits(32)
+        self.game_rng = random.Random(self.game_seed)
+        return self.scheduler.choose(self.difficulty.get(), self.category.get())
 
     def add_hover(self, button: tk.Button):
         """Add simple hover effect to a button (background color change)."""
@@ -199,6 +336,9 @@ class HangmanApp(tk.Tk):
                 button["background"] = BUTTON_BG
             except tk.TclError:
                 pass
+        if self.instrumentation is not None:
+            on_enter = self.instrumentation.wrap("hover.enter", on_enter)
+            on_leave = self.instrumentation.wrap("hover.leave", on_leave)
         button.bind("<Enter>", on_enter)
         button.bind("<Leave>", on_leave)
 
@@ -248,6 +388,8 @@ class MainMenu(StyledFrame):
         btn_exit.pack(pady=6)
         controller.add_hover(btn_exit)
 
+        tk.Label(self.inner, textvariable=controller.load_status, font=FONT_TEXT, fg=TEXT, bg=BG).pack()
+
         footer = tk.Label(self.inner, text="Tip: Press ESC to pause during the game.", font=("Segoe UI", 10),
                           fg=TEXT, bg=BG)
         footer.pack(side="bottom", pady=10)
@@ -294,6 +436,9 @@ class CategoryScreen(StyledFrame):
         for text, val in opts:
             tk.Radiobutton(frame, text=text, variable=controller.category, value=val,
                            font=FONT_SUB, bg=BG, fg=TEXT, selectcolor=PANEL).pack(anchor="w", padx=8, pady=3)
+        tk.Checkbutton(self.inner, text="Evil mode (the word keeps changing to dodge your guesses)",
+                       variable=controller.evil_mode, font=FONT_TEXT, bg=BG, fg=TEXT,
+                       selectcolor=PANEL).pack(pady=(4, 0))
 
         nav = tk.Frame(self.inner, bg=BG)
         nav.pack(pady=16)
@@ -306,9 +451,21 @@ class CategoryScreen(StyledFrame):
                   command=self.start_game)
         btn_start.pack(side="left", padx=8)
         controller.add_hover(btn_start)
+        self.btn_start = btn_start
+
+        # while words load, Start waits for the selected pool
+        tk.Label(self.inner, textvariable=controller.load_status, font=FONT_TEXT, fg=TEXT, bg=BG).pack()
+        controller.difficulty.trace_add("write", lambda *_: self.update_start())
+        controller.category.trace_add("write", lambda *_: self.update_start())
+        self.update_start()
+
+    def update_start(self):
+        app: HangmanApp = self.controller
+        ready = app.pool_ready(app.difficulty.get(), app.category.get())
+        self.btn_start.config(state="normal" if ready else "disabled")
 
     def start_game(self):
-        game_frame: GameScreen = self.controller.frames["GameScreen"]
+        game_frame: GameScreen = self.controller.get_frame("GameScreen")
         game_frame.setup_new_game()
         self.controller.show_frame("GameScreen")
         game_frame.entry.focus_set()
@@ -353,43 +510,149 @@ class CreditsScreen(StyledFrame):
 # Game Canvas Drawing (no images)
 
 class HangmanDrawer:
+    # body parts in drawing order: (kind, coords)
+    PARTS = (
+        ("oval", (230, 90, 290, 150)),    # head
+        ("line", (260, 150, 260, 260)),   # body
+        ("line", (260, 170, 220, 210)),   # left arm
+        ("line", (260, 170, 300, 210)),   # right arm
+        ("line", (260, 260, 230, 320)),   # left leg
+        ("line", (260, 260, 290, 320)),   # right leg
+    )
+
     def __init__(self, canvas: tk.Canvas):
         self.canvas = canvas
-        self.reset()
-
-    def reset(self):
+        self.stage = 0
+        # frame-time counter for reset / draw_stage
+        self.frames = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+        self.total_frame_ms = 0.0
+        self.build()
+
+    def build(self):
+        """Create every canvas item once; stages only toggle their visibility."""
         self.canvas.delete("all")
-        w = int(self.canvas["width"])
         h = int(self.canvas["height"])
         base_y = h - 30
-        self.canvas.create_line(40, base_y, 160, base_y, width=4)   # ground
-        self.canvas.create_line(100, base_y, 100, 50, width=4)      # vertical pole
-        self.canvas.create_line(100, 50, 260, 50, width=4)          # top beam
-        self.canvas.create_line(260, 50, 260, 90, width=4)          # rope
-        self.parts = {
-            "head": None,
-            "body": None,
-            "left_arm": None,
-            "right_arm": None,
-            "left_leg": None,
-            "right_leg": None
-        }
+        self.canvas.create_line(40, base_y, 160, base_y, width=4, tags="scaffold")   # ground
+        self.canvas.create_line(100, base_y, 100, 50, width=4, tags="scaffold")      # vertical pole
+        self.canvas.create_line(100, 50, 260, 50, width=4, tags="scaffold")          # top beam
+        self.canvas.create_line(260, 50, 260, 90, width=4, tags="scaffold")          # rope
+        n = len(self.PARTS)
+        for i, (kind, coords) in enumerate(self.PARTS, start=1):
+            # part i belongs to stage i and every later stage, so showing
+            # "stage<k>" reveals all parts up to k in one call
+            tags = ("part",) + tuple(f"stage{k}" for k in range(i, n + 1))
+            create = self.canvas.create_oval if kind == "oval" else self.canvas.create_line
+            create(*coords, width=3, state="hidden", tags=tags)
+
+    def _frame_done(self, start):
+        ms = (time.perf_counter() - start) * 1000
+        self.frames += 1
+        self.last_frame_ms = ms
+        self.total_frame_ms += ms
+        if ms > self.max_frame_ms:
+            self.max_frame_ms = ms
+
+    def frame_stats(self):
+        avg = self.total_frame_ms / self.frames if self.frames else 0.0
+        return {"frames": self.frames, "last_ms": self.last_frame_ms,
+                "avg_ms": avg, "max_ms": self.max_frame_ms}
+
+    def reset(self):
+        start = time.perf_counter()
+        self.canvas.itemconfigure("part", state="hidden")
+        self.stage = 0
+        self._frame_done(start)
 
     def draw_stage(self, stage: int):
-        if stage <= 0:
+        stage = min(stage, len(self.PARTS))
+        if stage <= self.stage:
+            return
+        start = time.perf_counter()
+        self.canvas.itemconfigure(f"stage{stage}", state="normal")
+        self.stage = stage
+        self._frame_done(start)
+
+
+# Game view: what GameScreen shows, apart from the widgets
+
+class GameView:
+    """Display state of the game in progress, with dirty flags per screen part.
+
+    Handlers update the view and mark what changed; GameScreen.render()
+    pushes the dirty parts to Tk once per idle pass.
+    """
+    WORD, GUESSED, ATTEMPTS, MESSAGE, DRAWING = 1, 2, 4, 8, 16
+    ALL = 31
+
+    def __init__(self):
+        self.word = ""
+        self.slots = []
+        self.positions = {}
+        self.shown_mask = 0
+        self.guessed = []       # kept sorted, letters are inserted as they come
+        self.listed_mask = 0
+        self.message = ""
+        self.dirty = 0
+
+    def new_word(self, game):
+        self._index(game)
+        self.guessed = []
+        self.listed_mask = 0
+        self.dirty = self.ALL
+
+    def _index(self, game):
+        """Precompute the display slots and the slot positions of each letter."""
+        canonical = game.alphabet.canonical
+        self.word = game.secret_word
+        self.slots = []
+        self.positions = {}
+        for i, ch in enumerate(self.word):
+            letter = canonical.get(ch)
+            if letter is not None:
+                # accented forms are revealed by their base letter
+                self.positions.setdefault(letter, []).append(i)
+                self.slots.append("_")
+            else:
+                self.slots.append(ch)  # reveal spaces/punctuation
+        self.shown_mask = 0
+
+    def reveal(self, game):
+        if game.secret_word is not self.word:
+            # evil mode moved on to another word (same shape, same letters shown so far)
+            self._index(game)
+        new = game.guessed_mask & game.word_mask & ~self.shown_mask
+        if not new:
             return
-        if stage >= 1 and not self.parts["head"]:
-            self.parts["head"] = self.canvas.create_oval(230, 90, 290, 150, width=3)
-        if stage >= 2 and not self.parts["body"]:
-            self.parts["body"] = self.canvas.create_line(260, 150, 260, 260, width=3)
-        if stage >= 3 and not self.parts["left_arm"]:
-            self.parts["left_arm"] = self.canvas.create_line(260, 170, 220, 210, width=3)
-        if stage >= 4 and not self.parts["right_arm"]:
-            self.parts["right_arm"] = self.canvas.create_line(260, 170, 300, 210, width=3)
-        if stage >= 5 and not self.parts["left_leg"]:
-            self.parts["left_leg"] = self.canvas.create_line(260, 260, 230, 320, width=3)
-        if stage >= 6 and not self.parts["right_leg"]:
-            self.parts["right_leg"] = self.canvas.create_line(260, 260, 290, 320, width=3)
+        self.shown_mask |= new
+        slots = self.slots
+        word = game.secret_word
+        for letter in game.alphabet.mask_letters(new):
+            for i in self.positions[letter]:
+                slots[i] = word[i]
+        self.dirty |= self.WORD
+
+    def add_guessed(self, game):
+        new = game.guessed_mask & ~self.listed_mask
+        if not new:
+            return
+        self.listed_mask |= new
+        for letter in game.alphabet.mask_letters(new):
+            insort(self.guessed, letter)
+        self.dirty |= self.GUESSED
+
+    def set_message(self, text):
+        if text != self.message:
+            self.message = text
+            self.dirty |= self.MESSAGE
+
+    def word_text(self):
+        return " ".join(self.slots)
+
+    def guessed_text(self):
+        return "Guessed: " + (", ".join(self.guessed) if self.guessed else "-")
 
 
 # Game Screen
@@ -442,6 +705,10 @@ class GameScreen(StyledFrame):
         self.restart_btn.pack(side="left", padx=6)
         controller.add_hover(self.restart_btn)
 
+        tk.Checkbutton(right, text="Smart hints (reveal the most informative letter)",
+                       variable=controller.smart_hints, font=FONT_TEXT, bg=BG, fg=TEXT,
+                       selectcolor=PANEL).pack(anchor="w")
+
         self.message_label = tk.Label(right, text="", font=FONT_SUB, fg=TEXT, bg=BG, wraplength=240, justify="left")
         self.message_label.pack(pady=8)
 
@@ -461,112 +728,194 @@ class GameScreen(StyledFrame):
         btn_change.pack(side="left", padx=6)
         controller.add_hover(btn_change)
 
+        # display state; widgets are only touched by render()
+        self.view = GameView()
+        self._render_id = None
+        self._label_text = {}
+        # per-game stats
+        self.started = time.perf_counter()
+        self.guesses = 0
+        self.hints = 0
+
         # keyboard binding to focus entry on key press (letters)
         self.controller.bind("<Key>", self.on_key_press)
 
     def on_key_press(self, event):
-        # only focus for letter keys
-        if event.char and event.char.lower() in string.ascii_lowercase:
+        # only focus for letter keys (of the word pack's alphabet)
+        if event.char and event.char.lower() in self.controller.game.alphabet.bits:
             if not self.entry.focus_get():
                 self.entry.focus_set()
 
     def setup_new_game(self):
         app: HangmanApp = self.controller
-        app.secret_word = app.choose_word()
-        app.guessed_letters = set()
-        app.wrong_attempts = 0
+        if not app.pool_ready(app.difficulty.get(), app.category.get()):
+            # Restart / Play Again while the words are still loading
+            self.set_message("Still loading words for this category...")
+            return
+        app.pick_engine().new_game(app.choose_word())
+        if app.replay is not None and app.evil_mode.get():
+            app.replay.skip_game()     # the log can't replay an evil game's word choices
+        elif app.replay is not None:
+            app.replay.start_game(app.game_seed, app.difficulty.get(), app.category.get(),
+                                  app.game.secret_word, app.game.max_attempts, app.game.alphabet)
+        if app.journal is not None and app.evil_mode.get():
+            app.journal.skip_game()    # nor can the journal restore one
+        elif app.journal is not None:
+            app.journal.start_game(app.game_seed, app.difficulty.get(), app.category.get(),
+                                   app.game.secret_word, app.game.max_attempts, app.game.alphabet)
+        self.index_secret_word()
+        self.started = time.perf_counter()
+        self.guesses = 0
+        self.hints = 0
+        self.entry.delete(0, tk.END)
+        self.update_ui_init()
+        self.set_message("")
+
+    def restore_game(self, state):
+        """Put back the game a journal kept from the last run (see hangman_journal.py)."""
+        app: HangmanApp = self.controller
+        app.difficulty.set(state.difficulty)
+        app.category.set(state.category)
+        game = app.game = app.plain_game
+        game.alphabet = state.alphabet
+        game.max_attempts = state.game.max_attempts
+        game.restore(state.word, state.game.guessed_mask, state.game.wrong_attempts)
+        app.game_seed = state.seed
+        app.game_rng = random.Random(state.seed)
+        self.index_secret_word()
+        self.started = time.perf_counter() - state.elapsed_ms / 1000
+        self.guesses = state.guesses
+        self.hints = state.hints
         self.entry.delete(0, tk.END)
         self.update_ui_init()
-        # draw blank scaffold
-        self.drawer.reset()
-        self.message_label.config(text="")
+        self.update_guessed_label()     # the drawing follows wrong_attempts in render()
+        self.set_message("Game restored.")
+        if state.paused:
+            app.show_frame("GameScreen")   # so toggle_pause lands on the pause screen
+            app.show_frame("PauseScreen")
+        else:
+            app.show_frame("GameScreen")
+            self.entry.focus_set()
+
+    def set_label(self, label: tk.Label, text: str):
+        # only go through Tcl when the text really changes
+        if self._label_text.get(label) != text:
+            self._label_text[label] = text
+            label.config(text=text)
+
+    def index_secret_word(self):
+        self.view.new_word(self.controller.game)
+        self.invalidate(GameView.ALL)
 
     def update_ui_init(self):
         app: HangmanApp = self.controller
         self.info_label.config(text=f"{app.difficulty.get()} | {app.category.get()}")
         self.update_word_display()
-        self.guessed_label.config(text="Guessed: ")
-        self.attempts_label.config(text=f"Attempts: {app.wrong_attempts}/{app.max_attempts}")
         self.guess_btn.config(state="normal")
         self.hint_btn.config(state="normal")
 
+    # rendering: handlers only change self.view, one idle pass updates the widgets
+
+    def invalidate(self, parts=0):
+        self.view.dirty |= parts
+        if self._render_id is None and self.view.dirty:
+            self._render_id = self.after_idle(self.render)
+
+    def render(self):
+        self._render_id = None
+        view = self.view
+        dirty, view.dirty = view.dirty, 0
+        if dirty & GameView.WORD:
+            self.set_label(self.word_label, view.word_text())
+        if dirty & GameView.GUESSED:
+            self.set_label(self.guessed_label, view.guessed_text())
+        if dirty & GameView.ATTEMPTS:
+            game = self.controller.game
+            self.set_label(self.attempts_label, f"Attempts: {game.wrong_attempts}/{game.max_attempts}")
+        if dirty & GameView.MESSAGE:
+            self.set_label(self.message_label, view.message)
+        if dirty & GameView.DRAWING:
+            stage = self.controller.game.wrong_attempts
+            if stage < self.drawer.stage:
+                self.drawer.reset()
+            self.drawer.draw_stage(stage)
+
+    def set_message(self, text: str):
+        self.view.set_message(text)
+        self.invalidate()
+
     def update_word_display(self):
-        app: HangmanApp = self.controller
-        display = []
-        for ch in app.secret_word:
-            if ch.isalpha():
-                display.append(ch if ch in app.guessed_letters else "_")
-            else:
-                display.append(ch)  # reveal spaces/punctuation
-        self.word_label.config(text=" ".join(display))
+        self.view.reveal(self.controller.game)
+        self.invalidate()
+
+    def update_attempts_label(self):
+        self.invalidate(GameView.ATTEMPTS | GameView.DRAWING)
 
     def submit_guess(self):
         app: HangmanApp = self.controller
+        game = app.game
 
         # block input if not on GameScreen (pausing)
         if app.current_frame_name != "GameScreen":
             return
 
-        guess = self.entry.get().strip().lower()
+        # normalised first: "e" + a combining accent is one letter, not a word guess
+        guess = normalize(self.entry.get())
         self.entry.delete(0, tk.END)
         if not guess:
-            self.message_label.config(text="Please enter a letter or full-word guess.")
+            self.set_message("Please enter a letter or full-word guess.")
             return
+        if app.replay is not None:
+            app.replay.guess(guess)
+        if app.journal is not None:
+            app.journal.guess(guess)
 
         # full-word guess
         if len(guess) > 1:
-            normalized_guess = " ".join(guess.split())
-            normalized_secret = " ".join(app.secret_word.split())
-            if normalized_guess == normalized_secret:
-                for c in app.secret_word:
-                    if c.isalpha():
-                        app.guessed_letters.add(c)
+            result = game.guess_word(guess)
+            self.guesses += 1
+            if result == WIN:
                 self.update_word_display()
-                self.message_label.config(text="🎉 Correct! You solved the word.")
+                self.set_message("🎉 Correct! You solved the word.")
                 self.end_game(win=True)
             else:
-                app.wrong_attempts += 1
-                self.attempts_label.config(text=f"Attempts: {app.wrong_attempts}/{app.max_attempts}")
-                self.drawer.draw_stage(app.wrong_attempts)
-                self.message_label.config(text=f"Wrong word guess! ({app.wrong_attempts}/{app.max_attempts})")
-                if app.wrong_attempts >= app.max_attempts:
+                self.update_attempts_label()
+                self.set_message(f"Wrong word guess! ({game.wrong_attempts}/{game.max_attempts})")
+                if result == LOSS:
                     self.end_game(win=False)
             self.update_guessed_label()
             return
 
         # single-letter guess
         letter = guess
-        if len(letter) != 1 or not letter.isalpha():
-            self.message_label.config(text="Enter a single alphabet letter or a full-word guess.")
+        result = game.guess_letter(letter)
+        if result == INVALID:
+            self.set_message("Enter a single alphabet letter or a full-word guess.")
             return
 
-        if letter in app.guessed_letters:
-            self.message_label.config(text=f"You already guessed '{letter}'.")
+        if result == REPEAT:
+            self.set_message(f"You already guessed '{letter}'.")
             return
+        self.guesses += 1
 
-        app.guessed_letters.add(letter)
-        if letter in app.secret_word:
+        if result in (HIT, WIN):
             self.update_word_display()
             self.update_guessed_label()
-            all_done = all((ch in app.guessed_letters or not ch.isalpha()) for ch in app.secret_word)
-            if all_done:
-                self.message_label.config(text="🎉 You Won!")
+            if result == WIN:
+                self.set_message("🎉 You Won!")
                 self.end_game(win=True)
             else:
-                self.message_label.config(text=f"Nice! '{letter}' is in the word.")
+                self.set_message(f"Nice! '{letter}' is in the word.")
         else:
-            app.wrong_attempts += 1
-            self.drawer.draw_stage(app.wrong_attempts)
-            self.attempts_label.config(text=f"Attempts: {app.wrong_attempts}/{app.max_attempts}")
+            self.update_attempts_label()
             self.update_guessed_label()
-            self.message_label.config(text=f"Wrong guess '{letter}' ({app.wrong_attempts}/{app.max_attempts})")
-            if app.wrong_attempts >= app.max_attempts:
+            self.set_message(f"Wrong guess '{letter}' ({game.wrong_attempts}/{game.max_attempts})")
+            if result == LOSS:
                 self.end_game(win=False)
 
     def update_guessed_label(self):
-        app: HangmanApp = self.controller
-        letters = sorted([c for c in app.guessed_letters if c.isalpha()])
-        self.guessed_label.config(text="Guessed: " + (", ".join(letters) if letters else "-"))
+        self.view.add_guessed(self.controller.game)
+        self.invalidate()
 
     def reveal_one_letter(self):
         app: HangmanApp = self.controller
@@ -575,29 +924,43 @@ class GameScreen(StyledFrame):
         if app.current_frame_name != "GameScreen":
             return
 
-        remaining = [c for c in set(app.secret_word) if c.isalpha() and c not in app.guessed_letters]
-        if not remaining:
-            self.message_label.config(text="No letters left to reveal.")
+        letter = smart_hint(app.get_solver(), app.game) if app.smart_hints.get() else None
+        chosen = app.game.reveal(app.game_rng, letter=letter)
+        if chosen is None:
+            self.set_message("No letters left to reveal.")
             return
-        chosen = random.choice(remaining)
-        app.guessed_letters.add(chosen)
+        if app.replay is not None:
+            app.replay.hint(chosen)
+        if app.journal is not None:
+            app.journal.hint(chosen)
+        self.hints += 1
         self.update_word_display()
         self.update_guessed_label()
-        self.message_label.config(text=f"Hint: revealed '{chosen}'")
-        all_done = all((ch in app.guessed_letters or not ch.isalpha()) for ch in app.secret_word)
-        if all_done:
+        self.set_message(f"Hint: revealed '{chosen}'")
+        if app.game.won:
             self.end_game(win=True)
 
     def end_game(self, win: bool):
         app: HangmanApp = self.controller
         self.guess_btn.config(state="disabled")
         self.hint_btn.config(state="disabled")
-        go_screen: GameOverScreen = app.frames["GameOverScreen"]
-        go_screen.set_result(win, app.secret_word)
+        if app.replay is not None:
+            app.replay.end_game(win)
+        if app.journal is not None:
+            app.journal.end_game(win)
+        if app.stats is not None:
+            # queued only; the stats writer thread does the disk I/O
+            app.stats.record(GameResult(
+                app.game.secret_word, app.difficulty.get(), app.category.get(), self.guesses,
+                self.hints, app.game.wrong_attempts, time.perf_counter() - self.started, win))
+        go_screen: GameOverScreen = app.get_frame("GameOverScreen")
+        go_screen.set_result(win, app.game.secret_word)
         app.show_frame("GameOverScreen")
 
     def back_to_menu(self):
         if messagebox.askyesno("Back to Menu", "Return to Main Menu? Current game will be lost."):
+            if self.controller.journal is not None:
+                self.controller.journal.skip_game()
             self.controller.show_frame("MainMenu")
 
 
@@ -637,7 +1000,7 @@ class GameOverScreen(StyledFrame):
         self.word_lbl.config(text=f"The word was: {secret}")
 
     def play_again(self):
-        game_frame: GameScreen = self.controller.frames["GameScreen"]
+        game_frame: GameScreen = self.controller.get_frame("GameScreen")
         game_frame.setup_new_game()
         self.controller.show_frame("GameScreen")
         game_frame.entry.focus_set()
@@ -665,19 +1028,109 @@ class PauseScreen(StyledFrame):
     def resume(self):
         # simply go back to GameScreen
         self.controller.show_frame("GameScreen")
+        if self.controller.replay is not None:
+            self.controller.replay.resume()
+        if self.controller.journal is not None:
+            self.controller.journal.resume()
         # focus entry when resuming
-        gs: GameScreen = self.controller.frames["GameScreen"]
+        gs: GameScreen = self.controller.get_frame("GameScreen")
         gs.entry.focus_set()
 
+_IMPORT_DONE = time.perf_counter()
+
 # App launch
 
 if __name__ == "__main__":
-    app = HangmanApp()
-    # center the window on screen (optional)
-    app.update_idletasks()
-    width = app.winfo_width() or 760
-    height = app.winfo_height() or 640
+    import argparse
+    from hangman_loader import add_default_args
+    parser = argparse.ArgumentParser(description="Hangman Game")
+    parser.add_argument("--pack", help="compiled word pack to play with (see hangman_pack.py)")
+    parser.add_argument("--words", nargs="+", metavar="FILE",
+                        help="play with these word files, reloaded when they change (see hangman_reload.py)")
+    parser.add_argument("--alphabet", default="en", help="alphabet of the --words files (en, es, de, el, ru)")
+    add_default_args(parser)
+    parser.add_argument("--no-stats", action="store_true", help="don't record finished games")
+    parser.add_argument("--bag-state", default=os.path.join(os.path.expanduser("~"), ".hangman_bags.json"),
+                        help="where the word shuffle bags are saved between launches")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time Tk handlers and event-loop stalls (F12 shows the overlay)")
+    parser.add_argument("--instrument-json", metavar="PATH",
+                        help="write the instrumentation results here on exit (implies --instrument)")
+    parser.add_argument("--replay-log", metavar="PATH",
+                        help="append every game to this replay log (see hangman_replay.py)")
+    parser.add_argument("--journal", default=os.path.join(os.path.expanduser("~"), ".hangman_journal"),
+                        help="where the game in progress is journaled, to be restored on the next launch")
+    parser.add_argument("--no-journal", action="store_true", help="don't keep or restore the game in progress")
+    parser.add_argument("--fsync-interval", type=float, default=1.0, metavar="SECONDS",
+                        help="how often journal writes are synced to disk (0: every write, negative: never)")
+    parser.add_argument("--startup-timer", action="store_true",
+                        help="print import / first frame / interactive times")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="warn when startup takes longer than MS milliseconds")
+    args = parser.parse_args()
+    word_index = None
+    if args.pack:
+        from hangman_pack import open_index
+        word_index = open_index(args.pack)
+    alphabet = (word_index if word_index is not None else WORD_INDEX).alphabet
+    loader = None
+    if args.words:
+        # loaded on a worker thread once the window is up (see hangman_background.py)
+        from hangman_alphabet import get_alphabet
+        from hangman_background import BackgroundLoader
+        alphabet = get_alphabet(args.alphabet)
+        loader = BackgroundLoader(args.words, alphabet, difficulty=args.difficulty, category=args.category)
+
+    stats = None
+    if not args.no_stats:
+        try:
+            stats = StatsStore()
+        except (OSError, sqlite3.Error):
+            stats = None  # play without stats if the database can't be opened
+
+    instrumentation = None
+    if args.instrument or args.instrument_json:
+        instrumentation = Instrumentation()
+
+    replay = None
+    if args.replay_log:
+        from hangman_replay import ReplayWriter
+        replay = ReplayWriter(args.replay_log)
+
+    journal = None
+    if not args.no_journal:
+        from hangman_journal import GameJournal
+        try:
+            journal = GameJournal(args.journal, args.fsync_interval if args.fsync_interval >= 0 else None)
+        except OSError:
+            journal = None  # play without one if the files can't be written
+
+    scheduler = WordScheduler.load(args.bag_state, word_index if word_index is not None else WORD_INDEX)
+
+    app = HangmanApp(word_index, stats, instrumentation, replay, scheduler, journal)
+    app.startup.report = args.startup_timer
+    app.startup.budget_ms = args.startup_budget
+    if loader is not None:
+        app.load_words(loader)
+    pending = journal.pending() if journal is not None else None
+    if pending is not None and pending.alphabet is alphabet:
+        app.get_frame("GameScreen").restore_game(pending)
+    # center the window on screen (optional); its size is fixed, so there is no need
+    # to run the idle tasks for it (that would draw the window before mainloop)
+    width, height = WINDOW_SIZE
     x = (app.winfo_screenwidth() // 2) - (width // 2)
     y = (app.winfo_screenheight() // 2) - (height // 2)
     app.geometry(f"{width}x{height}+{x}+{y}")
     app.mainloop()
+    try:
+        scheduler.save(args.bag_state)
+    except OSError:
+        pass
+    if stats is not None:
+        stats.close()
+    if replay is not None:
+        replay.close()
+    if journal is not None:
+        journal.close()
+    if args.instrument_json:
+        instrumentation.export(args.instrument_json)
@@ -0,0 +1,191 @@
+"""Opt-in latency instrumentation for the Tk client.
+
+Instrumentation.patch() wraps handler methods on their classes, so every Tk
+callback bound to them is timed into a per-handler log2 histogram. A ticker
+scheduled with `after` measures how late each tick fires, which shows event
+loop stalls. Results can be shown on a hidden debug overlay (F12) and
+exported as JSON for offline analysis.
+
+    python hangman_gui.py --instrument --instrument-json latency.json
+"""
+
+import functools
+import json
+import time
+
+TICK_MS = 50        # ticker interval
+STALL_MS = 100      # a tick this late (or later) counts as a stall
+REFRESH_MS = 500    # overlay refresh
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        us = int(seconds * 1e6)
+        b = us.bit_length()     # bucket b holds [2**(b-1), 2**b) us
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return (1 << b) / 1000
+        return self.max * 1000
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max * 1000,
+            "buckets_us": {str(1 << b): n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class Instrumentation:
+    def __init__(self, tick_ms=TICK_MS, stall_ms=STALL_MS):
+        self.tick_ms = tick_ms
+        self.stall_ms = stall_ms
+        self.handlers = {}
+        self.tick_lag = Histogram()
+        self.stalls = []        # (seconds since start, gap ms)
+        self.started = time.perf_counter()
+        self._patched = []
+        self._last_tick = None
+        self._root = None
+
+    # handler timing
+
+    def record(self, name, seconds):
+        hist = self.handlers.get(name)
+        if hist is None:
+            hist = self.handlers[name] = Histogram()
+        hist.add(seconds)
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        timed.instrumentation = self
+        return timed
+
+    def patch(self, cls, *names):
+        """Time the given methods of `cls` (for all instances, including ones built later).
+
+        Methods this instrumentation already times are left alone, so a second
+        window patching the same classes doesn't time them twice.
+        """
+        for name in names:
+            original = cls.__dict__[name]
+            if getattr(original, "instrumentation", None) is self:
+                continue
+            self._patched.append((cls, name, original))
+            setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", original))
+
+    def unpatch(self):
+        while self._patched:
+            cls, name, original = self._patched.pop()
+            setattr(cls, name, original)
+
+    # event loop stalls
+
+    def start(self, root):
+        self._root = root
+        self._last_tick = time.perf_counter()
+        root.after(self.tick_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        gap = (now - self._last_tick) * 1000
+        lag = max(0.0, gap - self.tick_ms)
+        self.tick_lag.add(lag / 1000)
+        if lag >= self.stall_ms:
+            self.stalls.append((round(now - self.started, 3), round(gap, 1)))
+            del self.stalls[:-1000]
+        self._last_tick = now
+        try:
+            self._root.after(self.tick_ms, self._tick)
+        except Exception:
+            pass    # window is gone
+
+    # reporting
+
+    def snapshot(self):
+        return {
+            "uptime_s": time.perf_counter() - self.started,
+            "tick_ms": self.tick_ms,
+            "stall_ms": self.stall_ms,
+            "handlers": {name: h.as_dict() for name, h in sorted(self.handlers.items())},
+            "tick_lag": self.tick_lag.as_dict(),
+            "stalls": list(self.stalls),
+        }
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def summary_lines(self):
+        lines = [f"{'handler':<30} {'n':>6} {'mean':>7} {'p99':>7} {'max':>7}  (ms)"]
+        for name, h in sorted(self.handlers.items()):
+            d = h.as_dict()
+            lines.append(f"{name:<30} {d['count']:>6} {d['mean_ms']:>7.2f} {d['p99_ms']:>7.2f} {d['max_ms']:>7.2f}")
+        lag = self.tick_lag.as_dict()
+        lines.append(f"event loop: {len(self.stalls)} stalls >= {self.stall_ms} ms, "
+                     f"tick lag p99 {lag['p99_ms']:.1f} ms, max {lag['max_ms']:.1f} ms")
+        return lines
+
+
+class DebugOverlay:
+    """Hidden text overlay with the live numbers; toggled with F12."""
+
+    def __init__(self, root, instrumentation, key="<F12>"):
+        import tkinter as tk
+        self.root = root
+        self.instrumentation = instrumentation
+        self.label = tk.Label(root, text="", font=("Consolas", 9), justify="left", anchor="nw",
+                              bg="#212121", fg="#E0E0E0", padx=6, pady=4)
+        self.visible = False
+        self._after = None
+        root.bind(key, lambda e: self.toggle())
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.label.place(x=0, y=0)
+            self.label.lift()
+            self.refresh()
+        else:
+            self.label.place_forget()
+            if self._after is not None:
+                self.root.after_cancel(self._after)
+                self._after = None
+
+    def refresh(self):
+        self._after = None
+        if not self.visible:
+            return
+        self.label.config(text="\n".join(self.instrumentation.summary_lines()))
+        self.label.lift()
+        self._after = self.root.after(REFRESH_MS, self.refresh)
@@ -0,0 +1,439 @@
+"""Crash-safe journal of the game in progress.
+
+Every action of the current game is appended to a small journal file as it
+happens (same event bytes as the replay log, see hangman_replay.py, but with
+the milliseconds since the game started), so closing the window or a crash
+loses nothing: the next launch puts the game back where it was, paused
+or not, with the hangman drawn as far as it got.
+
+Writes are a single unbuffered os.write (no Python-side buffering, so a
+crashed process loses nothing the OS has). fsync, which is what protects
+against power loss, runs on a background thread every `fsync_interval`
+seconds; 0 makes every write fsync, None never does.
+
+To keep startup replay short, the state is compacted into a snapshot file
+every `compact_every` records, whenever a game ends and when the journal is
+opened. Compacting switches writes to a fresh journal (`<path>.next`) at
+once; writing the snapshot, the fsyncs and renaming the new journal into
+place are left to the fsync thread. Every file carries an epoch number: a
+journal whose epoch doesn't match the snapshot's was already folded into it
+and is ignored, and a `.next` journal one epoch ahead of the snapshot (the
+crash came before the snapshot was written) is replayed after the old one.
+
+    python hangman_journal.py show            # what the next launch would restore
+"""
+
+import os
+import threading
+import time
+
+from hangman_alphabet import alphabet_code, get_alphabet
+from hangman_engine import HangmanEngine
+from hangman_replay import (END, GAME, HINT, LETTER, PAUSE, RESUME, TEXT_LETTER, WORD, _read_varint, _varint,
+                            letter_code, letter_table)
+from hangman_session import CATEGORY_CODES, CATEGORY_NAMES, DIFFICULTY_CODES
+from hangman_words import DIFFICULTIES
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".hangman_journal")
+JOURNAL_MAGIC = b"HMJL"
+SNAPSHOT_MAGIC = b"HMJS"
+VERSION = 2     # letters coded by their index in the game's alphabet
+FSYNC_INTERVAL = 1.0
+COMPACT_EVERY = 256
+# what a corrupt file can raise while it is decoded
+_BAD_DATA = (IndexError, KeyError, TypeError, ValueError)
+
+
+class GameState:
+    """The game in progress as the journal knows it."""
+    __slots__ = ("seed", "difficulty", "category", "alphabet", "game", "guesses", "hints",
+                 "paused", "elapsed_ms")
+
+    def __init__(self, seed, difficulty, category, alphabet, max_attempts, word):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.category = category
+        self.alphabet = alphabet
+        self.game = HangmanEngine(word, max_attempts, alphabet)
+        self.guesses = 0
+        self.hints = 0
+        self.paused = False
+        self.elapsed_ms = 0
+
+    @property
+    def word(self):
+        return self.game.secret_word
+
+    def apply(self, kind, value):
+        # same moves as GameScreen; repeats and invalid input don't count as guesses
+        game = self.game
+        if kind == LETTER or kind == WORD:
+            before = (game.guessed_mask, game.wrong_attempts)
+            game.guess_word(value) if len(value) > 1 else game.guess_letter(value)
+            if (game.guessed_mask, game.wrong_attempts) != before:
+                self.guesses += 1
+        elif kind == HINT:
+            game.reveal(letter=value)
+            self.hints += 1
+        elif kind == PAUSE:
+            self.paused = True
+        elif kind == RESUME:
+            self.paused = False
+
+
+def _header(buf, state):
+    _varint(buf, state.seed)
+    buf.append(DIFFICULTY_CODES[state.difficulty] << 2 | CATEGORY_CODES[state.category])
+    buf.append(alphabet_code(state.alphabet) << 4 | state.game.max_attempts)
+    _text(buf, state.word)
+
+
+def _text(buf, text):
+    data = text.encode("utf-8")
+    _varint(buf, len(data))
+    buf += data
+
+
+def _read_header(data, pos):
+    seed, pos = _read_varint(data, pos)
+    dc = data[pos]
+    am = data[pos + 1]
+    word, pos = _read_text(data, pos + 2)
+    return GameState(seed, DIFFICULTIES[dc >> 2], CATEGORY_NAMES[dc & 3], get_alphabet(am >> 4),
+                     am & 0xF, word), pos
+
+
+def _read_text(data, pos):
+    n, pos = _read_varint(data, pos)
+    if pos + n > len(data):
+        raise IndexError("truncated text")
+    return data[pos:pos + n].decode("utf-8"), pos + n
+
+
+def read_snapshot(path):
+    """(epoch, GameState or None) from a snapshot file; (0, None) if there is none."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return 0, None
+    if data[:4] != SNAPSHOT_MAGIC or len(data) < 6 or data[4] != VERSION:
+        return 0, None
+    try:
+        epoch, pos = _read_varint(data, 5)
+        if not data[pos]:
+            return epoch, None
+        state, pos = _read_header(data, pos + 1)
+        guessed, pos = _read_varint(data, pos)
+        wrong, pos = _read_varint(data, pos)
+        state.guesses, pos = _read_varint(data, pos)
+        state.hints, pos = _read_varint(data, pos)
+        state.paused = bool(data[pos])
+        state.elapsed_ms, pos = _read_varint(data, pos + 1)
+        state.game.restore(state.word, guessed, wrong)
+    except _BAD_DATA:
+        return 0, None  # truncated or corrupt: nothing to restore
+    return epoch, state
+
+
+def read_journal(path, epochs, state):
+    """Apply the records of a journal to `state`; returns (state, records).
+
+    A journal whose epoch isn't in `epochs` is ignored. A torn record at the
+    end (the write that was cut short by a crash) is dropped, and so is
+    anything after a record that doesn't decode.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return state, 0
+    if data[:4] != JOURNAL_MAGIC or len(data) < 6 or data[4] != VERSION:
+        return state, 0
+    try:
+        file_epoch, pos = _read_varint(data, 5)
+    except _BAD_DATA:
+        return state, 0
+    if file_epoch not in epochs:
+        return state, 0
+    records = 0
+    end = len(data)
+    try:
+        while pos < end:
+            b = data[pos]
+            kind, arg = b >> 5, b & 0x1F
+            ms, pos = _read_varint(data, pos + 1)
+            if kind == GAME:
+                state, pos = _read_header(data, pos)
+            elif kind == END:
+                state = None
+            elif state is not None:
+                if kind == WORD or (kind == HINT and arg == TEXT_LETTER):
+                    value, pos = _read_text(data, pos)
+                elif kind in (LETTER, HINT):
+                    value = letter_table(state.alphabet)[arg]
+                else:
+                    value = None
+                state.apply(kind, value)
+                state.elapsed_ms = ms
+            records += 1
+    except _BAD_DATA:
+        pass    # torn tail
+    return state, records
+
+
+def read_state(path):
+    """(epoch, GameState or None, journal records) that the journal at `path` holds."""
+    epoch, state = read_snapshot(path + ".snap")
+    state, records = read_journal(path, (epoch,), state)
+    state, more = read_journal(path + ".next", (epoch, epoch + 1), state)
+    return epoch, state, records + more
+
+
+class GameJournal:
+    def __init__(self, path=DEFAULT_PATH, fsync_interval=FSYNC_INTERVAL, compact_every=COMPACT_EVERY,
+                 clock=time.monotonic):
+        self.path = path
+        self.next_path = path + ".next"
+        self.snapshot_path = path + ".snap"
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.clock = clock
+        start = time.perf_counter()
+        self.epoch, state, self.replayed = read_state(path)
+        self.load_ms = (time.perf_counter() - start) * 1000
+        if state is not None and state.game.over:
+            state = None
+        self.state = state
+        self._started = None if state is None else self.clock() - state.elapsed_ms / 1000
+        self.fd = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._wake = threading.Event()
+        # a compaction whose files the fsync thread hasn't put in place yet
+        self._pending = None
+        self._compact_again = False
+        self._syncer = None
+        if fsync_interval:
+            self._syncer = threading.Thread(target=self._sync_loop, name="hangman-journal", daemon=True)
+        # start from a fresh snapshot: a torn record must not end up in front of new ones
+        self.compact()
+        if self._syncer is not None:
+            self._syncer.start()
+
+    # what to restore
+
+    def pending(self):
+        """GameState of an unfinished game from the last run, or None."""
+        return self.state
+
+    # writing
+
+    def _write(self, buf):
+        os.write(self.fd, buf)
+        self.records += 1
+        if self.fsync_interval == 0:
+            os.fsync(self.fd)
+        else:
+            self._dirty = True
+        if self.records >= self.compact_every or (self._compact_again and self._pending is None):
+            self.compact()
+
+    def _event(self, kind, arg=0, payload=None):
+        state = self.state
+        if state is None:
+            return
+        ms = int((self.clock() - self._started) * 1000)
+        state.elapsed_ms = ms
+        buf = bytearray((kind << 5 | arg,))
+        _varint(buf, ms)
+        if payload is not None:
+            _text(buf, payload)
+        self._write(buf)
+
+    def start_game(self, seed, difficulty, category, word, max_attempts, alphabet):
+        self.state = GameState(seed, difficulty, category, alphabet, max_attempts, word)
+        self._started = self.clock()
+        buf = bytearray((GAME << 5,))
+        _varint(buf, 0)
+        _header(buf, self.state)
+        self._write(buf)
+
+    def guess(self, text):
+        """Journal what submit_guess passes to the engine."""
+        if self.state is None:
+            return
+        code = letter_code(letter_table(self.state.alphabet), text)
+        if code != TEXT_LETTER:
+            self.state.apply(LETTER, text)
+            self._event(LETTER, code)
+        else:
+            self.state.apply(WORD, text)
+            self._event(WORD, payload=text)
+
+    def hint(self, letter):
+        if self.state is None:
+            return
+        self.state.apply(HINT, letter)
+        code = letter_code(letter_table(self.state.alphabet), letter)
+        if code != TEXT_LETTER:
+            self._event(HINT, code)
+        else:
+            self._event(HINT, TEXT_LETTER, letter)
+
+    def pause(self):
+        if self.state is not None:
+            self.state.paused = True
+            self._event(PAUSE)
+
+    def resume(self):
+        if self.state is not None:
+            self.state.paused = False
+            self._event(RESUME)
+
+    def end_game(self, won=None):
+        if self.state is not None:
+            ms = int((self.clock() - self._started) * 1000)
+            self.state = None
+            # in case the compaction below has to wait for the last one
+            buf = bytearray((END << 5,))
+            _varint(buf, ms)
+            self._write(buf)
+            self.compact()
+
+    def skip_game(self):
+        """Forget the game in progress (a game the journal can't restore starts now)."""
+        self.end_game()
+
+    # compaction
+
+    def _snapshot(self, epoch):
+        buf = bytearray(SNAPSHOT_MAGIC)
+        buf.append(VERSION)
+        _varint(buf, epoch)
+        state = self.state
+        if state is None:
+            buf.append(0)
+            return buf
+        buf.append(1)
+        _header(buf, state)
+        _varint(buf, state.game.guessed_mask)
+        _varint(buf, state.game.wrong_attempts)
+        _varint(buf, state.guesses)
+        _varint(buf, state.hints)
+        buf.append(1 if state.paused else 0)
+        _varint(buf, state.elapsed_ms)
+        return buf
+
+    def compact(self):
+        """Fold the journal into a new snapshot and start an empty journal.
+
+        Only the switch to the new journal happens here; with an fsync thread
+        the rest (see _finish) happens there.
+        """
+        if self._pending is not None:
+            # the last one isn't in place yet and its journal is still at .next
+            self._compact_again = True
+            return
+        self._compact_again = False
+        epoch = self.epoch + 1
+        snapshot = self._snapshot(epoch)
+        header = bytearray(JOURNAL_MAGIC)
+        header.append(VERSION)
+        _varint(header, epoch)
+        fd = os.open(self.next_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        os.write(fd, header)
+        with self._lock:
+            old, self.fd = self.fd, fd
+            self._dirty = False
+        self.epoch = epoch
+        self.records = 0
+        job = (snapshot, old, fd)
+        if self._syncer is None:
+            self._finish(job)
+        else:
+            self._pending = job
+            self._wake.set()
+
+    def _finish(self, job):
+        # until the rename, read_state replays the old journal and then .next
+        snapshot, old, fd = job
+        durable = self.fsync_interval is not None
+        if durable:
+            os.fsync(fd)
+        _replace(self.snapshot_path, snapshot, durable)
+        os.replace(self.next_path, self.path)
+        if old is not None:
+            os.close(old)
+
+    # fsync batching
+
+    def _sync_loop(self):
+        while True:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            job = self._pending
+            if job is not None:
+                try:
+                    self._finish(job)
+                except OSError:
+                    pass    # the files stay readable; the next compaction tries again
+                self._pending = None
+            self.sync()
+            if self._closed.is_set():
+                return
+
+    def sync(self):
+        with self._lock:
+            if self._dirty and self.fd is not None:
+                self._dirty = False
+                os.fsync(self.fd)
+
+    def close(self):
+        """Stop the fsync thread; an unfinished game stays in the journal for next time."""
+        self._closed.set()
+        self._wake.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        self.sync()
+        with self._lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+
+def _replace(path, data, durable=True):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect the Hangman game journal.")
+    parser.add_argument("cmd", choices=("show",))
+    parser.add_argument("--journal", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    epoch, state, records = read_state(args.journal)
+    ms = (time.perf_counter() - start) * 1000
+    print(f"epoch {epoch}, {records} journal records, read in {ms:.2f} ms")
+    if state is None or state.game.over:
+        print("no game to restore")
+        return
+    game = state.game
+    pattern = "".join(ch if game.is_guessed(game.alphabet.canonical.get(ch, ch)) or ch not in game.alphabet.bits
+                      else "_" for ch in game.secret_word)
+    print(f"{state.difficulty}/{state.category}: {pattern}  guessed {''.join(game.guessed_letters)}  "
+          f"wrong {game.wrong_attempts}/{game.max_attempts}  hints {state.hints}  "
+          f"{'paused' if state.paused else 'playing'}  {state.elapsed_ms / 1000:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
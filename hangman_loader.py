@@ -0,0 +1,487 @@
+"""Streaming loader for large external word lists.
+
+Sources are read line by line (plain text, CSV or JSONL with difficulty and
+category columns), normalised and deduplicated in chunks, and stored in a
+compact WordStore: one UTF-8 buffer plus an offset array, instead of one
+Python str per word.
+
+Normalisation (casefold, NFC, whitespace; see hangman_alphabet.py) is done a
+chunk at a time. With a NormalizedCache, the normalised entries of each
+source are saved under the hash of the file's contents, so loading the same
+file again skips parsing and normalisation.
+
+    python hangman_loader.py words.csv more_words.jsonl --alphabet es --cache
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import islice
+
+from hangman_alphabet import ENGLISH, NORMALIZE_VERSION, get_alphabet, normalize_batch
+from hangman_words import (CATEGORY_FLAGS, DIFFICULTY_FLAGS, MIXED, WORD_LISTS,
+                           WordIndex, pair_flags)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CHUNK_SIZE = 50_000
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".hangman_cache")
+
+# what entries without a difficulty / category column get; Mixed puts a word in every category
+DEFAULT_DIFFICULTY = "Easy"
+DEFAULT_CATEGORY = MIXED
+
+_DIFFICULTY_NAMES = {d.lower(): d for d in DIFFICULTY_FLAGS}
+_CATEGORY_NAMES = {c.lower(): c for c in CATEGORY_FLAGS}
+_ALL_CATEGORIES = sum(CATEGORY_FLAGS.values())
+
+
+class WordStore:
+    """Append-only, deduplicated word table.
+
+    Words live in one bytearray; word i is buf[offsets[i]:offsets[i + 1]].
+    Lookups go through an open-addressing table of word ids, so no per-word
+    Python objects are kept around.
+    """
+
+    def __init__(self, alphabet=ENGLISH):
+        self.alphabet = alphabet
+        self._buf = bytearray()
+        self._offsets = array("Q", [0])
+        self.difficulty_flags = array("B")
+        self.category_flags = array("B")
+        self._slots = array("q", [-1]) * 1024
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return self._buf[self._offsets[i]:self._offsets[i + 1]].decode()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def raw(self, i):
+        return bytes(self._buf[self._offsets[i]:self._offsets[i + 1]])
+
+    def _find(self, data, h):
+        """Slot index holding `data`, or the empty slot where it would go."""
+        slots = self._slots
+        mask = len(slots) - 1
+        buf = self._buf
+        offsets = self._offsets
+        j = h & mask
+        while True:
+            i = slots[j]
+            if i < 0 or buf[offsets[i]:offsets[i + 1]] == data:
+                return j
+            j = (j + 1) & mask
+
+    def _grow(self):
+        slots = array("q", [-1]) * (len(self._slots) * 2)
+        mask = len(slots) - 1
+        for i in range(len(self)):
+            j = hash(self.raw(i)) & mask
+            while slots[j] >= 0:
+                j = (j + 1) & mask
+            slots[j] = i
+        self._slots = slots
+
+    def index(self, word):
+        """Id of `word` (already normalised), or -1."""
+        data = word.encode()
+        return self._slots[self._find(data, hash(data))]
+
+    def add(self, word, difficulty_flags=0, categories=0):
+        """Add a normalised word listed under `difficulty_flags` x `categories`
+        (or merge that into its flags if present); returns its id."""
+        data = word.encode()
+        h = hash(data)
+        j = self._find(data, h)
+        i = self._slots[j]
+        if i < 0:
+            if (len(self) + 1) * 2 > len(self._slots):
+                self._grow()
+                j = self._find(data, h)
+            i = len(self)
+            self._buf += data
+            self._offsets.append(len(self._buf))
+            self.difficulty_flags.append(0)
+            self.category_flags.append(0)
+            self._slots[j] = i
+        self.difficulty_flags[i] |= difficulty_flags
+        self.category_flags[i] |= pair_flags(difficulty_flags, categories)
+        return i
+
+    def nbytes(self):
+        return (len(self._buf) + self._offsets.itemsize * len(self._offsets)
+                + len(self.difficulty_flags) + len(self.category_flags)
+                + self._slots.itemsize * len(self._slots))
+
+
+# Sources
+
+def _detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "txt"
+
+
+def iter_entries(path, difficulty=None, category=None, fmt=None):
+    """Yield raw (word, difficulty, category) tuples from a source file.
+
+    txt:   one word per line, optionally "word<TAB>difficulty<TAB>category"
+    csv:   header row with word, difficulty and category columns
+    jsonl: {"word": ..., "difficulty": ..., "category": ...} per line
+    Missing columns fall back to the `difficulty` / `category` arguments.
+    """
+    fmt = fmt or _detect_format(path)
+    with io.open(path, encoding="utf-8", newline="") as f:
+        yield from read_entries(f, fmt, difficulty, category)
+
+
+def read_entries(f, fmt, difficulty=None, category=None):
+    """iter_entries over an open text file (f.buffer.tell() shows how far it got)."""
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        cols = [header.index(name) if name in header else None
+                for name in ("word", "difficulty", "category")]
+        defaults = ("", difficulty, category)
+        for row in reader:
+            yield tuple(row[i] or default if i is not None and i < len(row) else default
+                        for i, default in zip(cols, defaults))
+    elif fmt == "jsonl":
+        for n, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    obj = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"line {n}: {e}")
+                if not isinstance(obj, dict):
+                    raise ValueError(f"line {n}: expected a JSON object, got {line.strip()[:40]}")
+                entry = (obj.get("word") or "", obj.get("difficulty") or difficulty,
+                         obj.get("category") or category)
+                for name, value in zip(("word", "difficulty", "category"), entry):
+                    if value is not None and not isinstance(value, str):
+                        raise ValueError(f"line {n}: {name!r} must be a string, got {value!r:.40}")
+                yield entry
+    else:
+        for line in f:
+            cols = line.rstrip("\r\n").split("\t")
+            yield (cols[0], cols[1] if len(cols) > 1 else difficulty,
+                   cols[2] if len(cols) > 2 else category)
+
+
+def iter_chunks(iterable, size=CHUNK_SIZE):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalize_chunk(chunk, alphabet=ENGLISH):
+    """Normalise a chunk of raw entries to (word, difficulty_bit, category_bit).
+
+    Uses the same rule as normalize_list; entries with no letter of the
+    alphabet or an unknown difficulty / category come back with zero flags.
+    """
+    words = normalize_batch([word for word, _, _ in chunk])
+    has_letters = alphabet.has_letters
+    # the same few difficulty / category spellings repeat over and over
+    dbits = {}
+    cbits = {}
+    out = []
+    for word, (_, d, c) in zip(words, chunk):
+        dbit = dbits.get(d)
+        if dbit is None:
+            name = _DIFFICULTY_NAMES.get((d or "").strip().lower())
+            dbit = dbits[d] = DIFFICULTY_FLAGS[name] if name else 0
+        cbit = cbits.get(c)
+        if cbit is None:
+            key = (c or "").strip().lower()
+            name = _CATEGORY_NAMES.get(key)
+            cbit = cbits[c] = CATEGORY_FLAGS[name] if name else _ALL_CATEGORIES if key == "mixed" else 0
+        if not dbit or not cbit or not has_letters(word):
+            out.append((word, 0, 0))
+        else:
+            out.append((word, dbit, cbit))
+    return out
+
+
+# Normalisation cache
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class NormalizedCache:
+    """Normalised entries of source files, keyed by content hash and alphabet.
+
+    A cache file is the kept words joined by newlines, then one difficulty
+    and one category byte per word, then a trailer with the counts.
+    """
+    MAGIC = b"HMNC"
+    TRAILER = struct.Struct("<QQQQ")    # words, word bytes, entries read, entries skipped
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, digest, alphabet, defaults=""):
+        # defaults: the difficulty / category given to entries without one
+        return os.path.join(self.directory, f"{digest}.{alphabet.name}{defaults}.v{NORMALIZE_VERSION}.norm")
+
+    def get(self, path, alphabet, defaults=""):
+        """(digest, [(word, dbit, cbit)], entries, skipped); entries is None on a miss."""
+        digest = file_digest(path)
+        try:
+            with open(self.path_for(digest, alphabet, defaults), "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return digest, None, 0, 0
+        size = self.TRAILER.size
+        if data[:4] != self.MAGIC or len(data) < 4 + size:
+            self.misses += 1
+            return digest, None, 0, 0
+        count, nbytes, entries, skipped = self.TRAILER.unpack_from(data, len(data) - size)
+        words = data[4:4 + nbytes].decode("utf-8").split("\n")[:count]
+        flags = data[4 + nbytes:4 + nbytes + 2 * count]
+        self.hits += 1
+        return digest, zip(words, flags[0::2], flags[1::2]), entries, skipped
+
+    def writer(self, digest, alphabet, defaults=""):
+        os.makedirs(self.directory, exist_ok=True)
+        return _CacheWriter(self, self.path_for(digest, alphabet, defaults))
+
+
+class _CacheWriter:
+    """Streams the kept entries of one source into its cache file."""
+
+    def __init__(self, cache, path):
+        self.cache = cache
+        self.path = path
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp, "wb")
+        self.file.write(cache.MAGIC)
+        self.count = 0
+        self.nbytes = 0
+        self.flags = bytearray()
+
+    def write(self, kept):
+        if not kept:
+            return
+        data = ("\n".join(w for w, _, _ in kept) + "\n").encode("utf-8")
+        self.file.write(data)
+        self.nbytes += len(data)
+        self.count += len(kept)
+        for _, d, c in kept:
+            self.flags += bytes((d, c))
+
+    def finish(self, entries, skipped):
+        self.file.write(self.flags)
+        self.file.write(self.cache.TRAILER.pack(self.count, self.nbytes, entries, skipped))
+        self.file.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.tmp)
+        except OSError:
+            pass
+
+
+# Loading
+
+def peak_rss_bytes():
+    """Peak resident memory of this process, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class LoadReport:
+    def __init__(self):
+        self.entries = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.words = 0
+        self.seconds = 0.0
+        self.store_bytes = 0
+        self.peak_rss = None
+        self.cached_files = 0
+
+    @property
+    def entries_per_second(self):
+        return self.entries / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        d = dict(vars(self))
+        d["entries_per_second"] = round(self.entries_per_second)
+        return d
+
+    def __str__(self):
+        peak = f"{self.peak_rss / 2**20:.1f} MiB" if self.peak_rss else "n/a"
+        return (f"{self.entries} entries -> {self.words} words "
+                f"({self.duplicates} duplicates, {self.skipped} skipped) in {self.seconds:.2f}s, "
+                f"{self.entries_per_second:,.0f} entries/s, store {self.store_bytes / 2**20:.1f} MiB, "
+                f"peak RSS {peak}" + (f", {self.cached_files} file(s) from cache" if self.cached_files else ""))
+
+
+def _add_normalized(store, normalized, report, kept=None):
+    before = len(store)
+    add = store.add
+    n = 0
+    for entry in normalized:
+        word, dbit, cbit = entry
+        if not dbit or not cbit:
+            report.skipped += 1
+            continue
+        add(word, dbit, cbit)
+        n += 1
+        if kept is not None:
+            kept.append(entry)
+    report.duplicates += n - (len(store) - before)
+
+
+def load_entries(entries, store=None, chunk_size=CHUNK_SIZE, report=None, progress=None, sink=None):
+    """Stream raw entries into a WordStore; returns (store, report).
+
+    `sink`, if given, is called with the normalised entries kept from each chunk.
+    """
+    store = store if store is not None else WordStore()
+    report = report or LoadReport()
+    start = time.perf_counter()
+    for chunk in iter_chunks(entries, chunk_size):
+        report.entries += len(chunk)
+        kept = [] if sink is not None else None
+        _add_normalized(store, normalize_chunk(chunk, store.alphabet), report, kept)
+        if sink is not None:
+            sink(kept)
+        if progress is not None:
+            progress(report.entries, len(store))
+    report.seconds += time.perf_counter() - start
+    report.words = len(store)
+    report.store_bytes = store.nbytes()
+    report.peak_rss = peak_rss_bytes()
+    return store, report
+
+
+def load_files(paths, store=None, chunk_size=CHUNK_SIZE, progress=None, alphabet=ENGLISH, cache=None,
+               difficulty=DEFAULT_DIFFICULTY, category=DEFAULT_CATEGORY):
+    """Load source files into a WordStore; returns (store, report).
+
+    Entries without a difficulty / category get `difficulty` / `category`.
+    With a NormalizedCache, files seen before (same contents, alphabet and
+    defaults) are loaded from their cached normalised entries.
+    """
+    store = store if store is not None else WordStore(alphabet)
+    report = LoadReport()
+    defaults = f".{difficulty}-{category}".lower()
+    for path in paths:
+        if cache is None:
+            store, report = load_entries(iter_entries(path, difficulty, category), store, chunk_size,
+                                         report, progress)
+            continue
+        start = time.perf_counter()
+        digest, cached, entries, skipped = cache.get(path, store.alphabet, defaults)
+        if cached is not None:
+            report.entries += entries
+            report.skipped += skipped
+            _add_normalized(store, cached, report)
+            report.cached_files += 1
+            report.seconds += time.perf_counter() - start
+            if progress is not None:
+                progress(report.entries, len(store))
+            continue
+        entries, skipped = report.entries, report.skipped
+        try:
+            writer = cache.writer(digest, store.alphabet, defaults)
+        except OSError:
+            writer = None   # loading still works, it just won't be cached
+        try:
+            store, report = load_entries(iter_entries(path, difficulty, category), store, chunk_size,
+                                         report, progress,
+                                         writer.write if writer else None)
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        if writer:
+            writer.finish(report.entries - entries, report.skipped - skipped)
+    report.words = len(store)
+    report.store_bytes = store.nbytes()
+    report.peak_rss = peak_rss_bytes()
+    return store, report
+
+
+def builtin_entries():
+    """The built-in word lists as raw entries."""
+    for (d, c), words in WORD_LISTS.items():
+        for w in words:
+            yield w, d, c
+
+
+def load_index(paths, chunk_size=CHUNK_SIZE, alphabet=ENGLISH, cache=None,
+               difficulty=DEFAULT_DIFFICULTY, category=DEFAULT_CATEGORY):
+    """WordIndex over the given files; returns (index, report)."""
+    store, report = load_files(paths, chunk_size=chunk_size, alphabet=alphabet, cache=cache,
+                               difficulty=difficulty, category=category)
+    return WordIndex(store, store.difficulty_flags, store.category_flags, alphabet=alphabet), report
+
+
+def add_default_args(parser):
+    """--difficulty / --category: what entries without those columns get."""
+    parser.add_argument("--difficulty", default=DEFAULT_DIFFICULTY, type=str.capitalize,
+                        choices=tuple(DIFFICULTY_FLAGS),
+                        help=f"difficulty of words that don't give one (default {DEFAULT_DIFFICULTY})")
+    parser.add_argument("--category", default=DEFAULT_CATEGORY, type=str.capitalize,
+                        choices=tuple(CATEGORY_FLAGS) + (MIXED,),
+                        help=f"category of words that don't give one; {MIXED} puts them in every "
+                             f"category (default {DEFAULT_CATEGORY})")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Load word lists and report throughput / memory.")
+    parser.add_argument("paths", nargs="+", help="txt / csv / jsonl word sources")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--alphabet", default="en", help="letters the words are played with (en, es, de, el, ru)")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, metavar="DIR",
+                        help="reuse / save normalised sources in this directory")
+    add_default_args(parser)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    cache = NormalizedCache(args.cache) if args.cache else None
+    _, report = load_files(args.paths, chunk_size=args.chunk_size, alphabet=get_alphabet(args.alphabet),
+                           cache=cache, difficulty=args.difficulty, category=args.category)
+    print(json.dumps(report.as_dict()) if args.json else report)
+
+
+if __name__ == "__main__":
+    main()
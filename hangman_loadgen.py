@@ -0,0 +1,362 @@
+"""Load generator for hangman_server.
+
+Runs many simulated players against a server over loopback, each player on
+its own connection. A player starts a game and thinks (a random pause from
+--think) before every move, then makes one of the moves GameScreen allows:
+a letter guess, a full-word guess once only a few letters are missing, a
+hint, or pausing and later resuming (the Esc key). When the game is over
+the player starts another one, until the run ends.
+
+The report has the request rate, latency percentiles and error counts per
+action, and a timeline of request rate and server memory. Memory is read
+from /proc (Linux), so it needs a server started with --spawn or its pid
+given with --server-pid. Use --json for a report that can be diffed between
+releases.
+
+    python hangman_loadgen.py --spawn --players 2000 --duration 60 --json > run.json
+    python hangman_loadgen.py --port 7777 --server-pid 4242 --think exp --think-mean 0.5
+
+All players share one event loop. If "client_lag_ms" in the report grows
+large, the generator itself is saturated and its latencies run high.
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+from hangman_selfplay import percentile
+from hangman_solver import Solver
+from hangman_words import CATEGORIES, DIFFICULTIES, MIXED, WORD_INDEX
+
+ACTIONS = ("start", "guess", "word", "hint", "pause", "resume", "end")
+# letters in rough order of how often they occur in English words
+LETTER_ORDER = "eariotnslcudpmhgbfywkvxzjq"
+
+
+def think_sampler(kind, mean, rng):
+    """Function returning think times (seconds) with the given mean."""
+    if mean <= 0 or kind == "fixed":
+        return lambda: max(0.0, mean)
+    if kind == "exp":
+        return lambda: rng.expovariate(1 / mean)
+    if kind == "lognormal":
+        # long tail, like people: most moves quick, some very slow
+        sigma = 0.8
+        mu = math.log(mean) - sigma * sigma / 2
+        return lambda: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"unknown think time distribution {kind!r}")
+
+
+def process_rss(pid):
+    """Resident memory of a process in bytes, or None where /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class ActionStats:
+    __slots__ = ("latencies", "rejected", "errors")
+
+    def __init__(self):
+        self.latencies = []
+        self.rejected = 0     # the server answered ok: false
+        self.errors = 0       # timeouts and dropped connections
+
+    def as_dict(self):
+        lat = sorted(self.latencies)
+        count = len(lat) + self.errors
+        return {
+            "count": count,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "error_rate": (self.rejected + self.errors) / count if count else 0.0,
+            "latency_ms": {name: percentile(lat, q) * 1000
+                           for name, q in (("p50", .5), ("p90", .9), ("p99", .99), ("p999", .999),
+                                           ("max", 1.0))},
+        }
+
+
+class LoadGenerator:
+    def __init__(self, host, port, players=1000, duration=30.0, ramp=5.0, think="lognormal",
+                 think_mean=1.0, hint_rate=0.05, pause_rate=0.02, word_rate=0.5, timeout=10.0,
+                 index=WORD_INDEX, seed=None, server_pid=None, sample=1.0):
+        self.host = host
+        self.port = port
+        self.players = players
+        self.duration = duration
+        self.ramp = ramp
+        self.think = think
+        self.think_mean = think_mean
+        self.hint_rate = hint_rate
+        self.pause_rate = pause_rate
+        self.word_rate = word_rate
+        self.timeout = timeout
+        self.index = index      # the words players know, for full-word guesses
+        self.letters = LETTER_ORDER if index.alphabet.name == "en" else index.alphabet.letters
+        self.seed = seed
+        self.server_pid = server_pid
+        self.sample = sample
+        self.stats = {action: ActionStats() for action in ACTIONS}
+        self.requests = 0
+        self.games = 0
+        self.finished = 0
+        self.wins = 0
+        self.connected = 0
+        self.timeline = []
+        self.lag = []
+        self._solvers = {}
+        self._deadline = 0.0
+
+    def solver(self, difficulty, category):
+        key = (difficulty, category)
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = self._solvers[key] = Solver.for_pool(self.index, difficulty, category)
+        return solver
+
+    # one player
+
+    async def _request(self, conn, action, request):
+        reader, writer = conn
+        self.requests += 1
+        stats = self.stats[action]
+        start = time.perf_counter()
+        try:
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError("server closed the connection")
+        except (OSError, asyncio.TimeoutError):
+            stats.errors += 1
+            raise ConnectionError(action)
+        stats.latencies.append(time.perf_counter() - start)
+        response = json.loads(line)
+        if not response.get("ok"):
+            stats.rejected += 1
+        return response
+
+    async def _game(self, conn, rng, pause):
+        difficulty = rng.choice(DIFFICULTIES)
+        category = rng.choice(CATEGORIES + (MIXED,))
+        state = await self._request(conn, "start", {"action": "start", "difficulty": difficulty,
+                                                    "category": category})
+        if not state.get("ok"):
+            return
+        self.games += 1
+        sid = state["session"]
+        tried = set()
+        while state.get("status") in ("playing", "paused") and time.monotonic() < self._deadline:
+            await asyncio.sleep(pause())
+            roll = rng.random()
+            if state["status"] == "paused":
+                request = {"action": "resume"}
+            elif roll < self.pause_rate:
+                request = {"action": "pause"}
+            elif roll < self.pause_rate + self.hint_rate:
+                request = {"action": "hint"}
+            else:
+                request = self._guess(rng, difficulty, category, state, tried)
+            action = request["action"]
+            if action == "guess" and len(request["guess"]) > 1:
+                action = "word"
+            request["session"] = sid
+            response = await self._request(conn, action, request)
+            if response.get("ok"):
+                state = response
+        if state.get("status") in ("won", "lost"):
+            self.finished += 1
+            self.wins += state["status"] == "won"
+        await self._request(conn, "end", {"action": "end", "session": sid})
+
+    def _guess(self, rng, difficulty, category, state, tried):
+        pattern = self.index.alphabet.fold(state["pattern"])
+        if pattern.count("_") <= 2 and rng.random() < self.word_rate:
+            wrong = "".join(ch for ch in state["guessed"] if ch not in pattern)
+            words = [w for w in self.solver(difficulty, category).candidates(pattern, wrong)
+                     if w not in tried]
+            if words:
+                word = rng.choice(words)
+                tried.add(word)
+                return {"action": "guess", "guess": word}
+        left = [ch for ch in self.letters if ch not in state["guessed"]]
+        if not left:
+            return {"action": "hint"}
+        # mostly common letters first, with some variety between players
+        return {"action": "guess", "guess": left[min(len(left) - 1, int(rng.expovariate(0.5)))]}
+
+    async def _player(self, n):
+        rng = random.Random(None if self.seed is None else self.seed * 1_000_003 + n)
+        pause = think_sampler(self.think, self.think_mean, rng)
+        await asyncio.sleep(self.ramp * n / max(1, self.players))
+        while time.monotonic() < self._deadline:
+            try:
+                conn = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                self.stats["start"].errors += 1
+                await asyncio.sleep(1.0)
+                continue
+            self.connected += 1
+            try:
+                while time.monotonic() < self._deadline:
+                    await self._game(conn, rng, pause)
+            except ConnectionError:
+                await asyncio.sleep(1.0)    # reconnect
+            finally:
+                self.connected -= 1
+                conn[1].close()
+
+    # run
+
+    def _rss(self):
+        return process_rss(self.server_pid) if self.server_pid else None
+
+    async def _sampler(self, start):
+        last = 0
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.sample)
+            now = time.monotonic()
+            # how late the loop woke us: the generator's own scheduling delay
+            self.lag.append(now - before - self.sample)
+            self.timeline.append({"t": round(now - start, 3),
+                                  "requests_per_second": (self.requests - last) / (now - before),
+                                  "players_connected": self.connected,
+                                  "server_rss": self._rss()})
+            last = self.requests
+
+    async def run(self):
+        rss_start = self._rss()
+        start = time.monotonic()
+        self._deadline = start + self.duration
+        sampler = asyncio.ensure_future(self._sampler(start))
+        try:
+            await asyncio.gather(*(self._player(n) for n in range(self.players)))
+        finally:
+            sampler.cancel()
+        elapsed = time.monotonic() - start
+        return self.report(elapsed, rss_start, self._rss())
+
+    def report(self, elapsed, rss_start, rss_end):
+        samples = [p["server_rss"] for p in self.timeline if p["server_rss"] is not None]
+        lag = sorted(self.lag)
+        return {
+            "config": {"players": self.players, "duration": self.duration, "ramp": self.ramp,
+                       "think": self.think, "think_mean": self.think_mean, "hint_rate": self.hint_rate,
+                       "pause_rate": self.pause_rate, "word_rate": self.word_rate, "seed": self.seed},
+            "python": platform.python_version(),
+            "seconds": elapsed,
+            "requests": self.requests,
+            "requests_per_second": self.requests / elapsed if elapsed else 0.0,
+            "games_started": self.games,
+            "games_finished": self.finished,
+            "win_rate": self.wins / self.finished if self.finished else 0.0,
+            "actions": {action: s.as_dict() for action, s in self.stats.items()},
+            "server_rss": {
+                "start": rss_start,
+                "end": rss_end,
+                "max": max(samples + [rss_end] if rss_end else samples, default=None),
+                "growth": rss_end - rss_start if rss_start and rss_end else None,
+            },
+            "client_lag_ms": {"p99": percentile(lag, .99) * 1000, "max": percentile(lag, 1.0) * 1000},
+            "timeline": self.timeline,
+        }
+
+
+async def spawn_server(host, extra_args=()):
+    """Start hangman_server.py on a free port; returns (process, port)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hangman_server.py")
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, script, "--host", host, "--port", "0", *extra_args,
+        stdout=asyncio.subprocess.PIPE)
+    line = (await proc.stdout.readline()).decode()
+    if not line.startswith("hangman server on"):
+        proc.kill()
+        raise RuntimeError(f"server didn't start: {line!r}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+
+def _print_report(r):
+    print(f"{r['requests']} requests in {r['seconds']:.1f} s ({r['requests_per_second']:.0f}/s), "
+          f"{r['games_finished']} games finished")
+    print(f"  {'action':<7} {'count':>8} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'p999 ms':>8} {'max ms':>8}")
+    for action, s in r["actions"].items():
+        if s["count"]:
+            lat = s["latency_ms"]
+            print(f"  {action:<7} {s['count']:>8} {s['rejected'] + s['errors']:>7} {lat['p50']:>8.2f} "
+                  f"{lat['p99']:>8.2f} {lat['p999']:>8.2f} {lat['max']:>8.2f}")
+    rss = r["server_rss"]
+    if rss["growth"] is not None:
+        print(f"  server rss {rss['start'] / 2**20:.1f} -> {rss['end'] / 2**20:.1f} MiB "
+              f"(max {rss['max'] / 2**20:.1f} MiB)")
+    print(f"  client lag p99 {r['client_lag_ms']['p99']:.1f} ms")
+
+
+async def _main(args):
+    proc = None
+    port = args.port
+    pid = args.server_pid
+    if args.spawn:
+        proc, port = await spawn_server(args.host, args.server_arg)
+        pid = proc.pid
+    index = WORD_INDEX
+    if args.pack:
+        from hangman_pack import open_index
+        index = open_index(args.pack)
+    gen = LoadGenerator(args.host, port, args.players, args.duration, args.ramp, args.think,
+                        args.think_mean, args.hint_rate, args.pause_rate, args.word_rate,
+                        args.timeout, index, args.seed, pid, args.sample)
+    try:
+        return await gen.run()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            await proc.wait()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate many players against a Hangman server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--spawn", action="store_true", help="start a server on a free port for the run")
+    parser.add_argument("--server-arg", action="append", default=[], metavar="ARG",
+                        help="extra argument for the spawned server (repeatable)")
+    parser.add_argument("--server-pid", type=int, help="pid of the server, to sample its memory")
+    parser.add_argument("--pack", help="word pack the server uses (players use it for full-word guesses)")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which players join")
+    parser.add_argument("--think", choices=("lognormal", "exp", "fixed"), default="lognormal")
+    parser.add_argument("--think-mean", type=float, default=1.0, help="mean think time in seconds")
+    parser.add_argument("--hint-rate", type=float, default=0.05, help="share of moves that are hints")
+    parser.add_argument("--pause-rate", type=float, default=0.02, help="share of moves that pause the game")
+    parser.add_argument("--word-rate", type=float, default=0.5,
+                        help="chance of a full-word guess when two or fewer letters are missing")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a request counts as failed")
+    parser.add_argument("--sample", type=float, default=1.0, help="seconds between timeline samples")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    if args.spawn and args.pack:
+        args.server_arg += ["--pack", args.pack]
+
+    report = asyncio.run(_main(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
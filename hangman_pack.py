@@ -0,0 +1,208 @@
+"""Compiled binary word packs, opened with mmap.
+
+A pack holds everything choose_word needs, already normalised and resolved:
+
+    header   magic, version, alphabet code, word count, section offsets
+    offsets  u64[count + 1]   byte offsets of each word in the string data
+    dflags   u8[count]        difficulty flags
+    cflags   u8[count]        category flags, per difficulty (see hangman_words.pair_flags)
+    pools    (u64 start, u64 length) per pool_keys() entry, into `ids`
+    ids      u32[...]         word ids of the non-empty base pools
+    strings  UTF-8 data
+
+All integers are little-endian and every section is 8-byte aligned. Opening
+a pack only maps the file and builds memoryviews over it, so a 10M-word pack
+opens in milliseconds and its pages are shared between processes.
+
+    python hangman_pack.py compile words.pack words.csv more.jsonl
+    python hangman_pack.py info words.pack
+"""
+
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+from hangman_alphabet import ENGLISH, alphabet_code, get_alphabet
+from hangman_loader import (DEFAULT_CACHE_DIR, NormalizedCache, add_default_args, builtin_entries, load_entries,
+                            load_files)
+from hangman_words import DEFAULT_KEY, WordIndex, pool_keys
+
+MAGIC = b"HMPK"
+VERSION = 1
+
+# magic, version, alphabet code (0 = English), count, id count, then the offsets of the
+# offsets / dflags / cflags / pools / ids / strings sections
+_HEADER = struct.Struct("<4sHHQQ6Q")
+_POOL = struct.Struct("<QQ")
+
+
+def _check_byteorder():
+    # sections are written / cast with native arrays
+    if sys.byteorder != "little":
+        raise OSError("word packs are only supported on little-endian machines")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def compile_pack(path, store):
+    """Write a WordStore (or any word table with flag arrays) to `path`."""
+    _check_byteorder()
+    alphabet = getattr(store, "alphabet", ENGLISH)
+    index = WordIndex(store, store.difficulty_flags, store.category_flags, alphabet=alphabet)
+    count = len(store)
+
+    offsets = array("Q", [0])
+    data = bytearray()
+    for i in range(count):
+        data += store[i].encode()
+        offsets.append(len(data))
+
+    # base pools are written once; fallback keys point at the same range
+    ids = array("I")
+    ranges = {}
+    pool_table = []
+    for key in pool_keys():
+        pool = index.pool(*key)
+        start = ranges.get(id(pool.obj))
+        if start is None:
+            start = ranges[id(pool.obj)] = len(ids)
+            ids.extend(pool)
+        pool_table.append(_POOL.pack(start, len(pool)))
+
+    sections = [offsets.tobytes(), bytes(store.difficulty_flags), bytes(store.category_flags),
+                b"".join(pool_table), ids.tobytes(), bytes(data)]
+    starts = []
+    pos = _align(_HEADER.size)
+    for sec in sections:
+        starts.append(pos)
+        pos = _align(pos + len(sec))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, alphabet_code(alphabet), count, len(ids), *starts))
+        for start, sec in zip(starts, sections):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(sec)
+    return pos
+
+
+class WordPack:
+    """Read-only, zero-copy view of a compiled pack (indexable like a word list).
+
+    The file stays mapped until close() (or the end of a with block); the
+    index and pools it hands out can't be used after that.
+    """
+
+    def __init__(self, path):
+        _check_byteorder()
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(self._mmap)
+        self._views = [mv]      # released by close(), children first
+        if len(mv) < _HEADER.size or _HEADER.unpack_from(mv)[:2] != (MAGIC, VERSION):
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} word pack")
+        _, _, code, count, nids, *starts = _HEADER.unpack_from(mv)
+        self.alphabet = get_alphabet(code)
+        s_off, s_d, s_c, s_pool, s_ids, s_str = starts
+        self.count = count
+        self.offsets = self._view(mv[s_off:s_off + 8 * (count + 1)].cast("Q"))
+        self.difficulty_flags = self._view(mv[s_d:s_d + count])
+        self.category_flags = self._view(mv[s_c:s_c + count])
+        ids = self._view(mv[s_ids:s_ids + 4 * nids].cast("I"))
+        self._strings = self._view(mv[s_str:])
+        self.pools = {}
+        for n, key in enumerate(pool_keys()):
+            start, length = _POOL.unpack_from(mv, s_pool + n * _POOL.size)
+            self.pools[key] = self._view(ids[start:start + length])
+
+    def _view(self, view):
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """Unmap the file (the pools and indexes of this pack stop working)."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        return str(self._strings[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def index(self):
+        """WordIndex that draws straight from the mapped pools."""
+        if not len(self.pools[DEFAULT_KEY]):
+            raise ValueError(f"{self.path}: pack has no words for the default pool")
+        return WordIndex(self, self.difficulty_flags, self.category_flags, pools=self.pools,
+                         alphabet=self.alphabet)
+
+
+def open_index(path):
+    return WordPack(path).index()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile or inspect Hangman word packs.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_compile = sub.add_parser("compile", help="compile word sources into a pack")
+    p_compile.add_argument("output")
+    p_compile.add_argument("sources", nargs="*", help="txt / csv / jsonl files (default: built-in lists)")
+    p_compile.add_argument("--alphabet", default="en", help="letters the words are played with (en, es, de, el, ru)")
+    p_compile.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, metavar="DIR",
+                           help="reuse / save normalised sources in this directory")
+    add_default_args(p_compile)
+    p_info = sub.add_parser("info", help="show pool sizes of a pack")
+    p_info.add_argument("pack")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "compile":
+        if args.sources:
+            cache = NormalizedCache(args.cache) if args.cache else None
+            store, report = load_files(args.sources, alphabet=get_alphabet(args.alphabet), cache=cache,
+                                       difficulty=args.difficulty, category=args.category)
+        else:
+            store, report = load_entries(builtin_entries())
+        print(report)
+        try:
+            size = compile_pack(args.output, store)
+        except ValueError as e:
+            parser.exit(1, f"error: {e} (a pack needs Easy words; see --difficulty)\n")
+        print(f"wrote {args.output}: {len(store)} words, {size / 2**20:.1f} MiB")
+    else:
+        start = time.perf_counter()
+        try:
+            pack = WordPack(args.pack)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"error: {e}\n")
+        with pack:
+            ms = (time.perf_counter() - start) * 1000
+            print(f"{args.pack}: {len(pack)} words ({pack.alphabet.name}), opened in {ms:.2f} ms")
+            for key, pool in pack.pools.items():
+                print(f"  {key[0]:<8} {key[1]:<11} {len(pool)}")
+            if not len(pack.pools[DEFAULT_KEY]):
+                print("  no words for the default pool: the game can't play this pack")
+
+
+if __name__ == "__main__":
+    main()
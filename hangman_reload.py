@@ -0,0 +1,229 @@
+"""Hot reload of word source files.
+
+SourceWatcher loads txt / csv / jsonl word sources into one WordStore and
+polls their size and mtime. When a file changes only that file is read
+again; its words are diffed against what it contributed before, and the
+difference is applied to copies of the affected pool id arrays (untouched
+pools are shared with the old index). The result is a new WordIndex which
+the caller swaps in with a single assignment, so a draw sees either the old
+pools or the new ones, never a half-updated one.
+
+Word ids never change: the store is append-only and a removed word just
+drops out of every pool. Games in progress, including server sessions that
+only keep a word id, carry on with their word.
+
+    python hangman_reload.py my_words.csv extra.txt     # print pool changes as the files are edited
+"""
+
+import csv
+import io
+import os
+import time
+from array import array
+
+from hangman_alphabet import ENGLISH
+from hangman_loader import (DEFAULT_CATEGORY, DEFAULT_DIFFICULTY, WordStore, _detect_format, add_default_args,
+                            iter_chunks, normalize_chunk, read_entries)
+from hangman_words import WordIndex, base_keys, build_base_pools, pair_flags, pool_keys, resolve_pools
+
+POLL_INTERVAL = 2.0     # seconds between stat polls
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class SourceWatcher:
+    def __init__(self, paths, alphabet=ENGLISH, progress=None, difficulty=DEFAULT_DIFFICULTY,
+                 category=DEFAULT_CATEGORY):
+        """Load the sources; `progress(store, bytes read, total bytes)` is called after each chunk.
+
+        Entries without a difficulty / category get `difficulty` / `category`.
+        """
+        self.paths = list(paths)
+        self.alphabet = alphabet
+        self.defaults = (difficulty, category)
+        self.store = WordStore(alphabet)
+        # path -> {word id: (difficulty flags, category flags)} that file gives the word
+        self.contributions = {}
+        self.stamps = {path: _stamp(path) for path in self.paths}
+        self.reloads = 0
+        self.last_error = None
+        total = sum(stamp[1] for stamp in self.stamps.values() if stamp)
+        done = 0
+        add = self.store.add
+        for path in self.paths:
+            contribution = self.contributions[path] = {}
+            if self.stamps[path] is None:
+                continue
+            try:
+                for kept, pos in self._chunks(path):
+                    for word, dbit, cbit in kept:
+                        i = add(word, dbit, cbit)
+                        df, cf = contribution.get(i, (0, 0))
+                        contribution[i] = (df | dbit, cf | pair_flags(dbit, cbit))
+                    if progress is not None:
+                        progress(self.store, done + pos, total)
+            except (OSError, ValueError, csv.Error) as e:
+                raise ValueError(f"{path}: {e}")
+            done += self.stamps[path][1]
+        self.base = build_base_pools(self.store.difficulty_flags, self.store.category_flags)
+        self.index = WordIndex(self.store, self.store.difficulty_flags, self.store.category_flags,
+                               pools=resolve_pools(self.base), alphabet=alphabet)
+
+    def read(self, path):
+        """Normalised (word, difficulty bit, category bit) entries of a source, or None if unreadable.
+
+        A missing file reads as empty, so deleting a source removes its words.
+        """
+        if not os.path.exists(path):
+            return []
+        out = []
+        try:
+            for kept, _ in self._chunks(path):
+                out.extend(kept)
+        except (OSError, ValueError, csv.Error) as e:
+            self.last_error = f"{path}: {e}"
+            return None
+        return out
+
+    def _chunks(self, path):
+        """Kept entries of a source a chunk at a time, with how many bytes were read so far."""
+        with io.open(path, encoding="utf-8", newline="") as f:
+            for chunk in iter_chunks(read_entries(f, _detect_format(path), *self.defaults)):
+                yield [entry for entry in normalize_chunk(chunk, self.alphabet) if entry[1]], f.buffer.tell()
+
+    def _contribution(self, entries):
+        add = self.store.add
+        out = {}
+        for word, dbit, cbit in entries:
+            i = add(word)   # flags are set from all sources together
+            df, cf = out.get(i, (0, 0))
+            out[i] = (df | dbit, cf | pair_flags(dbit, cbit))
+        return out
+
+    def changed(self):
+        """Sources whose size or mtime changed since the last call."""
+        out = []
+        for path in self.paths:
+            stamp = _stamp(path)
+            if stamp != self.stamps.get(path):
+                self.stamps[path] = stamp
+                out.append(path)
+        return out
+
+    def apply(self, path, entries):
+        """Apply the new entries of one source; returns the new index, or None if no pool changed."""
+        if entries is None:
+            return None
+        old = self.contributions.get(path, {})
+        new = self._contribution(entries)
+        changed = [i for i in old.keys() | new.keys() if old.get(i) != new.get(i)]
+        others = [c for p, c in self.contributions.items() if p != path]
+        dflags = self.store.difficulty_flags
+        cflags = self.store.category_flags
+
+        flags = []
+        added = {}
+        removed = {}
+        for i in changed:
+            df, cf = new.get(i, (0, 0))
+            for contribution in others:
+                f = contribution.get(i)
+                if f:
+                    df |= f[0]
+                    cf |= f[1]
+            flags.append((i, df, cf))
+            before = set(base_keys(dflags[i], cflags[i]))
+            after = set(base_keys(df, cf))
+            for key in before - after:
+                removed.setdefault(key, set()).add(i)
+            for key in after - before:
+                added.setdefault(key, []).append(i)
+
+        base = dict(self.base)
+        for key in added.keys() | removed.keys():
+            # copy: the live index still draws from the old array
+            ids = array("I", base[key])
+            gone = removed.get(key)
+            if gone:
+                if len(gone) > 64:
+                    ids = array("I", [i for i in ids if i not in gone])
+                else:
+                    for i in gone:
+                        # swap-remove, pool order doesn't matter
+                        p = ids.index(i)
+                        ids[p] = ids[-1]
+                        ids.pop()
+            ids.extend(added.get(key, ()))
+            base[key] = ids
+        try:
+            pools = resolve_pools(base)
+        except ValueError as e:
+            # e.g. the edit emptied the default pool: keep serving the old index
+            self.last_error = f"{path}: {e}"
+            return None
+
+        self.contributions[path] = new
+        for i, df, cf in flags:
+            dflags[i] = df
+            cflags[i] = cf
+        if not added and not removed:
+            return None
+        self.base = base
+        self.index = WordIndex(self.store, dflags, cflags, pools=pools, alphabet=self.alphabet)
+        self.reloads += 1
+        return self.index
+
+    def poll(self):
+        """Re-read changed sources; returns the new index, or None if nothing changed."""
+        index = None
+        for path in self.changed():
+            index = self.apply(path, self.read(path)) or index
+        return index
+
+
+def pool_sizes(index):
+    return {key: len(index.pool(*key)) for key in pool_keys()}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Watch word sources and report pool changes.")
+    parser.add_argument("sources", nargs="+", help="txt / csv / jsonl files")
+    parser.add_argument("--alphabet", default="en", help="letters the words are played with (en, es, de, el, ru)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    add_default_args(parser)
+    args = parser.parse_args(argv)
+
+    from hangman_alphabet import get_alphabet
+    watcher = SourceWatcher(args.sources, get_alphabet(args.alphabet), difficulty=args.difficulty,
+                            category=args.category)
+    sizes = pool_sizes(watcher.index)
+    print(f"{len(watcher.store)} words from {len(args.sources)} file(s); watching")
+    try:
+        while True:
+            time.sleep(args.interval)
+            start = time.perf_counter()
+            index = watcher.poll()
+            if watcher.last_error:
+                print(f"error: {watcher.last_error}")
+                watcher.last_error = None
+            if index is None:
+                continue
+            ms = (time.perf_counter() - start) * 1000
+            new_sizes = pool_sizes(index)
+            diff = ", ".join(f"{d}/{c} {sizes[(d, c)]}->{n}" for (d, c), n in new_sizes.items()
+                             if sizes[(d, c)] != n)
+            print(f"reload {watcher.reloads} in {ms:.1f} ms: {diff}")
+            sizes = new_sizes
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Compact binary replay log and headless replayer.
+
+Every game is logged as a GAME event (start time, RNG seed, difficulty,
+category, alphabet, max attempts and the chosen word) followed by its moves.
+A move is one byte - event type in the top 3 bits, the letter's index in the
+game's alphabet in the low 5 - plus a varint with the milliseconds since the
+previous event, so a letter guess or a hint usually takes 2-3 bytes (the
+last two Russian letters don't fit and are stored as text). Hints store the
+letter that was revealed, so a replay reproduces random hints exactly. The
+file is append-only.
+
+The replayer runs the logged moves through HangmanEngine with the same
+dispatch as GameScreen.submit_guess and compares the outcome with the one
+that was recorded, which is what you want when bisecting a rule change.
+
+    python hangman_gui.py --replay-log games.hmr
+    python hangman_replay.py dump games.hmr
+    python hangman_replay.py replay games.hmr
+    python hangman_replay.py record bench.hmr -n 100000 --guesser frequency
+"""
+
+import os
+import random
+import time
+
+from hangman_alphabet import ENGLISH, alphabet_code, get_alphabet
+from hangman_engine import MAX_ATTEMPTS, OVER, HangmanEngine
+from hangman_session import CATEGORY_CODES, CATEGORY_NAMES, DIFFICULTY_CODES
+from hangman_words import DIFFICULTIES
+
+MAGIC = b"HMRL"
+VERSION = 2
+
+# event types (top 3 bits of the event byte)
+GAME = 0      # payload: start time, seed, difficulty/category, alphabet/max attempts, word
+LETTER = 1    # low bits: letter
+WORD = 2      # payload: guess text (full-word guesses and anything else typed)
+HINT = 3      # low bits: revealed letter, or TEXT_LETTER and the letter as text
+PAUSE = 4
+RESUME = 5
+END = 6       # low bits: outcome
+
+EVENT_NAMES = {GAME: "game", LETTER: "letter", WORD: "word", HINT: "hint",
+               PAUSE: "pause", RESUME: "resume", END: "end"}
+
+TEXT_LETTER = 0x1F
+
+# outcomes
+LOST = 0
+WON = 1
+ABANDONED = 2   # not stored; a game without an END event
+OUTCOME_NAMES = {LOST: "lost", WON: "won", ABANDONED: "abandoned"}
+
+
+def _varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def letter_table(alphabet):
+    """Letters by event code (TEXT_LETTER and above are never codes)."""
+    return alphabet.letters[:TEXT_LETTER]
+
+
+def letter_code(letters, letter):
+    """Event code of `letter` in a letter_table, or TEXT_LETTER if it has to be stored as text."""
+    i = letters.find(letter) if len(letter) == 1 else -1
+    return TEXT_LETTER if i < 0 else i
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+# Writing
+
+class ReplayWriter:
+    """Appends games to a replay log; events are flushed when a game ends."""
+
+    def __init__(self, path, clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC + bytes([VERSION]))
+        self.letters = letter_table(ENGLISH)
+        self._buf = bytearray()
+        self._last = None
+        self.in_game = False
+
+    def _event(self, kind, arg=0):
+        now = self.clock()
+        delta = 0 if self._last is None else max(0, int((now - self._last) * 1000))
+        self._last = now
+        self._buf.append(kind << 5 | arg)
+        _varint(self._buf, delta)
+
+    def _text(self, text):
+        data = text.encode("utf-8")
+        _varint(self._buf, len(data))
+        self._buf += data
+
+    def start_game(self, seed, difficulty, category, word, max_attempts=MAX_ATTEMPTS, alphabet=ENGLISH):
+        self._last = None
+        self._event(GAME)
+        _varint(self._buf, int(time.time()))
+        _varint(self._buf, seed)
+        self._buf.append(DIFFICULTY_CODES[difficulty] << 2 | CATEGORY_CODES[category])
+        self._buf.append(alphabet_code(alphabet) << 4 | max_attempts)
+        self._text(word)
+        self.letters = letter_table(alphabet)
+        self.in_game = True
+
+    def skip_game(self):
+        """Don't log the moves of the game that starts now."""
+        self.in_game = False
+
+    def guess(self, text):
+        """Log what submit_guess passes to the engine (already stripped / lowered)."""
+        if not self.in_game:
+            return
+        code = letter_code(self.letters, text)
+        if code != TEXT_LETTER:
+            self._event(LETTER, code)
+        else:
+            self._event(WORD)
+            self._text(text)
+
+    def hint(self, letter):
+        if not self.in_game:
+            return
+        code = letter_code(self.letters, letter)
+        if code != TEXT_LETTER:
+            self._event(HINT, code)
+        else:
+            self._event(HINT, TEXT_LETTER)
+            self._text(letter)
+
+    def pause(self):
+        if self.in_game:
+            self._event(PAUSE)
+
+    def resume(self):
+        if self.in_game:
+            self._event(RESUME)
+
+    def end_game(self, won):
+        if self.in_game:
+            self._event(END, WON if won else LOST)
+            self.in_game = False
+        self.flush()
+
+    def flush(self):
+        if self._buf:
+            self.file.write(self._buf)
+            self._buf.clear()
+            self.file.flush()
+
+    def close(self):
+        # an unfinished game is kept without its END event (abandoned)
+        self.flush()
+        self.file.close()
+
+
+# Reading
+
+class LoggedGame:
+    __slots__ = ("started_at", "seed", "difficulty", "category", "alphabet", "max_attempts", "word",
+                 "events", "outcome")
+
+    def __init__(self, started_at, seed, difficulty, category, alphabet, max_attempts, word):
+        self.started_at = started_at
+        self.seed = seed
+        self.difficulty = difficulty
+        self.category = category
+        self.alphabet = alphabet
+        self.max_attempts = max_attempts
+        self.word = word
+        self.events = []            # (type, ms since previous event, letter or text)
+        self.outcome = ABANDONED
+
+    @property
+    def duration_ms(self):
+        return sum(ms for _, ms, _ in self.events)
+
+
+def _read_text(data, pos):
+    n, pos = _read_varint(data, pos)
+    if pos + n > len(data):
+        raise IndexError("truncated text")
+    return data[pos:pos + n].decode("utf-8"), pos + n
+
+
+def decode_game(data, pos):
+    """Decode the game whose GAME event starts at data[pos].
+
+    Returns (LoggedGame, position after it, ended): the game runs to its END
+    event, to the next GAME event or to the end of `data`, and `ended` is
+    False only in the last case (more of it may still be written). Raises
+    IndexError if `data` stops inside an event.
+    """
+    _, pos = _read_varint(data, pos + 1)
+    started, pos = _read_varint(data, pos)
+    seed, pos = _read_varint(data, pos)
+    dc = data[pos]
+    am = data[pos + 1]
+    word, pos = _read_text(data, pos + 2)
+    game = LoggedGame(started, seed, DIFFICULTIES[dc >> 2], CATEGORY_NAMES[dc & 3],
+                      get_alphabet(am >> 4), am & 0xF, word)
+    letters = letter_table(game.alphabet)
+    events = game.events
+    end = len(data)
+    while pos < end:
+        b = data[pos]
+        kind, arg = b >> 5, b & 0x1F
+        if kind == GAME:
+            return game, pos, True      # abandoned: the next game starts here
+        ms, pos = _read_varint(data, pos + 1)
+        if kind == WORD or (kind == HINT and arg == TEXT_LETTER):
+            value, pos = _read_text(data, pos)
+        elif kind in (LETTER, HINT):
+            value = letters[arg]
+        elif kind == END:
+            value = game.outcome = arg
+        else:
+            value = None
+        events.append((kind, ms, value))
+        if kind == END:
+            return game, pos, True
+    return game, pos, False
+
+
+def read_log(path):
+    """Yield the LoggedGame of every game in the log."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path}: not a replay log")
+    if data[4] != VERSION:
+        raise ValueError(f"{path}: unsupported replay log version {data[4]}")
+    pos = 5
+    end = len(data)
+    while pos < end:
+        if data[pos] >> 5 != GAME:
+            raise ValueError(f"{path}: expected a game at byte {pos}")
+        game, pos, _ = decode_game(data, pos)
+        yield game
+
+
+# Replaying
+
+def replay_game(logged, game=None):
+    """Re-run one logged game; returns (engine, outcome, moves).
+
+    Raises ValueError if a logged hint can't reveal the same letter again
+    (the rules changed, or the log is damaged).
+    """
+    if game is None:
+        game = HangmanEngine()
+    game.alphabet = logged.alphabet
+    game.max_attempts = logged.max_attempts
+    game.new_game(logged.word)
+    rng = random.Random(logged.seed)    # never used for a hint that still fits
+    moves = 0
+    for kind, _, value in logged.events:
+        if kind == LETTER:
+            game.guess_letter(value)
+        elif kind == WORD:
+            # same dispatch as GameScreen.submit_guess
+            game.guess_word(value) if len(value) > 1 else game.guess_letter(value)
+        elif kind == HINT:
+            if game.reveal(rng, letter=value) != value:
+                raise ValueError(f"hint '{value}' can't be revealed at move {moves + 1}")
+        else:
+            continue
+        moves += 1
+    if game.won:
+        outcome = WON
+    elif game.lost:
+        outcome = LOST
+    else:
+        outcome = ABANDONED
+    return game, outcome, moves
+
+
+def replay(path, index=None):
+    """Replay every game in a log.
+
+    With a word index, also checks that each logged word is still in its
+    (difficulty, category) pool. Returns a summary dict with the games whose
+    outcome differs from the recorded one.
+    """
+    game = HangmanEngine()
+    pools = {}
+    games = moves = 0
+    outcomes = {name: 0 for name in OUTCOME_NAMES.values()}
+    mismatches = []
+    start = time.perf_counter()
+    for i, logged in enumerate(read_log(path)):
+        games += 1
+        try:
+            _, outcome, n = replay_game(logged, game)
+        except ValueError as e:
+            mismatches.append((i, logged.word, str(e)))
+            continue
+        moves += n
+        outcomes[OUTCOME_NAMES[outcome]] += 1
+        problem = None
+        if outcome != logged.outcome:
+            problem = f"recorded {OUTCOME_NAMES[logged.outcome]}, replayed {OUTCOME_NAMES[outcome]}"
+        elif index is not None:
+            key = (logged.difficulty, logged.category)
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = set(index.pool_words(*key))
+            if logged.word not in pool:
+                problem = f"no longer in the {logged.difficulty}/{logged.category} pool"
+        if problem:
+            mismatches.append((i, logged.word, problem))
+    elapsed = time.perf_counter() - start
+    return {
+        "games": games,
+        "moves": moves,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "outcomes": outcomes,
+        "mismatches": mismatches,
+    }
+
+
+def record_selfplay(path, n, guesser="frequency", seed=0, index=None):
+    """Write n self-played games to a log (benchmark input for the replayer)."""
+    from hangman_selfplay import load_guesser
+    from hangman_solver import game_pattern
+    from hangman_words import WORD_INDEX, pool_keys
+    index = index if index is not None else WORD_INDEX
+    guesser_cls = load_guesser(guesser)
+    keys = list(pool_keys())
+    game = HangmanEngine(alphabet=index.alphabet)
+    tick = [0.0]
+    writer = ReplayWriter(path, clock=lambda: tick[0])
+    try:
+        for i in range(n):
+            d, c = keys[i % len(keys)]
+            game_seed = random.Random(f"{seed}:{i}").getrandbits(32)
+            rng = random.Random(game_seed)
+            word = index.choose(d, c, rng)
+            game.new_game(word)
+            writer.start_game(game_seed, d, c, word, game.max_attempts, index.alphabet)
+            player = guesser_cls(index, d, c, rng)
+            moves = 0
+            while not game.over and moves < 64:
+                guess = player.guess(*game_pattern(game))
+                tick[0] += 1.5
+                writer.guess(guess)
+                moves += 1
+                if (game.guess_word(guess) if len(guess) > 1 else game.guess_letter(guess)) == OVER:
+                    break
+            writer.end_game(game.won)
+    finally:
+        writer.close()
+
+
+def dump(path):
+    for i, g in enumerate(read_log(path)):
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(g.started_at))
+        print(f"game {i}: {started} seed {g.seed} {g.difficulty}/{g.category} ({g.alphabet.name}) "
+              f"'{g.word}' max {g.max_attempts} -> {OUTCOME_NAMES[g.outcome]}")
+        for kind, ms, value in g.events:
+            name = EVENT_NAMES[kind]
+            if kind == END:
+                value = OUTCOME_NAMES[value]
+            print(f"  +{ms:>6} ms  {name:<6} {value if value is not None else ''}")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect, replay and generate Hangman replay logs.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_dump = sub.add_parser("dump", help="print every event")
+    p_dump.add_argument("log")
+    p_replay = sub.add_parser("replay", help="re-run all games and report outcome mismatches")
+    p_replay.add_argument("log")
+    p_replay.add_argument("--pack", help="also check the words against the pools of this word pack")
+    p_replay.add_argument("--check-words", action="store_true",
+                          help="also check the words against the built-in pools")
+    p_record = sub.add_parser("record", help="log self-played games (replay benchmark input)")
+    p_record.add_argument("log")
+    p_record.add_argument("-n", "--games", type=int, default=10000)
+    p_record.add_argument("--guesser", default="frequency")
+    p_record.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "dump":
+        dump(args.log)
+    elif args.cmd == "record":
+        if os.path.exists(args.log):
+            parser.error(f"{args.log} exists")
+        record_selfplay(args.log, args.games, args.guesser, args.seed)
+        print(f"wrote {args.games} games to {args.log} ({os.path.getsize(args.log):,} bytes)")
+    else:
+        index = None
+        if args.pack:
+            from hangman_pack import open_index
+            index = open_index(args.pack)
+        elif args.check_words:
+            from hangman_words import WORD_INDEX
+            index = WORD_INDEX
+        r = replay(args.log, index)
+        print(f"{r['games']} games, {r['moves']} moves in {r['seconds']:.2f}s "
+              f"({r['games_per_second']:,.0f} games/s); "
+              + ", ".join(f"{k} {v}" for k, v in r["outcomes"].items()))
+        for i, word, problem in r["mismatches"][:50]:
+            print(f"  game {i} '{word}': {problem}")
+        if r["mismatches"]:
+            print(f"{len(r['mismatches'])} mismatches")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Shuffle-bag word scheduling.
+
+Every (difficulty, category) pool gets a bag that walks a seeded permutation
+of the pool: no word comes up twice until the whole pool has been drawn. For
+pools of up to SMALL_BAG words the permutation is a list, Fisher-Yates
+shuffled by an LCG seeded from the key, so a draw is a list lookup. Larger
+pools use a small Feistel network over the pool indices (with cycle
+walking), so nothing is materialised and a draw is O(1) even for huge pools. Either way a bag's whole
+state is three ints (pool size, permutation key, position), which is cheap
+to persist between launches or to hand to a server client.
+
+When a bag is exhausted the next permutation is picked so that none of its
+first `window` words were among the last `window` drawn, so there are no
+back-to-back repeats across reshuffles either.
+
+    python hangman_scheduler.py --difficulty Easy --category Fruits -n 25
+"""
+
+import json
+import random
+from math import isqrt
+
+from hangman_words import CATEGORIES, DIFFICULTIES, MIXED
+
+DEFAULT_WINDOW = 32
+ROUNDS = 4
+MAX_RESHUFFLE = 64
+SMALL_BAG = 4096        # pools up to this size get a materialised permutation
+
+_M64 = (1 << 64) - 1
+
+
+def _mix(x):
+    # splitmix64 finaliser
+    x &= _M64
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _M64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _M64
+    return x ^ (x >> 31)
+
+
+def permute(i, n, key):
+    """Element at position i of the `key` permutation of range(n)."""
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for r in range(ROUNDS):
+            left, right = right, left ^ (_mix(key + r ^ right << 8) & mask)
+        x = left << half | right
+        if x < n:   # cycle walking: the domain is at most 4n, so this is quick
+            return x
+
+
+def _shuffle(order, x, start, stop):
+    # Fisher-Yates steps start..stop-1 (the first w steps fix the first w draws);
+    # x is the LCG state, returned so the rest of the shuffle can carry on later
+    n = len(order)
+    for i in range(start, stop):
+        x = (x * 6364136223846793005 + 1442695040888963407) & _M64
+        j = i + (x >> 32) % (n - i)
+        order[i], order[j] = order[j], order[i]
+    return x
+
+
+def shuffled(n, key):
+    """The `key` permutation of range(n) for small bags, as a list."""
+    order = list(range(n))
+    _shuffle(order, _mix(key), 0, n)
+    return order
+
+
+class ShuffleBag:
+    __slots__ = ("n", "key", "position", "window", "_order")
+
+    def __init__(self, n, key, position=0, window=DEFAULT_WINDOW):
+        self.n = n
+        self.key = key
+        self.position = position
+        self.window = window
+        self._order = None      # shuffled(n, key) once a small bag is drawn from
+
+    def reset(self, n, key):
+        """Start a new cycle over `n` words with permutation `key`."""
+        self.n = n
+        self.key = key
+        self.position = 0
+        self._order = None
+
+    @classmethod
+    def fresh(cls, n, rng=random, window=DEFAULT_WINDOW):
+        return cls(n, rng.getrandbits(64), 0, window)
+
+    @property
+    def cursor(self):
+        return [self.n, self.key, self.position]
+
+    @property
+    def left(self):
+        """Draws left before the bag is reshuffled."""
+        return self.n - self.position
+
+    def next(self):
+        if self.position >= self.n:
+            self._reshuffle()
+        order = self._order
+        if order is None:
+            if self.n > SMALL_BAG:
+                i = permute(self.position, self.n, self.key)
+                self.position += 1
+                return i
+            order = self._order = shuffled(self.n, self.key)
+        i = order[self.position]
+        self.position += 1
+        return i
+
+    def _reshuffle(self):
+        n = self.n
+        key = self.key
+        w = min(self.window, isqrt(n))
+        if n > SMALL_BAG:
+            recent = {permute(p, n, key) for p in range(n - w, n)}
+            for _ in range(MAX_RESHUFFLE):
+                key = _mix(key + 1)
+                if not any(permute(p, n, key) in recent for p in range(w)):
+                    break
+            self.reset(n, key)
+            return
+        order = self._order or shuffled(n, key)
+        recent = set(order[n - w:]) if n > 1 else set()
+        for _ in range(MAX_RESHUFFLE):
+            key = _mix(key + 1)
+            order = list(range(n))
+            x = _shuffle(order, _mix(key), 0, w)
+            if recent.isdisjoint(order[:w]):
+                break
+        _shuffle(order, x, w, n)
+        self.reset(n, key)
+        self._order = order
+
+
+class WordScheduler:
+    """choose / choose_id for a WordIndex, drawing from one shuffle bag per pool."""
+
+    def __init__(self, index, rng=None, window=DEFAULT_WINDOW, state=None):
+        self.index = index
+        self.rng = rng or random.Random()
+        self.window = window
+        self.bags = {}
+        # (difficulty, category) -> the pool its bag was last drawn from
+        self._pools = {}
+        if state:
+            self.load_state(state)
+
+    def bag(self, difficulty, category):
+        return self._bag((difficulty, category), self.index.pool(difficulty, category))
+
+    def _bag(self, key, pool):
+        bag = self.bags.get(key)
+        seen = self._pools.get(key)
+        if seen is not pool:
+            # a new index (e.g. a reload): start over if the pool's words changed, even
+            # when a word was added and another removed, or if a saved cursor doesn't fit
+            if bag is None or bag.n != len(pool) or (seen is not None and seen != pool):
+                bag = self.bags[key] = ShuffleBag.fresh(len(pool), self.rng, self.window)
+            self._pools[key] = pool
+        return bag
+
+    def choose_id(self, difficulty, category):
+        pool = self.index.pool(difficulty, category)
+        return pool[self._bag((difficulty, category), pool).next()]
+
+    def choose(self, difficulty, category):
+        return self.index.words[self.choose_id(difficulty, category)]
+
+    # persistence
+
+    def state(self):
+        return {f"{d}/{c}": bag.cursor for (d, c), bag in self.bags.items()}
+
+    def load_state(self, state):
+        for name, (n, key, position) in state.items():
+            d, _, c = name.partition("/")
+            if d in DIFFICULTIES and c in CATEGORIES + (MIXED,):
+                self.bags[(d, c)] = ShuffleBag(int(n), int(key), int(position), self.window)
+                self._pools.pop((d, c), None)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "bags": self.state()}, f)
+
+    @classmethod
+    def load(cls, path, index, **kwargs):
+        """Scheduler with the cursors saved in `path` (fresh bags if it is missing or bad)."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)["bags"]
+            return cls(index, state=state, **kwargs)
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(index, **kwargs)
+
+
+def main(argv=None):
+    import argparse
+    from hangman_words import WORD_INDEX
+    parser = argparse.ArgumentParser(description="Draw words through the shuffle-bag scheduler.")
+    parser.add_argument("--difficulty", default="Easy")
+    parser.add_argument("--category", default=MIXED)
+    parser.add_argument("-n", "--draws", type=int, default=20)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed) if args.seed is not None else None
+    scheduler = WordScheduler(WORD_INDEX, rng, args.window)
+    for _ in range(args.draws):
+        print(scheduler.choose(args.difficulty, args.category))
+    print(json.dumps(scheduler.state()))
+
+
+if __name__ == "__main__":
+    main()
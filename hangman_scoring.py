@@ -0,0 +1,276 @@
+"""Data-driven difficulty tiers.
+
+Every word is played by a reference guesser (see hangman_selfplay.py) that
+knows the whole dictionary, and scored by its solve rate and average wrong
+guesses. Scores are cached per word in SQLite, so re-scoring after a
+dictionary update only plays the new words. Words are then split into the
+Easy / Medium / Hard / Extreme buckets by score quantiles and written out as
+a CSV (or straight into a word pack) that choose_word draws from.
+
+    python hangman_scoring.py my_words.csv --out scored.csv --workers 8
+    python hangman_scoring.py --pack scored.pack          # built-in lists
+"""
+
+import csv
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from multiprocessing import Pool
+
+from hangman_alphabet import ENGLISH, get_alphabet
+from hangman_engine import MAX_ATTEMPTS, HangmanEngine
+from hangman_loader import add_default_args, load_files
+from hangman_pack import compile_pack, open_index
+from hangman_selfplay import load_guesser, play_game
+from hangman_words import CATEGORY_FLAGS, DIFFICULTIES, DIFFICULTY_FLAGS, WORD_INDEX, any_categories, pair_flags
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".hangman_scores.db")
+CHUNK = 500
+SAMPLE = 100_000    # scores sampled to find the bucket quantiles
+
+_NAN = float("nan")
+
+
+def hardness(solve_rate, avg_wrong, avg_moves, max_attempts=MAX_ATTEMPTS):
+    """Single difficulty score.
+
+    Every lost game counts as a full set of wrong guesses; the number of
+    moves (at most 26 letters + word guesses) only breaks ties.
+    """
+    return (1.0 - solve_rate) * max_attempts + avg_wrong + avg_moves / 32
+
+
+# Score cache
+
+class ScoreCache:
+    def __init__(self, path=DEFAULT_CACHE):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores (word TEXT NOT NULL, guesser TEXT NOT NULL, "
+            "trials INTEGER NOT NULL, seed INTEGER NOT NULL, solve_rate REAL NOT NULL, "
+            "avg_wrong REAL NOT NULL, avg_moves REAL NOT NULL, "
+            "PRIMARY KEY (word, guesser, trials, seed)) WITHOUT ROWID")
+
+    def lookup(self, words, guesser, trials, seed=0):
+        """{word: (solve_rate, avg_wrong, avg_moves)} for the cached ones among `words`."""
+        marks = ",".join("?" * len(words))
+        rows = self.conn.execute(
+            f"SELECT word, solve_rate, avg_wrong, avg_moves FROM scores "
+            f"WHERE guesser = ? AND trials = ? AND seed = ? AND word IN ({marks})",
+            [guesser, trials, seed] + list(words))
+        return {w: tuple(score) for w, *score in rows}
+
+    def store(self, rows, guesser, trials, seed=0):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(w, guesser, trials, seed) + tuple(score) for w, *score in rows])
+
+    def close(self):
+        self.conn.close()
+
+
+# Workers
+
+_state = {}
+
+
+def _init_worker(pack, guesser, trials, seed):
+    _state["index"] = open_index(pack) if pack else WORD_INDEX
+    _state["guesser"] = load_guesser(guesser)
+    _state["trials"] = trials
+    _state["seed"] = seed
+
+
+def score_word(word, index, guesser_cls, trials=1, seed=0):
+    game = HangmanEngine(max_attempts=MAX_ATTEMPTS, alphabet=index.alphabet)
+    solved = wrong = moves = 0
+    for t in range(trials):
+        rng = random.Random(f"{seed}:{word}:{t}")
+        game.new_game(word)
+        moves += play_game(game, guesser_cls(index, None, None, rng))
+        solved += game.won
+        wrong += game.wrong_attempts
+    return solved / trials, wrong / trials, moves / trials
+
+
+def _score_ids(ids):
+    index = _state["index"]
+    words = index.words
+    out = []
+    for i in ids:
+        out.append((i,) + score_word(words[i], index, _state["guesser"], _state["trials"], _state["seed"]))
+    return out
+
+
+# Pipeline
+
+def score_all(words, pack=None, guesser="solver", trials=1, seed=0, workers=1,
+              cache=None, progress=None):
+    """Solve rate, average wrong guesses and average moves of every word.
+
+    Returns three float arrays and the number of words actually played.
+    """
+    n = len(words)
+    solve = array("d", [_NAN]) * n
+    wrong = array("d", [_NAN]) * n
+    moves = array("d", [_NAN]) * n
+    todo = []
+    for start in range(0, n, CHUNK):
+        ids = range(start, min(start + CHUNK, n))
+        cached = cache.lookup([words[i] for i in ids], guesser, trials, seed) if cache else {}
+        for i in ids:
+            hit = cached.get(words[i])
+            if hit is None:
+                todo.append(i)
+            else:
+                solve[i], wrong[i], moves[i] = hit
+    tasks = [todo[k:k + CHUNK] for k in range(0, len(todo), CHUNK)]
+    if workers <= 1:
+        _init_worker(pack, guesser, trials, seed)
+        results = map(_score_ids, tasks)
+        pool = None
+    else:
+        pool = Pool(workers, _init_worker, (pack, guesser, trials, seed))
+        results = pool.imap_unordered(_score_ids, tasks)
+    done = 0
+    for chunk in results:
+        for i, s, wr, mv in chunk:
+            solve[i] = s
+            wrong[i] = wr
+            moves[i] = mv
+        if cache:
+            cache.store([(words[i], s, wr, mv) for i, s, wr, mv in chunk], guesser, trials, seed)
+        done += len(chunk)
+        if progress:
+            progress(done, len(todo))
+    if pool is not None:
+        pool.close()
+        pool.join()
+    return solve, wrong, moves, len(todo)
+
+
+def bucket_thresholds(scores, words, fractions=(0.25, 0.5, 0.75), seed=0):
+    """(score, word) cut-offs between the difficulty tiers (quantiles of a sample).
+
+    Words are ranked by score and then by the word itself, so tied scores
+    (common with few trials) are split by rank and, given at least one word
+    per tier, no tier is left empty.
+    """
+    keys = [(scores[i], words[i]) for i in range(len(scores))]
+    if len(keys) > SAMPLE:
+        keys = random.Random(seed).sample(keys, SAMPLE)
+    keys.sort()
+    return [keys[max(0, int(f * len(keys)) - 1)] for f in fractions]
+
+
+def difficulty_flags(scores, thresholds, words):
+    flags = array("B", bytes(len(scores)))
+    bits = [DIFFICULTY_FLAGS[d] for d in DIFFICULTIES]
+    for i, h in enumerate(scores):
+        flags[i] = bits[bisect_left(thresholds, (h, words[i]))]
+    return flags
+
+
+class ScoredWords:
+    """Word table with re-bucketed difficulty flags (accepted by compile_pack / WordIndex)."""
+
+    def __init__(self, words, difficulty_flags, category_flags, alphabet=ENGLISH):
+        self.words = words
+        self.difficulty_flags = difficulty_flags
+        self.category_flags = category_flags
+        self.alphabet = alphabet
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+
+def write_csv(path, scored, solve, wrong, scores):
+    names = {bit: d for d, bit in DIFFICULTY_FLAGS.items()}
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        out = csv.writer(f)
+        out.writerow(["word", "difficulty", "category", "solve_rate", "avg_wrong", "hardness"])
+        for i in range(len(scored)):
+            categories = any_categories(scored.category_flags[i])
+            for c, cbit in CATEGORY_FLAGS.items():
+                if categories & cbit:
+                    out.writerow([scored[i], names[scored.difficulty_flags[i]], c,
+                                  f"{solve[i]:.4f}", f"{wrong[i]:.4f}", f"{scores[i]:.4f}"])
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Score words by simulated play and re-bucket difficulty.")
+    parser.add_argument("sources", nargs="*", help="txt / csv / jsonl word sources (default: built-in lists)")
+    parser.add_argument("--alphabet", default="en", help="alphabet of the sources (en, es, de, el, ru)")
+    parser.add_argument("--out", help="write word,difficulty,category CSV here")
+    parser.add_argument("--pack", help="compile the re-bucketed words into this word pack")
+    parser.add_argument("--guesser", default="solver",
+                        help="reference guesser (see hangman_selfplay.py); frequency is much faster")
+    parser.add_argument("--trials", type=int, default=1, help="games per word (for randomised guessers)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="score cache database")
+    parser.add_argument("--no-cache", action="store_true")
+    add_default_args(parser)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tmp = None
+    if args.sources:
+        store, report = load_files(args.sources, alphabet=get_alphabet(args.alphabet),
+                                   difficulty=args.difficulty, category=args.category)
+        print(report)
+        # workers map the words from a pack instead of each re-loading the sources
+        fd, tmp = tempfile.mkstemp(suffix=".pack")
+        os.close(fd)
+        compile_pack(tmp, store)
+        words, cflags, pack = store, store.category_flags, tmp
+    else:
+        words, cflags, pack = WORD_INDEX.words, WORD_INDEX.category_flags, None
+
+    cache = None if args.no_cache else ScoreCache(args.cache)
+    try:
+        solve, wrong, moves, played = score_all(
+            words, pack, args.guesser, args.trials, args.seed, args.workers, cache,
+            progress=lambda done, total: print(f"\rscored {done}/{total}", end="", flush=True))
+    finally:
+        if cache:
+            cache.close()
+        if tmp:
+            os.remove(tmp)
+    if played:
+        print()
+    scores = array("d", (hardness(s, w, m) for s, w, m in zip(solve, wrong, moves)))
+    thresholds = bucket_thresholds(scores, words, seed=args.seed)
+    dflags = difficulty_flags(scores, thresholds, words)
+    # every word keeps its categories, now under its one new difficulty
+    cflags = array("B", (pair_flags(df, any_categories(cf)) for df, cf in zip(dflags, cflags)))
+    scored = ScoredWords(words, dflags, cflags, getattr(words, "alphabet", ENGLISH))
+
+    counts = {d: 0 for d in DIFFICULTIES}
+    names = {bit: d for d, bit in DIFFICULTY_FLAGS.items()}
+    for f in scored.difficulty_flags:
+        counts[names[f]] += 1
+    print(f"{len(words)} words, {played} played, {len(words) - played} from cache "
+          f"in {time.perf_counter() - start:.1f}s; thresholds {', '.join(f'{t:.2f}' for t, _ in thresholds)}")
+    print("  " + ", ".join(f"{d} {n}" for d, n in counts.items()))
+
+    if args.out:
+        write_csv(args.out, scored, solve, wrong, scores)
+        print(f"wrote {args.out}")
+    if args.pack:
+        compile_pack(args.pack, scored)
+        print(f"wrote {args.pack}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Headless self-play benchmark.
+
+Plays N games with a pluggable guesser using the same rules as the GUI
+(HangmanEngine: letter guesses, full-word guesses, 6 wrong attempts), spread
+over a process pool. Game i always draws its word with its own seeded RNG, so
+results are reproducible whatever the number of workers.
+
+    python hangman_selfplay.py -n 100000 --guesser solver --workers 4
+    python hangman_selfplay.py -n 20000 --scaling --json
+"""
+
+import importlib
+import json
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from hangman_engine import MAX_ATTEMPTS, OVER, HangmanEngine
+from hangman_solver import Solver, game_pattern
+from hangman_words import WORD_INDEX, pool_keys
+
+CHUNK = 500
+
+
+# Guessers: Guesser(index, difficulty, category, rng).guess(pattern, wrong)
+# returns a letter or a full-word guess. A difficulty of None means the
+# guesser knows the whole word table rather than one pool.
+
+def known_words(index, difficulty, category):
+    if difficulty is None:
+        return index.words
+    return index.pool_words(difficulty, category)
+
+
+class RandomGuesser:
+    def __init__(self, index, difficulty, category, rng):
+        self.rng = rng
+        self.letters = index.alphabet.letters
+
+    def guess(self, pattern, wrong):
+        left = [ch for ch in self.letters if ch not in pattern and ch not in wrong]
+        return self.rng.choice(left)
+
+
+class FrequencyGuesser:
+    """Letters in order of how often they occur in the pool."""
+    _orders = {}
+
+    def __init__(self, index, difficulty, category, rng):
+        key = (id(index), difficulty, category)
+        order = self._orders.get(key)
+        if order is None:
+            letters = index.alphabet.letters
+            fold = index.alphabet.fold
+            counts = Counter()
+            for w in known_words(index, difficulty, category):
+                counts.update(set(fold(w)))
+            order = self._orders[key] = [ch for ch, _ in counts.most_common() if ch in letters]
+            order += [ch for ch in letters if ch not in order]
+        self.order = order
+        self.rng = rng
+        self.letters = index.alphabet.letters
+
+    def guess(self, pattern, wrong):
+        for ch in self.order:
+            if ch not in pattern and ch not in wrong:
+                return ch
+        # nothing left in the order: fall back to any unguessed letter, like SolverGuesser
+        return RandomGuesser.guess(self, pattern, wrong)
+
+
+class SolverGuesser:
+    """Entropy solver; guesses the word once a single candidate is left."""
+    _solvers = {}
+
+    def __init__(self, index, difficulty, category, rng):
+        key = (id(index), difficulty, category)
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = self._solvers[key] = Solver(known_words(index, difficulty, category), index.alphabet)
+        self.solver = solver
+        self.rng = rng
+        self.letters = index.alphabet.letters
+
+    def guess(self, pattern, wrong):
+        if self.solver.count(pattern, wrong) == 1:
+            return self.solver.candidates(pattern, wrong)[0]
+        return self.solver.suggest(pattern, wrong) or RandomGuesser.guess(self, pattern, wrong)
+
+
+GUESSERS = {"random": RandomGuesser, "frequency": FrequencyGuesser, "solver": SolverGuesser}
+
+
+def load_guesser(name):
+    """A built-in guesser name or "package.module:Class"."""
+    if name in GUESSERS:
+        return GUESSERS[name]
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def play_game(game, guesser):
+    """Play one game to the end; returns the number of moves."""
+    moves = 0
+    while not game.over:
+        pattern, wrong = game_pattern(game)
+        guess = guesser.guess(pattern, wrong)
+        moves += 1
+        result = game.guess_word(guess) if len(guess) > 1 else game.guess_letter(guess)
+        if result == OVER or moves > 64:
+            break
+    return moves
+
+
+# Workers
+
+_state = {}
+
+
+def _init_worker(pack, guesser_name):
+    if pack:
+        from hangman_pack import open_index
+        _state["index"] = open_index(pack)
+    else:
+        _state["index"] = WORD_INDEX
+    _state["guesser"] = load_guesser(guesser_name)
+
+
+def game_settings(seed, i, keys):
+    """Seeded RNG and (difficulty, category) of game i."""
+    rng = random.Random(f"{seed}:{i}")
+    return rng, keys[i % len(keys)]
+
+
+def _play_range(args):
+    start, stop, seed, keys = args
+    index = _state["index"]
+    guesser_cls = _state["guesser"]
+    game = HangmanEngine(max_attempts=MAX_ATTEMPTS, alphabet=index.alphabet)
+    latencies = []
+    wins = Counter()
+    games = Counter()
+    for i in range(start, stop):
+        rng, (d, c) = game_settings(seed, i, keys)
+        t0 = time.perf_counter()
+        game.new_game(index.choose(d, c, rng))
+        play_game(game, guesser_cls(index, d, c, rng))
+        latencies.append(time.perf_counter() - t0)
+        games[(d, c)] += 1
+        if game.won:
+            wins[(d, c)] += 1
+    return latencies, wins, games
+
+
+def run(n, workers=1, guesser="frequency", seed=0, pack=None, keys=None):
+    keys = list(keys or pool_keys())
+    tasks = [(s, min(s + CHUNK, n), seed, keys) for s in range(0, n, CHUNK)]
+    latencies = []
+    wins = Counter()
+    games = Counter()
+    start = time.perf_counter()
+    if workers <= 1:
+        _init_worker(pack, guesser)
+        results = list(map(_play_range, tasks))
+    else:
+        with Pool(workers, _init_worker, (pack, guesser)) as pool:
+            results = list(pool.imap_unordered(_play_range, tasks))
+    for lat, w, g in results:
+        latencies.extend(lat)
+        wins.update(w)
+        games.update(g)
+    elapsed = time.perf_counter() - start
+    return summarize(n, workers, elapsed, latencies, wins, games)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(n, workers, elapsed, latencies, wins, games):
+    latencies.sort()
+    by_difficulty = Counter()
+    by_category = Counter()
+    won_difficulty = Counter()
+    won_category = Counter()
+    for (d, c), g in games.items():
+        by_difficulty[d] += g
+        by_category[c] += g
+        won_difficulty[d] += wins[(d, c)]
+        won_category[c] += wins[(d, c)]
+    return {
+        "games": n,
+        "workers": workers,
+        "seconds": elapsed,
+        "games_per_second": n / elapsed if elapsed else 0.0,
+        "latency_us": {name: percentile(latencies, q) * 1e6
+                       for name, q in (("p50", .5), ("p90", .9), ("p99", .99), ("max", 1.0))},
+        "win_rate": sum(wins.values()) / n if n else 0.0,
+        "win_rate_by_difficulty": {d: won_difficulty[d] / g for d, g in by_difficulty.items()},
+        "win_rate_by_category": {c: won_category[c] / g for c, g in by_category.items()},
+    }
+
+
+def scaling(n, max_workers, **kwargs):
+    """Run with 1, 2, 4 ... max_workers processes; efficiency = speedup / workers."""
+    counts = []
+    w = 1
+    while w < max_workers:
+        counts.append(w)
+        w *= 2
+    counts.append(max_workers)
+    runs = [run(n, workers=w, **kwargs) for w in counts]
+    base = runs[0]["games_per_second"]
+    for r in runs:
+        r["efficiency"] = r["games_per_second"] / (base * r["workers"]) if base else 0.0
+    return runs
+
+
+def _print_run(r):
+    lat = r["latency_us"]
+    print(f"{r['games']} games on {r['workers']} worker(s): {r['games_per_second']:,.0f} games/s, "
+          f"latency p50 {lat['p50']:.0f} us, p90 {lat['p90']:.0f} us, p99 {lat['p99']:.0f} us, "
+          f"max {lat['max']:.0f} us, win rate {r['win_rate']:.1%}"
+          + (f", efficiency {r['efficiency']:.0%}" if "efficiency" in r else ""))
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Headless Hangman self-play benchmark.")
+    parser.add_argument("-n", "--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--guesser", default="frequency",
+                        help="random, frequency, solver or package.module:Class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pack", help="word pack to draw from instead of the built-in lists")
+    parser.add_argument("--difficulty", help="only play this difficulty")
+    parser.add_argument("--category", help="only play this category")
+    parser.add_argument("--scaling", action="store_true", help="measure 1..N worker scaling")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    keys = [(d, c) for d, c in pool_keys()
+            if (not args.difficulty or d == args.difficulty) and (not args.category or c == args.category)]
+    if not keys:
+        parser.error("no (difficulty, category) pool matches")
+    kwargs = dict(guesser=args.guesser, seed=args.seed, pack=args.pack, keys=keys)
+    runs = scaling(args.games, args.workers, **kwargs) if args.scaling else [run(args.games, args.workers, **kwargs)]
+
+    if args.json:
+        print(json.dumps(runs if args.scaling else runs[0], indent=2))
+        return
+    for r in runs:
+        _print_run(r)
+    last = runs[-1]
+    for d, rate in last["win_rate_by_difficulty"].items():
+        print(f"  {d:<8} {rate:.1%}")
+    for c, rate in last["win_rate_by_category"].items():
+        print(f"  {c:<11} {rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+"""Asyncio Hangman game server.
+
+Clients talk newline-delimited JSON over TCP, one request per line:
+
+    {"id": 1, "action": "start", "difficulty": "Hard", "category": "Fruits"}
+    {"id": 2, "action": "guess", "session": "...", "guess": "a"}
+    {"id": 3, "action": "hint", "session": "..."}
+    {"id": 4, "action": "pause", "session": "..."}      # and "resume", "state", "end"
+
+and get one JSON line back per request ({"id": ..., "ok": true, ...state} or
+{"id": ..., "ok": false, "error": "..."}). The rules are the ones GameScreen
+enforces: no guesses or hints while paused, same messages for bad input.
+
+Words are drawn from a server-wide shuffle bag per pool (no repeats until the
+pool is used up). A client can keep its own no-repeat sequence instead by
+sending "cursor" with start (null the first time) and passing back the
+"cursor" of the response next time; keep one cursor per pool.
+
+Every action is O(1) on the engine, so a single core can host many thousand
+sessions. Each connection is served one request at a time and waits for its
+writes to drain (backpressure). Sessions are rate limited with a token bucket
+and evicted after being idle for `idle_timeout` seconds.
+
+    python hangman_server.py --port 7777
+"""
+
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections import OrderedDict
+
+from hangman_alphabet import ENGLISH, normalize
+from hangman_engine import INVALID, OVER, REPEAT, WIN, HangmanEngine
+from hangman_scheduler import ShuffleBag, WordScheduler
+from hangman_session import SessionRecord
+from hangman_stats import GameResult, StatsStore
+from hangman_words import CATEGORIES, DIFFICULTIES, MIXED, WORD_INDEX
+
+MAX_LINE = 4096
+
+
+class RequestError(Exception):
+    pass
+
+
+def _text_field(request, name, default=None):
+    """request[name], which must be a string if present."""
+    value = request.get(name, default)
+    if not isinstance(value, str):
+        raise RequestError(f"{name!r} must be a string")
+    return value
+
+
+class Session:
+    """Server-side session: a compact SessionRecord plus rate-limit state."""
+    __slots__ = ("sid", "record", "tokens", "stamp", "last_active", "started", "guesses", "player")
+
+    def __init__(self, sid, record, tokens, now, player="Player"):
+        self.sid = sid
+        self.record = record
+        self.tokens = tokens
+        self.stamp = now
+        self.last_active = now
+        self.started = now
+        self.guesses = 0
+        self.player = player
+
+    def take_token(self, rate, burst, now):
+        # token bucket
+        self.tokens = min(burst, self.tokens + (now - self.stamp) * rate)
+        self.stamp = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    @property
+    def status(self):
+        record = self.record
+        if record.won:
+            return "won"
+        if record.lost:
+            return "lost"
+        return "paused" if record.paused else "playing"
+
+    def state(self, words, alphabet=ENGLISH):
+        record = self.record
+        word = words[record.word_id]
+        guessed = record.guessed_mask
+        bits = alphabet.bits
+        pattern = "".join("_" if ch in bits and not guessed & bits[ch] else ch for ch in word)
+        out = {
+            "session": self.sid,
+            "difficulty": record.difficulty,
+            "category": record.category,
+            "pattern": pattern,
+            "guessed": "".join(alphabet.mask_letters(guessed)),
+            "wrong_attempts": record.wrong_attempts,
+            "max_attempts": record.max_attempts,
+            "hints": record.hints,
+            "status": self.status,
+        }
+        if record.over:
+            out["word"] = word
+        return out
+
+
+class HangmanServer:
+    def __init__(self, index=WORD_INDEX, idle_timeout=300.0, rate=20.0, burst=40,
+                 max_sessions=1_000_000, rng=None, clock=time.monotonic, stats=None):
+        self.index = index
+        self.idle_timeout = idle_timeout
+        self.rate = rate
+        self.burst = burst
+        self.max_sessions = max_sessions
+        self.rng = rng or random.Random()
+        self.scheduler = WordScheduler(index, self.rng)
+        self.clock = clock
+        self.stats_store = stats    # StatsStore for finished games, optional
+        self.game = HangmanEngine(alphabet=index.alphabet)     # scratch engine, sessions are loaded into it per move
+        # least recently active first, so eviction stops at the first live session
+        self.sessions = OrderedDict()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "evicted": 0, "connections": 0,
+                      "reloads": 0}
+        self._server = None
+        self._sweeper = None
+        self._watcher = None
+        self._clients = set()
+
+    # Actions
+
+    def handle(self, request):
+        """Process one request dict and return the response dict."""
+        self.stats["requests"] += 1
+        rid = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+            action = _text_field(request, "action", "")
+            if action == "start":
+                bag = self.client_bag(request["cursor"]) if "cursor" in request else None
+                session = self.start(_text_field(request, "difficulty", "Easy"),
+                                     _text_field(request, "category", MIXED),
+                                     str(request.get("player") or "Player")[:40], bag)
+                out = session.state(self.index.words, self.index.alphabet)
+                if bag is not None:
+                    out["cursor"] = bag.cursor
+            else:
+                session = self._session(request)
+                handler = self._actions.get(action)
+                if handler is None:
+                    raise RequestError(f"unknown action {action!r}")
+                out = handler(self, session, request)
+        except RequestError as e:
+            self.stats["errors"] += 1
+            return {"id": rid, "ok": False, "error": str(e)}
+        out["id"] = rid
+        out["ok"] = True
+        return out
+
+    def start(self, difficulty, category, player="Player", bag=None):
+        if difficulty not in DIFFICULTIES:
+            raise RequestError(f"unknown difficulty {difficulty!r}")
+        if category not in CATEGORIES + (MIXED,):
+            raise RequestError(f"unknown category {category!r}")
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                raise RequestError("server full")
+        now = self.clock()
+        sid = secrets.token_urlsafe(9)
+        if bag is None:
+            word_id = self.scheduler.choose_id(difficulty, category)
+        else:
+            pool = self.index.pool(difficulty, category)
+            if bag.n != len(pool):
+                bag.reset(len(pool), self.rng.getrandbits(64))
+            word_id = pool[bag.next()]
+        record = SessionRecord.new(word_id, self.index.words[word_id], difficulty, category,
+                                   alphabet=self.index.alphabet)
+        session = Session(sid, record, self.burst, now, player)
+        self.sessions[sid] = session
+        return session
+
+    @staticmethod
+    def client_bag(cursor):
+        """ShuffleBag for a client's [pool size, key, position] cursor (an empty one if invalid)."""
+        try:
+            n, key, position = (int(v) for v in cursor)
+        except (TypeError, ValueError):
+            return ShuffleBag(0, 0)
+        if n < 0 or not 0 <= key < 1 << 64 or not 0 <= position <= n:
+            return ShuffleBag(0, 0)
+        return ShuffleBag(n, key, position)
+
+    def _session(self, request):
+        session = self.sessions.get(_text_field(request, "session", ""))
+        if session is None:
+            raise RequestError("unknown or expired session")
+        now = self.clock()
+        if not session.take_token(self.rate, self.burst, now):
+            self.stats["rate_limited"] += 1
+            raise RequestError("rate limited")
+        session.last_active = now
+        self.sessions.move_to_end(session.sid)
+        return session
+
+    def _guess(self, session, request):
+        record = session.record
+        if record.paused:
+            raise RequestError("game is paused")
+        guess = normalize(_text_field(request, "guess", ""))
+        if not guess:
+            raise RequestError("Please enter a letter or full-word guess.")
+        game = record.load(self.game, self.index.words)
+        result = game.guess_word(guess) if len(guess) > 1 else game.guess_letter(guess)
+        if result == INVALID:
+            raise RequestError("Enter a single alphabet letter or a full-word guess.")
+        if result == REPEAT:
+            raise RequestError(f"You already guessed '{guess}'.")
+        if result == OVER:
+            raise RequestError("game is over")
+        record.store(game)
+        session.guesses += 1
+        if record.over:
+            self._record_result(session)
+        out = session.state(self.index.words, self.index.alphabet)
+        out["result"] = result
+        return out
+
+    def _hint(self, session, request):
+        record = session.record
+        if record.paused:
+            raise RequestError("game is paused")
+        if record.over:
+            raise RequestError("game is over")
+        game = record.load(self.game, self.index.words)
+        letter = game.reveal(self.rng)
+        if letter is None:
+            raise RequestError("No letters left to reveal.")
+        record.store(game)
+        record.add_hint()
+        if record.over:
+            self._record_result(session)
+        out = session.state(self.index.words, self.index.alphabet)
+        out["revealed"] = letter
+        out["result"] = WIN if record.won else "hint"
+        return out
+
+    def _record_result(self, session):
+        if self.stats_store is None:
+            return
+        record = session.record
+        self.stats_store.record(GameResult(
+            self.index.words[record.word_id], record.difficulty, record.category, session.guesses,
+            record.hints, record.wrong_attempts, self.clock() - session.started, record.won,
+            session.player))
+
+    def _pause(self, session, request):
+        if session.record.over:
+            raise RequestError("game is over")
+        session.record.paused = True
+        return session.state(self.index.words, self.index.alphabet)
+
+    def _resume(self, session, request):
+        session.record.paused = False
+        return session.state(self.index.words, self.index.alphabet)
+
+    def _state(self, session, request):
+        return session.state(self.index.words, self.index.alphabet)
+
+    def _end(self, session, request):
+        out = session.state(self.index.words, self.index.alphabet)
+        del self.sessions[session.sid]
+        out["status"] = "ended"
+        return out
+
+    _actions = {"guess": _guess, "hint": _hint, "pause": _pause, "resume": _resume,
+                "state": _state, "end": _end}
+
+    # Housekeeping
+
+    def evict_idle(self):
+        cutoff = self.clock() - self.idle_timeout
+        sessions = self.sessions
+        evicted = 0
+        while sessions:
+            sid, session = next(iter(sessions.items()))
+            if session.last_active > cutoff:
+                break
+            del sessions[sid]
+            evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 10))
+            self.evict_idle()
+
+    def set_index(self, index):
+        """Swap in a reloaded word index.
+
+        Sessions only hold word ids, so the new index must keep the ids of
+        the old one (SourceWatcher's store is append-only).
+        """
+        self.index = index
+        self.scheduler.index = index
+
+    def watch(self, watcher, interval=2.0):
+        """Poll a SourceWatcher's files from a background task (see hangman_reload.py)."""
+        self._watcher = asyncio.ensure_future(self._watch(watcher, interval))
+
+    async def _watch(self, watcher, interval):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            for path in watcher.changed():
+                # parsing runs off the loop; the diff and swap run on it, between requests
+                entries = await loop.run_in_executor(None, watcher.read, path)
+                index = watcher.apply(path, entries)
+                if index is not None:
+                    self.set_index(index)
+                    self.stats["reloads"] = watcher.reloads
+
+    # Networking
+
+    async def _client(self, reader, writer):
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"id": null, "ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"id": None, "ok": False, "error": "invalid JSON"}
+                    self.stats["errors"] += 1
+                else:
+                    response = self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                # backpressure: stop reading from this client until it reads our replies
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # client went away, or the server is shutting down
+            pass
+        finally:
+            self.stats["connections"] -= 1
+            self._clients.discard(task)
+            writer.close()
+
+    async def start_serving(self, host="127.0.0.1", port=7777):
+        self._server = await asyncio.start_server(self._client, host, port, limit=MAX_LINE,
+                                                  backlog=1024)
+        self._sweeper = asyncio.ensure_future(self._sweep())
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._watcher:
+            self._watcher.cancel()
+        if self._server:
+            self._server.close()
+        for task in list(self._clients):
+            task.cancel()
+        if self._clients:
+            await asyncio.wait(self._clients)
+        if self._server:
+            await self._server.wait_closed()
+
+
+async def _serve(args):
+    index = WORD_INDEX
+    if args.pack:
+        from hangman_pack import open_index
+        index = open_index(args.pack)
+    watcher = None
+    if args.words:
+        from hangman_alphabet import get_alphabet
+        from hangman_reload import SourceWatcher
+        watcher = SourceWatcher(args.words, get_alphabet(args.alphabet), difficulty=args.difficulty,
+                                category=args.category)
+        index = watcher.index
+    stats = StatsStore(args.stats_db) if args.stats_db else None
+    server = HangmanServer(index, idle_timeout=args.idle_timeout, rate=args.rate, burst=args.burst,
+                           max_sessions=args.max_sessions, stats=stats)
+    await server.start_serving(args.host, args.port)
+    if watcher is not None:
+        server.watch(watcher, args.watch_interval)
+    print(f"hangman server on {args.host}:{server.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        if stats is not None:
+            stats.close()
+
+
+def main(argv=None):
+    import argparse
+    from hangman_loader import add_default_args
+    parser = argparse.ArgumentParser(description="Hangman game server (JSON lines over TCP).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--pack", help="word pack to draw from instead of the built-in lists")
+    parser.add_argument("--words", nargs="+", metavar="FILE",
+                        help="draw from these word files, reloaded when they change (see hangman_reload.py)")
+    parser.add_argument("--alphabet", default="en", help="alphabet of the --words files")
+    parser.add_argument("--watch-interval", type=float, default=2.0, help="seconds between checks of --words")
+    add_default_args(parser)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle session is evicted")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second per session")
+    parser.add_argument("--burst", type=int, default=40, help="request burst per session")
+    parser.add_argument("--max-sessions", type=int, default=1_000_000)
+    parser.add_argument("--stats-db", help="record finished games in this SQLite database")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Compact per-game session records.
+
+A SessionRecord holds one game in three small ints: the word as an id into
+the word table, the guessed / still-missing letter masks (32 bits each, the
+largest alphabet hangman_alphabet allows), and a `meta` field
+packing the attempts, difficulty, category, pause flag and hint count. It
+serialises to a fixed 16-byte struct, so a server can keep (or persist)
+millions of sessions.
+
+    python hangman_session.py -n 1000000     # bytes per session benchmark
+"""
+
+import struct
+import sys
+import tracemalloc
+
+from hangman_alphabet import ENGLISH
+from hangman_engine import MAX_ATTEMPTS
+from hangman_words import CATEGORIES, DIFFICULTIES, MIXED, WORD_INDEX
+
+RECORD = struct.Struct("<IQI")   # word id, masks, meta
+
+DIFFICULTY_CODES = {d: i for i, d in enumerate(DIFFICULTIES)}
+CATEGORY_NAMES = CATEGORIES + (MIXED,)
+CATEGORY_CODES = {c: i for i, c in enumerate(CATEGORY_NAMES)}
+
+_MASK32 = (1 << 32) - 1
+
+# meta layout: bits 0-3 wrong attempts, 4-7 max attempts, 8-9 difficulty,
+# 10-11 category, 12 paused, 13-19 hints used
+_WRONG, _MAX, _DIFF, _CAT, _PAUSED, _HINTS = 0, 4, 8, 10, 12, 13
+_HINTS_MAX = 127
+
+
+class SessionRecord:
+    __slots__ = ("word_id", "masks", "meta")
+
+    def __init__(self, word_id=0, masks=0, meta=0):
+        self.word_id = word_id
+        self.masks = masks      # guessed mask | remaining mask << 32
+        self.meta = meta
+
+    @classmethod
+    def new(cls, word_id, word, difficulty, category, max_attempts=MAX_ATTEMPTS, alphabet=ENGLISH):
+        meta = ((max_attempts << _MAX) | (DIFFICULTY_CODES[difficulty] << _DIFF)
+                | (CATEGORY_CODES[category] << _CAT))
+        return cls(word_id, alphabet.word_mask(word) << 32, meta)
+
+    # masks
+
+    @property
+    def guessed_mask(self):
+        return self.masks & _MASK32
+
+    @property
+    def remaining_mask(self):
+        return self.masks >> 32
+
+    # meta fields
+
+    @property
+    def wrong_attempts(self):
+        return self.meta & 0xF
+
+    @property
+    def max_attempts(self):
+        return (self.meta >> _MAX) & 0xF
+
+    @property
+    def difficulty(self):
+        return DIFFICULTIES[(self.meta >> _DIFF) & 0x3]
+
+    @property
+    def category(self):
+        return CATEGORY_NAMES[(self.meta >> _CAT) & 0x3]
+
+    @property
+    def paused(self):
+        return bool(self.meta >> _PAUSED & 1)
+
+    @paused.setter
+    def paused(self, value):
+        self.meta = (self.meta & ~(1 << _PAUSED)) | (bool(value) << _PAUSED)
+
+    @property
+    def hints(self):
+        return (self.meta >> _HINTS) & _HINTS_MAX
+
+    def add_hint(self):
+        if self.hints < _HINTS_MAX:
+            self.meta += 1 << _HINTS
+
+    @property
+    def won(self):
+        return self.remaining_mask == 0
+
+    @property
+    def lost(self):
+        return self.wrong_attempts >= self.max_attempts
+
+    @property
+    def over(self):
+        return self.won or self.lost
+
+    # engine round trip
+
+    def load(self, engine, words):
+        """Put this game into a (shared, scratch) HangmanEngine."""
+        engine.max_attempts = self.max_attempts
+        engine.restore(words[self.word_id], self.guessed_mask, self.wrong_attempts)
+        return engine
+
+    def store(self, engine):
+        """Copy the engine's guess state back into the record."""
+        self.masks = engine.guessed_mask | (engine.remaining_mask << 32)
+        self.meta = (self.meta & ~0xF) | min(engine.wrong_attempts, 0xF)
+
+    # serialisation
+
+    def to_bytes(self):
+        return RECORD.pack(self.word_id, self.masks, self.meta)
+
+    def pack_into(self, buf, offset):
+        RECORD.pack_into(buf, offset, self.word_id, self.masks, self.meta)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        return cls(*RECORD.unpack_from(data, offset))
+
+    def __eq__(self, other):
+        return (isinstance(other, SessionRecord) and self.word_id == other.word_id
+                and self.masks == other.masks and self.meta == other.meta)
+
+    def __repr__(self):
+        return (f"SessionRecord(word_id={self.word_id}, guessed={self.guessed_mask:#x}, "
+                f"wrong={self.wrong_attempts}/{self.max_attempts}, {self.difficulty}/{self.category})")
+
+
+# Memory benchmark
+
+class LegacyState:
+    """Per-game state as HangmanApp keeps it (StringVars modelled as str)."""
+
+    def __init__(self, word, guessed, wrong, difficulty, category):
+        self.secret_word = word
+        self.guessed_letters = set(guessed)
+        self.wrong_attempts = wrong
+        self.difficulty = difficulty
+        self.category = category
+
+
+def _measure(build, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / n
+
+
+def benchmark(n=100_000, index=WORD_INDEX):
+    """Bytes per session for the set-based state, SessionRecord and packed structs."""
+    words = index.words
+    word_mask = index.alphabet.word_mask
+    guesses = "aeiourstn"
+
+    def legacy(n):
+        # guessed sets are distinct per game, like in the app
+        return [LegacyState(words[i % len(words)], guesses[:i % 9 + 1], i % 6,
+                            DIFFICULTIES[i % 4], CATEGORY_NAMES[i % 3]) for i in range(n)]
+
+    def records(n):
+        out = []
+        for i in range(n):
+            r = SessionRecord.new(i % len(words), words[i % len(words)], DIFFICULTIES[i % 4], CATEGORY_NAMES[i % 3])
+            r.masks |= word_mask(guesses[:i % 9 + 1])
+            r.meta |= i % 6
+            out.append(r)
+        return out
+
+    def packed(n):
+        buf = bytearray(RECORD.size * n)
+        r = SessionRecord.new(0, words[0], "Easy", "Mixed")
+        for i in range(n):
+            r.pack_into(buf, i * RECORD.size)
+        return buf
+
+    return {
+        "sessions": n,
+        "set_based_bytes": _measure(legacy, n),
+        "session_record_bytes": _measure(records, n),
+        "packed_struct_bytes": _measure(packed, n),
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Bytes per session: set-based state vs SessionRecord.")
+    parser.add_argument("-n", "--sessions", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    result = benchmark(args.sessions)
+    print(f"{result['sessions']} sessions (Python {sys.version.split()[0]})")
+    for name in ("set_based_bytes", "session_record_bytes", "packed_struct_bytes"):
+        print(f"  {name.replace('_bytes', '').replace('_', ' '):<16} {result[name]:8.1f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Entropy-maximising letter suggestions for a masked pattern.
+
+Words are split into buckets by length. Each bucket keeps an inverted index
+of word bitsets per (position, character) and per letter, stored as Python
+ints, so narrowing the candidates for a pattern such as "_a__a" is a handful
+of big-int AND / AND-NOT operations instead of a regex scan. The letter
+entropy is computed the same way: the candidates are split into reveal
+classes with bitset intersections and only the class sizes are counted.
+The scores of the opening state (nothing revealed, nothing wrong) are worked
+out once per length when the index is built, since every game starts there.
+
+Words are indexed in their accent-folded form (see hangman_alphabet.py), so
+patterns, candidates and suggestions only ever use the alphabet's letters.
+
+    python hangman_solver.py _a__a --wrong xyz
+"""
+
+import math
+import random
+from collections import Counter
+
+from hangman_alphabet import ENGLISH
+
+UNKNOWN = "_"
+SMALL = 64          # below this many candidates, scan the words directly
+CACHE_SIZE = 4096   # remembered suggestions (early-game patterns repeat a lot)
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(x):
+        return bin(x).count("1")
+
+
+def _bits(x):
+    """Indexes of the set bits of x."""
+    out = []
+    while x:
+        low = x & -x
+        out.append(low.bit_length() - 1)
+        x ^= low
+    return out
+
+
+def _entropy(counts, total):
+    return math.log2(total) - sum(c * math.log2(c) for c in counts if c) / total
+
+
+class _Bucket:
+    """Positional index for all words of one length."""
+
+    def __init__(self, words, letters):
+        self.words = words
+        n = len(words)
+        self.all = (1 << n) - 1
+        nbytes = (n + 7) // 8
+        at = {}
+        for i, w in enumerate(words):
+            byte = i >> 3
+            bit = 1 << (i & 7)
+            for p, ch in enumerate(w):
+                ba = at.get((p, ch))
+                if ba is None:
+                    ba = at[(p, ch)] = bytearray(nbytes)
+                ba[byte] |= bit
+        self.at = {key: int.from_bytes(ba, "little") for key, ba in at.items()}
+        self.has = dict.fromkeys(letters, 0)
+        for (p, ch), bits in self.at.items():
+            if ch in self.has:
+                self.has[ch] |= bits
+
+
+class Solver:
+    def __init__(self, words, alphabet=ENGLISH):
+        self.alphabet = alphabet
+        by_length = {}
+        fold = alphabet.fold
+        if alphabet.latin:
+            # normalised ASCII words are already folded
+            words = (w if w.isascii() else fold(w) for w in words)
+        else:
+            words = map(fold, words)
+        for w in dict.fromkeys(words):
+            by_length.setdefault(len(w), []).append(w)
+        self.buckets = {n: _Bucket(ws, alphabet.letters) for n, ws in by_length.items()}
+        for n, bucket in self.buckets.items():
+            bucket.opening = self._scores(bucket, bucket.all, list(range(n)), alphabet.letters)
+        self._cache = {}
+
+    @classmethod
+    def for_pool(cls, index, difficulty, category):
+        return cls(index.pool_words(difficulty, category), index.alphabet)
+
+    def _candidates(self, pattern, wrong):
+        bucket = self.buckets.get(len(pattern))
+        if bucket is None:
+            return None, 0, []
+        at = bucket.at
+        c = bucket.all
+        revealed = set()
+        unknown = []
+        for p, ch in enumerate(pattern):
+            if ch == UNKNOWN:
+                unknown.append(p)
+            else:
+                c &= at.get((p, ch), 0)
+                if ch in self.alphabet.letter_bits:
+                    revealed.add(ch)
+        # a revealed letter is revealed everywhere, so hidden slots can't hold it
+        for p in unknown:
+            for ch in revealed:
+                c &= ~at.get((p, ch), 0)
+        for ch in wrong:
+            c &= ~bucket.has.get(ch, 0)
+        return bucket, c, unknown
+
+    def candidates(self, pattern, wrong=""):
+        """Words still consistent with `pattern` and the wrong letters."""
+        bucket, c, _ = self._candidates(pattern, wrong)
+        if bucket is None:
+            return []
+        return [bucket.words[i] for i in _bits(c)]
+
+    def count(self, pattern, wrong=""):
+        _, c, _ = self._candidates(pattern, wrong)
+        return _popcount(c)
+
+    def letter_scores(self, pattern, wrong="", allowed=None):
+        """{letter: (entropy, hit count)} over the remaining candidates."""
+        guessed = set(pattern) | set(wrong)
+        letters = [ch for ch in (allowed or self.alphabet.letters) if ch not in guessed]
+        if guessed == {UNKNOWN} or not guessed:
+            bucket = self.buckets.get(len(pattern))
+            if bucket is None:
+                return {}
+            opening = bucket.opening
+            return {ch: opening[ch] for ch in letters if ch in opening}
+        bucket, c, unknown = self._candidates(pattern, wrong)
+        return self._scores(bucket, c, unknown, letters)
+
+    @staticmethod
+    def _scores(bucket, c, unknown, letters):
+        total = _popcount(c)
+        if not total:
+            return {}
+        scores = {}
+        if total <= SMALL:
+            words = [bucket.words[i] for i in _bits(c)]
+            for ch in letters:
+                classes = Counter(tuple(p for p in unknown if w[p] == ch) for w in words)
+                hits = total - classes.get((), 0)
+                if hits:
+                    scores[ch] = (_entropy(classes.values(), total), hits)
+            return scores
+        at = bucket.at
+        for ch in letters:
+            hit = c & bucket.has[ch]
+            if not hit:
+                continue
+            # split the hits into classes by where the letter appears
+            blocks = [hit]
+            for p in unknown:
+                bits = at.get((p, ch))
+                if not bits:
+                    continue
+                split = []
+                for b in blocks:
+                    x = b & bits
+                    if x:
+                        split.append(x)
+                        if x != b:
+                            split.append(b ^ x)
+                    else:
+                        split.append(b)
+                blocks = split
+            hits = _popcount(hit)
+            counts = [_popcount(b) for b in blocks]
+            counts.append(total - hits)
+            scores[ch] = (_entropy(counts, total), hits)
+        return scores
+
+    def suggest(self, pattern, wrong="", allowed=None):
+        """Most informative letter to guess next, or None if nothing fits."""
+        key = (pattern, "".join(sorted(wrong)), allowed)
+        if key in self._cache:
+            return self._cache[key]
+        scores = self.letter_scores(pattern, wrong, allowed)
+        best = max(sorted(scores), key=lambda ch: scores[ch], default=None)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = best
+        return best
+
+
+def game_pattern(game):
+    """Solver pattern and wrong letters for a HangmanEngine."""
+    alphabet = game.alphabet
+    canonical = alphabet.canonical
+    bits = alphabet.bits
+    guessed = game.guessed_mask
+    pattern = "".join((canonical[ch] if guessed & bits[ch] else UNKNOWN) if ch in bits else ch
+                      for ch in game.secret_word)
+    wrong = "".join(alphabet.mask_letters(guessed & ~game.word_mask))
+    return pattern, wrong
+
+
+def smart_hint(solver, game):
+    """The missing letter of the secret word that tells the most about the rest."""
+    pattern, wrong = game_pattern(game)
+    allowed = "".join(game.alphabet.mask_letters(game.remaining_mask))
+    return solver.suggest(pattern, wrong, allowed)
+
+
+def main(argv=None):
+    import argparse
+    import time
+    from hangman_words import WORD_INDEX
+    parser = argparse.ArgumentParser(description="Suggest the next Hangman letter.")
+    parser.add_argument("pattern", help='masked word, "_" for hidden letters, e.g. _a__a')
+    parser.add_argument("--wrong", default="", help="wrong letters guessed so far")
+    parser.add_argument("--pack", help="word pack to use instead of the built-in lists")
+    args = parser.parse_args(argv)
+    if args.pack:
+        from hangman_pack import WordPack
+        words = WordPack(args.pack)
+        alphabet = words.alphabet
+    else:
+        words = WORD_INDEX.words
+        alphabet = WORD_INDEX.alphabet
+    pattern = alphabet.fold(args.pattern.lower())
+    wrong = alphabet.fold(args.wrong.lower())
+    start = time.perf_counter()
+    solver = Solver(words, alphabet)
+    built = time.perf_counter()
+    best = solver.suggest(pattern, wrong)
+    done = time.perf_counter()
+    print(f"index built in {(built - start) * 1000:.1f} ms, "
+          f"{solver.count(pattern, wrong)} candidates")
+    print(f"suggestion: {best} ({(done - built) * 1000:.3f} ms)")
+    sample = solver.candidates(pattern, wrong)
+    if sample:
+        print("e.g. " + ", ".join(random.sample(sample, min(5, len(sample)))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Persistent game history, win rates and leaderboard (SQLite, WAL mode).
+
+StatsStore.record() only puts the result on a queue; a background thread
+writes queued results in batches, one transaction per batch, so neither the
+Tk event loop nor the game server waits on disk. Every batch also updates the
+small summary tables the win-rate and leaderboard queries read from, so those
+queries never scan the raw `games` history.
+
+    python hangman_stats.py leaderboard --difficulty Hard
+    python hangman_stats.py winrates
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".hangman_stats.db")
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5   # seconds a result may wait before it is written
+
+_log = logging.getLogger(__name__)
+
+GameResult = namedtuple("GameResult", "word difficulty category guesses hints wrong_attempts seconds won player")
+GameResult.__new__.__defaults__ = ("Player",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    player TEXT NOT NULL,
+    word TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    category TEXT NOT NULL,
+    guesses INTEGER NOT NULL,
+    hints INTEGER NOT NULL,
+    wrong_attempts INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pool_summary (
+    difficulty TEXT NOT NULL,
+    category TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong_attempts INTEGER NOT NULL,
+    hints INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (difficulty, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_summary (
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    best_seconds REAL,
+    PRIMARY KEY (player, difficulty)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_summary_rank ON player_summary (difficulty, wins DESC, best_seconds);
+"""
+
+_INSERT_GAME = """
+INSERT INTO games (finished_at, player, word, difficulty, category, guesses, hints,
+                   wrong_attempts, seconds, won)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_POOL = """
+INSERT INTO pool_summary VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (difficulty, category) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    wrong_attempts = wrong_attempts + excluded.wrong_attempts,
+    hints = hints + excluded.hints,
+    seconds = seconds + excluded.seconds
+"""
+
+_UPSERT_PLAYER = """
+INSERT INTO player_summary VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (player, difficulty) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    best_seconds = CASE
+        WHEN excluded.best_seconds IS NULL THEN best_seconds
+        WHEN best_seconds IS NULL THEN excluded.best_seconds
+        ELSE min(best_seconds, excluded.best_seconds) END
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class StatsStore:
+    def __init__(self, path=DEFAULT_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.errors = 0
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._queue = queue.Queue()
+        self._submitted = 0
+        self._done = threading.Condition()
+        self._local = threading.local()
+        self._thread = threading.Thread(target=self._writer, name="hangman-stats", daemon=True)
+        self._thread.start()
+
+    # Writing
+
+    def record(self, result, finished_at=None):
+        """Queue a GameResult; never blocks on disk."""
+        with self._done:
+            self._submitted += 1
+        self._queue.put((finished_at or time.time(), result))
+
+    def _writer(self):
+        conn = None
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                if conn is None:
+                    conn = connect(self.path)
+                self._write_batch(conn, batch)
+                ok = True
+            except Exception:
+                # the batch is lost, but the thread carries on and flush() still returns
+                _log.exception("couldn't save %d game result(s) to %s", len(batch), self.path)
+                ok = False
+            with self._done:
+                if ok:
+                    self.written += len(batch)
+                else:
+                    self.errors += len(batch)
+                self._done.notify_all()
+        if conn is not None:
+            conn.close()
+
+    @staticmethod
+    def _write_batch(conn, batch):
+        pools = {}
+        players = {}
+        rows = []
+        for finished_at, r in batch:
+            won = 1 if r.won else 0
+            rows.append((finished_at, r.player, r.word, r.difficulty, r.category, r.guesses,
+                         r.hints, r.wrong_attempts, r.seconds, won))
+            p = pools.setdefault((r.difficulty, r.category), [0, 0, 0, 0, 0.0])
+            p[0] += 1
+            p[1] += won
+            p[2] += r.wrong_attempts
+            p[3] += r.hints
+            p[4] += r.seconds
+            q = players.setdefault((r.player, r.difficulty), [0, 0, None])
+            q[0] += 1
+            q[1] += won
+            if won and (q[2] is None or r.seconds < q[2]):
+                q[2] = r.seconds
+        with conn:
+            conn.executemany(_INSERT_GAME, rows)
+            conn.executemany(_UPSERT_POOL, [k + tuple(v) for k, v in pools.items()])
+            conn.executemany(_UPSERT_PLAYER, [k + tuple(v) for k, v in players.items()])
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is on disk."""
+        with self._done:
+            target = self._submitted
+            return self._done.wait_for(lambda: self.written + self.errors >= target, timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    # Queries (summary tables only)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def win_rates(self):
+        """{(difficulty, category): (games, win rate, avg wrong attempts, avg seconds)}"""
+        rows = self._conn().execute(
+            "SELECT difficulty, category, games, wins, wrong_attempts, seconds FROM pool_summary")
+        return {(d, c): (g, w / g, wrong / g, secs / g) for d, c, g, w, wrong, secs in rows if g}
+
+    def leaderboard(self, difficulty, limit=10):
+        """[(player, wins, games, best seconds)] for one difficulty, most wins first."""
+        return self._conn().execute(
+            "SELECT player, wins, games, best_seconds FROM player_summary "
+            "WHERE difficulty = ? ORDER BY wins DESC, best_seconds LIMIT ?",
+            (difficulty, limit)).fetchall()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Show Hangman win rates and leaderboards.")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_lb = sub.add_parser("leaderboard")
+    p_lb.add_argument("--difficulty", default="Easy")
+    p_lb.add_argument("--limit", type=int, default=10)
+    sub.add_parser("winrates")
+    args = parser.parse_args(argv)
+
+    store = StatsStore(args.db)
+    try:
+        if args.cmd == "leaderboard":
+            for rank, (player, wins, games, best) in enumerate(store.leaderboard(args.difficulty, args.limit), 1):
+                best = f"{best:.1f}s" if best is not None else "-"
+                print(f"{rank:>3}. {player:<20} {wins:>5} wins / {games:<5} best {best}")
+        else:
+            for (d, c), (games, rate, wrong, secs) in sorted(store.win_rates().items()):
+                print(f"{d:<8} {c:<11} {games:>7} games  {rate:6.1%} won  "
+                      f"{wrong:4.2f} wrong  {secs:6.1f}s avg")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Word lists and the (difficulty, category) pool index used by choose_word.
+
+Every word is stored once in a shared table together with difficulty and
+category bit flags. All pools (including "Mixed" and the fallbacks for empty
+lists) are resolved once when the index is built, so picking a word is a
+single random index into a read-only id array.
+"""
+
+import random
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+
+from hangman_alphabet import ENGLISH, normalize_batch
+
+# Word lists
+
+easy_fruits = [
+    "apple", "banana", "orange", "grape", "strawberry",
+    "watermelon", "mango", "pineapple", "pear", "peach"
+]
+
+easy_vegetables = [
+    "cucumber", "potato", "carrot", "onion", "sweet potato",
+    "garlic", "beetroot"
+]
+
+medium_fruits = [
+    "kiwifruit", "passion", "pomegranate", "jackfruit", "star fruit"
+]
+
+medium_vegetables = [
+    "cauliflower", "broccoli", "cabbage", "mushrooms", "cucumber",
+    "drumstick", "ladies finger", "sweet potato", "green chilli", "beans"
+]
+
+hard_fruits = [
+    "lychee", "pineapple", "dragon fruit", "pomegranate", "guava",
+    "chikoo", "plum", "blackcurrant", "rambutan", "longan", "sapodilla"
+]
+
+hard_vegetables = [
+    "baby corn", "ginger", "millet", "turmeric", "pumpkin",
+    "asparagus", "artichoke", "zucchini", "radicchio", "kohlrabi"
+]
+
+extreme_fruits = [
+    "ice apple", "jamun", "wood apple",  "avocado",  "miraclefruit"
+]
+
+extreme_vegetables = [
+    "elephant foot", "bottle gourd", "drumsticks",
+    "bitter gourd", "spring onion", "broccoli"
+]
+
+
+def normalize_list(words):
+    # casefold / NFC / whitespace (see hangman_alphabet), duplicates dropped
+    return list(dict.fromkeys(normalize_batch(list(words))))
+
+
+easy_fruits = normalize_list(easy_fruits)
+easy_vegetables = normalize_list(easy_vegetables)
+medium_fruits = normalize_list(medium_fruits)
+medium_vegetables = normalize_list(medium_vegetables)
+hard_fruits = normalize_list(hard_fruits)
+hard_vegetables = normalize_list(hard_vegetables)
+extreme_fruits = normalize_list(extreme_fruits)
+extreme_vegetables = normalize_list(extreme_vegetables)
+
+WORD_LISTS = {
+    ("Easy", "Fruits"): easy_fruits,
+    ("Easy", "Vegetables"): easy_vegetables,
+    ("Medium", "Fruits"): medium_fruits,
+    ("Medium", "Vegetables"): medium_vegetables,
+    ("Hard", "Fruits"): hard_fruits,
+    ("Hard", "Vegetables"): hard_vegetables,
+    ("Extreme", "Fruits"): extreme_fruits,
+    ("Extreme", "Vegetables"): extreme_vegetables,
+}
+
+
+# Difficulty / category flags
+
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Extreme")
+CATEGORIES = ("Fruits", "Vegetables")
+MIXED = "Mixed"
+
+DIFFICULTY_FLAGS = {d: 1 << i for i, d in enumerate(DIFFICULTIES)}
+CATEGORY_FLAGS = {c: 1 << i for i, c in enumerate(CATEGORIES)}
+
+# A word's category flags are kept per difficulty: bit d * len(CATEGORIES) + c
+# says it is listed under (DIFFICULTIES[d], CATEGORIES[c]). So a word listed
+# as (Easy, Fruits) and (Hard, Vegetables) is in just those two pools, not in
+# (Easy, Vegetables) and (Hard, Fruits) as well. All of it fits in one byte.
+_CATEGORY_MASK = (1 << len(CATEGORIES)) - 1
+
+# pools tried in order when a (difficulty, category) pool is empty;
+# anything still empty falls back to ("Easy", "Mixed")
+FALLBACKS = {
+    "Easy": ("Easy",),
+    "Medium": ("Medium", "Easy"),
+    "Hard": ("Hard", "Medium", "Easy"),
+    "Extreme": ("Extreme", "Hard", "Medium"),
+}
+MIXED_FALLBACKS = {
+    "Easy": ("Easy",),
+    "Medium": ("Medium", "Easy"),
+    "Hard": ("Hard", "Medium"),
+    "Extreme": ("Extreme", "Hard"),
+}
+DEFAULT_KEY = ("Easy", MIXED)
+
+
+def pool_keys():
+    """Every (difficulty, category) pair the game can ask for."""
+    return [(d, c) for d in DIFFICULTIES for c in CATEGORIES + (MIXED,)]
+
+
+def pair_flags(difficulty_flags, categories):
+    """Category flags of a word listed under each difficulty in `difficulty_flags`
+    with the categories in `categories` (CATEGORY_FLAGS bits)."""
+    flags = 0
+    for i in range(len(DIFFICULTIES)):
+        if difficulty_flags >> i & 1:
+            flags |= categories << i * len(CATEGORIES)
+    return flags
+
+
+def any_categories(category_flags):
+    """CATEGORY_FLAGS bits of a word under any of its difficulties."""
+    categories = 0
+    while category_flags:
+        categories |= category_flags & _CATEGORY_MASK
+        category_flags >>= len(CATEGORIES)
+    return categories
+
+
+def readonly(ids):
+    return memoryview(ids).toreadonly()
+
+
+class WordIndex:
+    """Immutable (difficulty, category) -> word-id pool index.
+
+    `words` is any indexable word table (a tuple, a WordStore, a mapped pack)
+    and the two flag arrays hold the difficulty bits of each word and its
+    category bits per difficulty (see pair_flags).
+    `alphabet` is the letter set the words are played with.
+    """
+
+    def __init__(self, words, difficulty_flags, category_flags, pools=None, alphabet=ENGLISH):
+        self.words = words
+        self.alphabet = alphabet
+        self.difficulty_flags = difficulty_flags
+        self.category_flags = category_flags
+        if pools is None:
+            pools = self._build_pools()
+        self._pools = MappingProxyType(pools)
+        self._default = pools[DEFAULT_KEY]
+
+    @classmethod
+    def from_lists(cls, lists):
+        """Build from {(difficulty, category): [words]}; shared words are stored once."""
+        ids = {}
+        words = []
+        dflags = array("B")
+        cflags = array("B")
+        for (d, c), lst in lists.items():
+            dbit = DIFFICULTY_FLAGS[d]
+            cbit = CATEGORY_FLAGS[c]
+            for w in lst:
+                i = ids.get(w)
+                if i is None:
+                    i = ids[w] = len(words)
+                    words.append(w)
+                    dflags.append(0)
+                    cflags.append(0)
+                dflags[i] |= dbit
+                cflags[i] |= pair_flags(dbit, cbit)
+        return cls(tuple(words), dflags, cflags)
+
+    def _build_pools(self):
+        return resolve_pools(build_base_pools(self.difficulty_flags, self.category_flags))
+
+    def pool(self, difficulty, category):
+        """Read-only word ids for a (difficulty, category) pair, fallbacks applied."""
+        return self._pools.get((difficulty, category), self._default)
+
+    def pool_words(self, difficulty, category):
+        words = self.words
+        return [words[i] for i in self.pool(difficulty, category)]
+
+    def choose_id(self, difficulty, category, rng=random):
+        pool = self._pools.get((difficulty, category), self._default)
+        return pool[rng.randrange(len(pool))]
+
+    def choose(self, difficulty, category, rng=random):
+        pool = self._pools.get((difficulty, category), self._default)
+        return self.words[pool[rng.randrange(len(pool))]]
+
+    def __len__(self):
+        return len(self.words)
+
+
+@lru_cache(maxsize=None)
+def base_keys(df, cf):
+    """Base (unresolved) pool keys of a word with difficulty / category flags df, cf."""
+    keys = []
+    for i, (d, dbit) in enumerate(DIFFICULTY_FLAGS.items()):
+        categories = cf >> i * len(CATEGORIES) & _CATEGORY_MASK
+        if not df & dbit or not categories:
+            continue
+        keys.append((d, MIXED))
+        for c, cbit in CATEGORY_FLAGS.items():
+            if categories & cbit:
+                keys.append((d, c))
+    return tuple(keys)
+
+
+def build_base_pools(dflags, cflags):
+    """Raw per-key id arrays, before fallbacks."""
+    base = {key: array("I") for key in pool_keys()}
+    for i in range(len(dflags)):
+        for key in base_keys(dflags[i], cflags[i]):
+            base[key].append(i)
+    return base
+
+
+def resolve_pools(base):
+    """Apply FALLBACKS / MIXED_FALLBACKS to raw per-key id arrays (done once)."""
+    default = base[DEFAULT_KEY]
+    pools = {}
+    for d in DIFFICULTIES:
+        for c in CATEGORIES + (MIXED,):
+            chain = MIXED_FALLBACKS[d] if c == MIXED else FALLBACKS[d]
+            ids = default
+            for fd in chain:
+                if len(base[(fd, c)]):
+                    ids = base[(fd, c)]
+                    break
+            pools[(d, c)] = readonly(ids)
+    if not len(pools[DEFAULT_KEY]):
+        raise ValueError("word index has no words for the default (Easy, Mixed) pool")
+    return pools
+
+
+WORD_INDEX = WordIndex.from_lists(WORD_LISTS)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# the hangman_* modules live at the top of the repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Clock:
+    """Monotonic clock that moves 250 ms per call."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.25
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
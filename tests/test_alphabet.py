@@ -0,0 +1,25 @@
+from hangman_alphabet import get_alphabet, normalize, normalize_batch
+from hangman_engine import HIT, WIN, HangmanEngine
+
+DE = get_alphabet("de")
+EL = get_alphabet("el")
+
+
+def test_normalize():
+    assert normalize("  Sweet \t Potato ") == "sweet potato"
+    assert normalize("Café") == "café"
+    assert normalize_batch(["Äpfel", " Kiwi", "Birne"]) == ["äpfel", "kiwi", "birne"]
+
+
+def test_sharp_s_is_a_german_letter():
+    assert normalize("STRAẞE") == normalize("Straße") == "straße"
+    assert normalize_batch(["Straße", "Fuß"]) == ["straße", "fuß"]
+    assert DE.fold("ẞ") == "ß"
+    game = HangmanEngine("straße", alphabet=DE)
+    assert [game.guess_letter(ch) for ch in "strae"] == [HIT] * 5
+    assert game.guess_letter("ß") == WIN
+
+
+def test_variants_guess_their_letter():
+    assert DE.fold("É") == "e" and DE.fold("Ä") == "ä"
+    assert EL.fold("ς") == "σ" and EL.fold("Ά") == "α"
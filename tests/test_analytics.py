@@ -0,0 +1,30 @@
+from hangman_analytics import scan
+from hangman_replay import ABANDONED, LOST, WON, ReplayWriter
+
+
+def test_analytics_counts_moves_like_the_engine(tmp_path):
+    path = str(tmp_path / "games.hmr")
+    writer = ReplayWriter(path)
+    writer.start_game(1, "Easy", "Fruits", "plum")
+    for text in ("p", "p", "7", "x", "plum"):      # a repeat and an invalid guess
+        writer.guess(text)
+    writer.hint("l")                               # after the game is over
+    writer.end_game(True)
+    writer.start_game(2, "Easy", "Fruits", "kiwi")
+    for text in "abcdef":
+        writer.guess(text)
+    writer.end_game(False)
+    writer.start_game(3, "Easy", "Fruits", "pear")
+    writer.hint("p")
+    writer.close()
+
+    (cols, offset), = scan(path)
+    with open(path, "rb") as f:
+        assert offset < len(f.read())               # the unfinished last game waits
+    assert cols.words == ["plum", "kiwi"]
+    assert list(cols.outcome) == [WON, LOST]
+    assert list(cols.moves) == [3, 6]
+    assert list(cols.hints) == [0, 0]
+    assert list(cols.wrong) == [1, 6]
+    assert cols.letters == ["p", "x"] + list("abcdef")
+    assert ABANDONED not in cols.outcome
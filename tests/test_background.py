@@ -0,0 +1,26 @@
+from hangman_background import BackgroundLoader
+
+
+def run_loader(paths, **kwargs):
+    loader = BackgroundLoader(paths, min_pool=1, **kwargs).start()
+    loader.thread.join()
+    return loader.poll()
+
+
+def test_background_loader_reports_failures(tmp_path):
+    bad = tmp_path / "words.jsonl"
+    bad.write_text('{"word": "plum"}\n"pear"\n', encoding="utf-8")
+    kind, message = run_loader([str(bad)])[-1]
+    assert kind == "error" and "JSON object" in message
+
+    kind, message = run_loader([str(tmp_path)])[-1]     # a directory, not a file
+    assert kind == "error"
+
+
+def test_background_loader_loads_plain_lists(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("apple\nbanana\n", encoding="utf-8")
+    messages = run_loader([str(path)])
+    assert messages[-1][0] == "done"
+    assert sorted(messages[-1][1].index.pool_words("Easy", "Fruits")) == ["apple", "banana"]
+    assert any(m[0] == "pools" for m in messages)
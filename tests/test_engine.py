@@ -0,0 +1,107 @@
+import random
+
+from hangman_engine import (HIT, INVALID, LOSS, MAX_ATTEMPTS, MISS, OVER, REPEAT, WIN,
+                            HangmanEngine)
+
+# the rules GameScreen.submit_guess enforced before they moved into the engine
+
+
+def test_letter_hits_and_misses():
+    game = HangmanEngine("banana")
+    assert game.guess_letter("a") == HIT
+    assert game.guess_letter("z") == MISS
+    assert game.wrong_attempts == 1
+    assert game.guessed_letters == ["a", "z"]
+    assert game.is_guessed("a") and not game.is_guessed("b")
+
+
+def test_repeated_letter_costs_nothing():
+    game = HangmanEngine("banana")
+    game.guess_letter("a")
+    game.guess_letter("z")
+    assert game.guess_letter("a") == REPEAT
+    assert game.guess_letter("z") == REPEAT
+    assert game.wrong_attempts == 1
+
+
+def test_invalid_input_costs_nothing():
+    game = HangmanEngine("banana")
+    for text in ("7", "-", " ", "é!"):
+        assert game.guess_letter(text) == INVALID
+    assert (game.wrong_attempts, game.guessed_mask) == (0, 0)
+
+
+def test_wrong_word_costs_an_attempt_every_time():
+    game = HangmanEngine("banana")
+    assert game.guess_word("bandana") == MISS
+    assert game.guess_word("bandana") == MISS      # words are never "already guessed"
+    assert game.wrong_attempts == 2
+    assert game.guessed_mask == 0
+
+
+def test_right_word_wins():
+    game = HangmanEngine("banana")
+    game.guess_letter("z")
+    assert game.guess_word("banana") == WIN
+    assert game.won and game.over and not game.lost
+    assert game.guessed_letters == ["a", "b", "n", "z"]
+
+
+def test_last_letter_wins():
+    game = HangmanEngine("nab")
+    assert [game.guess_letter(ch) for ch in "nab"] == [HIT, HIT, WIN]
+    assert game.won
+
+
+def test_lost_at_max_attempts():
+    game = HangmanEngine("kiwi")
+    results = [game.guess_letter(ch) for ch in "abcdef"]
+    assert results == [MISS] * (MAX_ATTEMPTS - 1) + [LOSS]
+    assert game.lost and game.over and not game.won
+    assert game.guess_letter("k") == OVER
+    assert game.guess_word("kiwi") == OVER
+    assert game.wrong_attempts == MAX_ATTEMPTS
+
+
+def test_wrong_word_on_the_last_attempt_loses():
+    game = HangmanEngine("kiwi", max_attempts=2)
+    assert game.guess_letter("z") == MISS
+    assert game.guess_word("lime") == LOSS
+    assert game.lost
+
+
+def test_spaces_in_phrases():
+    game = HangmanEngine("sweet potato")
+    # the space is shown from the start and never has to be guessed
+    assert game.word_mask == game.alphabet.word_mask("sweetpotato")
+    assert game.guess_letter(" ") == INVALID
+    for ch in "sweptoa":
+        result = game.guess_letter(ch)
+    assert result == WIN
+    # word guesses ignore case and extra whitespace
+    game.new_game("sweet potato")
+    assert game.guess_word("Sweet   Potato ") == WIN
+    game.new_game("sweet potato")
+    assert game.guess_word("sweetpotato") == MISS
+
+
+def test_restore_resumes_a_game():
+    game = HangmanEngine("banana")
+    game.guess_letter("a")
+    game.guess_letter("z")
+    copy = HangmanEngine()
+    copy.restore("banana", game.guessed_mask, game.wrong_attempts)
+    assert (copy.remaining_mask, copy.wrong_attempts) == (game.remaining_mask, 1)
+    assert copy.guess_letter("a") == REPEAT
+    assert [copy.guess_letter(ch) for ch in "bn"] == [HIT, WIN]
+
+
+def test_reveal():
+    game = HangmanEngine("banana")
+    assert game.reveal(letter="n") == "n"
+    first = game.reveal(random.Random(1))
+    assert first in ("a", "b")
+    # n is already out, so the one letter left is revealed instead
+    assert game.reveal(letter="n") == ({"a", "b"} - {first}).pop()
+    assert game.won and game.wrong_attempts == 0
+    assert game.reveal() is None
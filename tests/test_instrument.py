@@ -0,0 +1,26 @@
+from hangman_instrument import Histogram, Instrumentation
+
+
+class Screen:
+    def draw(self, n):
+        return n * 2
+
+
+def test_patch_times_each_call_once():
+    inst = Instrumentation()
+    original = Screen.draw
+    inst.patch(Screen, "draw")
+    inst.patch(Screen, "draw")          # a second window patching the same class
+    assert Screen().draw(2) == 4
+    assert inst.handlers["Screen.draw"].count == 1
+    inst.unpatch()
+    assert Screen.draw is original
+
+
+def test_histogram_percentiles():
+    hist = Histogram()
+    for us in (3, 3, 3, 900):
+        hist.add(us / 1e6)
+    assert hist.percentile(0.5) == 0.004
+    assert hist.percentile(0.99) == 1.024
+    assert hist.as_dict()["count"] == 4
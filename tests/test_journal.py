@@ -0,0 +1,101 @@
+import itertools
+import os
+
+from hangman_alphabet import get_alphabet
+from hangman_journal import GameJournal, read_state
+
+EN = get_alphabet("en")
+RU = get_alphabet("ru")
+
+
+def journal(path, **kwargs):
+    kwargs.setdefault("fsync_interval", 0)
+    return GameJournal(str(path), clock=itertools.count(0.25, 0.25).__next__, **kwargs)
+
+
+def test_journal_restores_the_game_in_progress(tmp_path):
+    path = tmp_path / "journal"
+    j = journal(path)
+    assert j.pending() is None
+    j.start_game(3, "Hard", "Fruits", "груша", 6, RU)
+    for text in ("г", "я", "груши"):
+        j.guess(text)
+    j.hint("у")
+    j.pause()
+    j.close()
+
+    j = journal(path)
+    state = j.pending()
+    assert (state.seed, state.difficulty, state.category, state.alphabet) == (3, "Hard", "Fruits", RU)
+    assert state.word == "груша"
+    assert state.game.wrong_attempts == 2
+    assert (state.guesses, state.hints, state.paused) == (3, 1, True)
+    j.end_game(True)
+    j.close()
+    assert journal(path).pending() is None
+
+
+def test_journal_drops_a_torn_tail(tmp_path):
+    path = tmp_path / "journal"
+    j = journal(path)
+    j.start_game(1, "Easy", "Mixed", "plum", 6, EN)
+    j.guess("p")
+    j.guess("word-guess")
+    j.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    state = journal(path).pending()
+    assert state.word == "plum" and state.guesses == 1
+
+
+def test_journal_survives_a_corrupt_snapshot(tmp_path):
+    path = tmp_path / "journal"
+    j = journal(path)
+    j.start_game(1, "Easy", "Mixed", "plum", 6, EN)
+    j.compact()
+    j.close()
+    snap = str(path) + ".snap"
+    with open(snap, "r+b") as f:
+        f.truncate(os.path.getsize(snap) - 4)
+    assert read_state(str(path))[1] is None
+    assert journal(path).pending() is None
+
+
+def test_journal_compaction_keeps_the_game(tmp_path):
+    path = tmp_path / "journal"
+    j = journal(path, compact_every=4)
+    j.start_game(1, "Easy", "Mixed", "watermelon", 6, EN)
+    for letter in "wtrxyz":
+        j.guess(letter)
+    assert j.epoch == 2     # compacted once mid-game
+    j.close()
+    state = journal(path).pending()
+    assert state.guesses == 6 and state.game.wrong_attempts == 3
+
+
+def test_journal_reads_next_before_the_rename(tmp_path):
+    # a crash between opening .next and renaming it over the journal
+    path = tmp_path / "journal"
+    j = journal(path)
+    j.start_game(1, "Easy", "Mixed", "plum", 6, EN)
+    j.guess("p")
+    j._finish = lambda job: None
+    j.compact()
+    j.guess("l")
+    j.close()
+    assert os.path.exists(str(path) + ".next")
+    state = journal(path).pending()
+    assert state.guesses == 2
+
+
+def test_journal_fsync_thread(tmp_path):
+    path = tmp_path / "journal"
+    j = journal(path, fsync_interval=0.01, compact_every=2)
+    j.start_game(1, "Easy", "Mixed", "watermelon", 6, EN)
+    for letter in "watermel":
+        j.guess(letter)
+    j.close()
+    state = journal(path).pending()
+    assert state.guesses == 7
+
+
@@ -0,0 +1,78 @@
+import pytest
+
+from hangman_loader import NormalizedCache, iter_entries, load_files, load_index
+from hangman_words import CATEGORY_FLAGS, MIXED
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_txt_plain_and_tab_columns(tmp_path):
+    path = write(tmp_path, "words.txt", "apple\nkiwi\tHard\nleek\tMedium\tVegetables\n")
+    assert list(iter_entries(path, "Easy", MIXED)) == [
+        ("apple", "Easy", MIXED),
+        ("kiwi", "Hard", MIXED),
+        ("leek", "Medium", "Vegetables"),
+    ]
+
+
+def test_csv_columns_in_any_order(tmp_path):
+    path = write(tmp_path, "words.csv", "Category,Word\nFruits,plum\n,leek\n")
+    assert list(iter_entries(path, "Easy", MIXED)) == [("plum", "Easy", "Fruits"), ("leek", "Easy", MIXED)]
+
+
+def test_jsonl_fields_and_defaults(tmp_path):
+    path = write(tmp_path, "words.jsonl",
+                 '{"word": "plum", "difficulty": "Hard", "category": "Fruits"}\n\n{"word": "leek"}\n')
+    assert list(iter_entries(path, "Easy", MIXED)) == [("plum", "Hard", "Fruits"), ("leek", "Easy", MIXED)]
+
+
+@pytest.mark.parametrize("line, name", [
+    ('{"word": "plum", "difficulty": 2}', "difficulty"),
+    ('{"word": "plum", "category": ["Fruits"]}', "category"),
+    ('{"word": 7}', "word"),
+])
+def test_jsonl_rejects_non_string_fields(tmp_path, line, name):
+    path = write(tmp_path, "words.jsonl", '{"word": "kiwi"}\n\n' + line + "\n")
+    with pytest.raises(ValueError, match=f"line 3: '{name}' must be a string"):
+        list(iter_entries(path))
+
+
+def test_jsonl_errors_give_the_line(tmp_path):
+    path = write(tmp_path, "words.jsonl", '{"word": "kiwi"}\n{"word": \n')
+    with pytest.raises(ValueError, match="line 2: "):
+        list(iter_entries(path))
+
+
+def test_jsonl_rejects_lines_that_are_not_objects(tmp_path):
+    path = write(tmp_path, "words.jsonl", '{"word": "kiwi"}\n"pear"\n')
+    with pytest.raises(ValueError, match="line 2: .*JSON object"):
+        list(iter_entries(path))
+
+
+def test_plain_list_loads_with_defaults(tmp_path):
+    # words without difficulty / category columns used to be dropped
+    path = write(tmp_path, "words.txt", "apple\nbanana\ncherry\n")
+    index, report = load_index([path])
+    assert report.words == 3
+    assert sorted(index.pool_words("Easy", MIXED)) == ["apple", "banana", "cherry"]
+    assert sorted(index.pool_words("Easy", "Fruits")) == ["apple", "banana", "cherry"]
+
+    index, _ = load_index([path], category="Vegetables")
+    assert sorted(index.pool_words("Easy", "Vegetables")) == ["apple", "banana", "cherry"]
+    assert not any(index.category_flags[i] & CATEGORY_FLAGS["Fruits"] for i in range(len(index)))
+
+
+def test_cache_is_keyed_by_defaults(tmp_path):
+    path = write(tmp_path, "words.txt", "apple\nbanana\n")
+    cache = NormalizedCache(str(tmp_path / "cache"))
+    first, _ = load_files([path], cache=cache)
+    again, _ = load_files([path], cache=cache)
+    other, _ = load_files([path], cache=cache, difficulty="Hard")
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert list(again) == list(first)
+    assert list(again.difficulty_flags) == list(first.difficulty_flags)
+    assert list(other.difficulty_flags) != list(first.difficulty_flags)
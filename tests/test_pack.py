@@ -0,0 +1,97 @@
+import pytest
+
+import hangman_pack
+from hangman_alphabet import get_alphabet
+from hangman_loader import WordStore
+from hangman_pack import _HEADER, _POOL, WordPack, compile_pack
+from hangman_words import (CATEGORY_FLAGS, DIFFICULTY_FLAGS, MIXED, WORD_INDEX, WORD_LISTS, WordIndex,
+                           pool_keys)
+
+RU = get_alphabet("ru")
+
+
+def make_store(lists, alphabet=get_alphabet("en")):
+    store = WordStore(alphabet)
+    for (d, c), words in lists.items():
+        for w in words:
+            store.add(w, DIFFICULTY_FLAGS[d], CATEGORY_FLAGS[c])
+    return store
+
+
+def test_pack_round_trip(tmp_path):
+    store = make_store(WORD_LISTS)
+    index = WordIndex(store, store.difficulty_flags, store.category_flags)
+    path = str(tmp_path / "words.pack")
+    compile_pack(path, store)
+    with WordPack(path) as pack:
+        assert list(pack) == list(store)
+        assert pack[-1] == store[len(store) - 1]
+        assert bytes(pack.difficulty_flags) == bytes(store.difficulty_flags)
+        assert bytes(pack.category_flags) == bytes(store.category_flags)
+        for key in pool_keys():
+            assert list(pack.pools[key]) == list(index.pool(*key))
+        assert pack.index().pool_words("Hard", "Fruits") == WORD_INDEX.pool_words("Hard", "Fruits")
+
+
+def test_pack_keeps_the_alphabet(tmp_path):
+    path = str(tmp_path / "ru.pack")
+    compile_pack(path, make_store({("Easy", "Fruits"): ["яблоко", "груша"]}, RU))
+    with WordPack(path) as pack:
+        assert pack.alphabet is RU
+        assert list(pack) == ["яблоко", "груша"]
+        assert pack.index().alphabet is RU
+
+
+def test_close_unmaps(tmp_path):
+    path = str(tmp_path / "words.pack")
+    compile_pack(path, make_store(WORD_LISTS))
+    pack = WordPack(path)
+    index = pack.index()
+    pack.close()
+    with pytest.raises(ValueError):
+        index.choose("Easy", MIXED)
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / "words.pack"
+    path.write_bytes(b"HMPK")
+    with pytest.raises(ValueError, match="not a version"):
+        WordPack(str(path))
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_compile_plain_list(tmp_path, capsys):
+    src = write(tmp_path, "words.txt", "apple\nbanana\ncherry\n")
+    out = str(tmp_path / "words.pack")
+    hangman_pack.main(["compile", out, src])
+    with WordPack(out) as pack:
+        assert sorted(pack.index().pool_words("Easy", MIXED)) == ["apple", "banana", "cherry"]
+
+
+def test_compile_without_easy_words_exits_cleanly(tmp_path, capsys):
+    src = write(tmp_path, "words.txt", "apple\nbanana\n")
+    with pytest.raises(SystemExit) as exc:
+        hangman_pack.main(["compile", str(tmp_path / "words.pack"), src, "--difficulty", "hard"])
+    assert exc.value.code == 1
+    assert "--difficulty" in capsys.readouterr().err
+
+
+def test_info_on_a_pack_without_words(tmp_path, capsys):
+    path = str(tmp_path / "words.pack")
+    compile_pack(path, make_store(WORD_LISTS))
+    # empty every pool, as a pack of words the game can't play would have them
+    with open(path, "r+b") as f:
+        s_pool = _HEADER.unpack(f.read(_HEADER.size))[8]
+        f.seek(s_pool)
+        f.write(_POOL.pack(0, 0) * len(pool_keys()))
+    hangman_pack.main(["info", path])
+    out = capsys.readouterr().out
+    assert "Easy     Mixed       0" in out and "can't play" in out
+
+    with pytest.raises(SystemExit):
+        hangman_pack.main(["info", str(tmp_path / "missing.pack")])
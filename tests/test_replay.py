@@ -0,0 +1,54 @@
+from hangman_alphabet import get_alphabet
+from hangman_replay import ABANDONED, END, LOST, WON, ReplayWriter, read_log, replay, replay_game
+
+EN = get_alphabet("en")
+RU = get_alphabet("ru")
+EL = get_alphabet("el")
+
+
+def play(writer, word, moves, alphabet=EN, won=None):
+    writer.start_game(7, "Medium", "Vegetables", word, alphabet=alphabet)
+    for kind, value in moves:
+        getattr(writer, kind)(*value)
+    if won is not None:
+        writer.end_game(won)
+
+
+def test_replay_round_trip(tmp_path, clock):
+    path = str(tmp_path / "games.hmr")
+    writer = ReplayWriter(path, clock)
+    play(writer, "carrot", [("guess", ("c",)), ("pause", ()), ("resume", ()), ("guess", ("x",)),
+                           ("hint", ("r",)), ("guess", ("carrot",))], won=True)
+    play(writer, "морковь", [("guess", ("м",)), ("guess", ("ё",)), ("hint", ("о",)),
+                            ("guess", ("q",))], RU, won=False)
+    play(writer, "σέλινο", [("guess", ("σ",)), ("hint", ("λ",))], EL)
+    writer.close()
+
+    games = list(read_log(path))
+    assert [g.word for g in games] == ["carrot", "морковь", "σέλινο"]
+    assert [g.outcome for g in games] == [WON, LOST, ABANDONED]
+    first = games[0]
+    assert (first.seed, first.difficulty, first.category) == (7, "Medium", "Vegetables")
+    assert [(k, v) for k, _, v in first.events][-1] == (END, WON)
+    assert first.duration_ms == 250 * len(first.events)
+    assert [v for _, _, v in games[1].events[:4]] == ["м", "ё", "о", "q"]
+    assert games[1].alphabet is RU and games[2].alphabet is EL
+
+    game, outcome, moves = replay_game(first)
+    assert (outcome, moves, game.wrong_attempts) == (WON, 4, 1)
+    _, outcome, moves = replay_game(games[2])
+    assert (outcome, moves) == (ABANDONED, 2)
+
+
+def test_replay_reports_a_bad_hint_and_carries_on(tmp_path, clock):
+    path = str(tmp_path / "games.hmr")
+    writer = ReplayWriter(path, clock)
+    play(writer, "plum", [("guess", ("plum",)), ("hint", ("l",))], won=True)     # hint after the win
+    play(writer, "kiwi", [("hint", ("k",)), ("hint", ("k",))], won=False)        # k is already out
+    play(writer, "pear", [("guess", ("pear",))], won=True)
+    writer.close()
+    result = replay(path)
+    assert result["games"] == 3
+    assert [(i, word) for i, word, _ in result["mismatches"]] == [(0, "plum"), (1, "kiwi")]
+    assert "can't be revealed at move 2" in result["mismatches"][1][2]
+    assert result["outcomes"]["won"] == 1
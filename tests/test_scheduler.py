@@ -0,0 +1,63 @@
+import random
+from array import array
+
+from hangman_scheduler import SMALL_BAG, ShuffleBag, WordScheduler, shuffled
+from hangman_words import CATEGORY_FLAGS, DIFFICULTY_FLAGS, WordIndex
+
+
+def test_bag_cycles_without_repeats():
+    for n in (1, 2, 50, SMALL_BAG + 10):
+        bag = ShuffleBag.fresh(n, random.Random(n))
+        for _ in range(3):
+            assert sorted(bag.next() for _ in range(n)) == list(range(n))
+
+
+def test_small_bag_walks_its_permutation():
+    bag = ShuffleBag(100, 1234)
+    assert [bag.next() for _ in range(100)] == shuffled(100, 1234)
+    first = bag.next()      # reshuffled
+    assert [first] + [bag.next() for _ in range(99)] == shuffled(100, bag.key)
+
+
+def test_bag_resumes_from_its_cursor():
+    for n in (300, SMALL_BAG + 300):
+        bag = ShuffleBag.fresh(n, random.Random(2))
+        for _ in range(123):
+            bag.next()
+        copy = ShuffleBag(*bag.cursor)
+        assert [bag.next() for _ in range(400)] == [copy.next() for _ in range(400)]
+
+
+def test_scheduler_saves_and_loads_its_bags(tmp_path):
+    index = WordIndex.from_lists({("Easy", "Fruits"): ["apple", "pear", "plum", "kiwi"]})
+    scheduler = WordScheduler(index, random.Random(1))
+    drawn = [scheduler.choose("Easy", "Fruits") for _ in range(2)]
+    path = str(tmp_path / "bags.json")
+    scheduler.save(path)
+    copy = WordScheduler.load(path, index)
+    rest = [copy.choose("Easy", "Fruits") for _ in range(2)]
+    assert sorted(drawn + rest) == ["apple", "kiwi", "pear", "plum"]
+
+
+def test_scheduler_starts_over_when_a_pool_changes():
+    # a reload keeps the word table and rebuilds the index over new flags
+    words = ("apple", "pear", "plum", "kiwi", "leek")
+    fruits, vegetables = CATEGORY_FLAGS["Fruits"], CATEGORY_FLAGS["Vegetables"]
+    easy = array("B", [DIFFICULTY_FLAGS["Easy"]] * 5)
+
+    def reload(*categories):
+        return WordIndex(words, easy, array("B", categories))
+
+    scheduler = WordScheduler(reload(fruits, fruits, fruits, 0, vegetables), random.Random(3))
+    scheduler.choose("Easy", "Fruits")
+    bag = scheduler.bag("Easy", "Fruits")
+
+    # same words in a new index: the bag carries on
+    scheduler.index = reload(fruits, fruits, fruits, 0, vegetables)
+    assert scheduler.bag("Easy", "Fruits") is bag
+
+    # same size, plum swapped for kiwi: a new cycle
+    scheduler.index = reload(fruits, fruits, 0, fruits, vegetables)
+    drawn = [scheduler.choose("Easy", "Fruits") for _ in range(3)]
+    assert scheduler.bag("Easy", "Fruits") is not bag
+    assert sorted(drawn) == ["apple", "kiwi", "pear"]
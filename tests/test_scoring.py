@@ -0,0 +1,25 @@
+from hangman_scoring import ScoreCache, bucket_thresholds, difficulty_flags, score_all
+from hangman_words import DIFFICULTIES, DIFFICULTY_FLAGS
+
+
+def test_bucket_thresholds_split_ties():
+    words = [f"w{i:02}" for i in range(40)]
+    scores = [0.0] * 30 + [0.5] * 10       # most words tie on the easiest score
+    thresholds = bucket_thresholds(scores, words)
+    flags = difficulty_flags(scores, thresholds, words)
+    counts = {d: sum(1 for f in flags if f == DIFFICULTY_FLAGS[d]) for d in DIFFICULTIES}
+    assert counts == {"Easy": 10, "Medium": 10, "Hard": 10, "Extreme": 10}
+    # a tier never mixes words of a higher score into a lower one
+    assert all(flags[i] == DIFFICULTY_FLAGS["Extreme"] for i in range(30, 40))
+
+
+def test_score_cache_is_keyed_by_seed(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.db"))
+    words = ["plum", "kiwi", "banana"]
+    *_, played = score_all(words, guesser="frequency", seed=1, cache=cache)
+    assert played == 3
+    *_, played = score_all(words, guesser="frequency", seed=1, cache=cache)
+    assert played == 0
+    *_, played = score_all(words, guesser="frequency", seed=2, cache=cache)
+    assert played == 3
+    cache.close()
@@ -0,0 +1,25 @@
+import random
+
+from hangman_engine import HangmanEngine
+from hangman_selfplay import FrequencyGuesser, play_game, run
+from hangman_words import WORD_INDEX
+
+
+def test_frequency_guesser_never_returns_none():
+    guesser = FrequencyGuesser(WORD_INDEX, "Easy", "Fruits", random.Random(0))
+    guesser.order = guesser.order[:3]
+    assert guesser.guess("".join(guesser.order), "") not in (None, *guesser.order)
+
+
+def test_play_game_ends():
+    game = HangmanEngine("banana")
+    guesser = FrequencyGuesser(WORD_INDEX, None, None, random.Random(0))
+    assert play_game(game, guesser) <= 26
+    assert game.over
+
+
+def test_run_is_deterministic_across_workers():
+    one = run(60, workers=1, seed=3)
+    two = run(60, workers=2, seed=3)
+    assert one["games"] == two["games"] == 60
+    assert one["win_rate"] == two["win_rate"]
@@ -0,0 +1,36 @@
+import random
+
+from hangman_server import HangmanServer
+
+
+def test_server_plays_a_game():
+    server = HangmanServer(rng=random.Random(1))
+    out = server.handle({"id": 1, "action": "start", "difficulty": "Easy", "category": "Fruits"})
+    assert out["ok"] and out["id"] == 1
+    out = server.handle({"action": "guess", "session": out["session"], "guess": "e"})
+    assert out["ok"]
+
+
+def test_server_rejects_non_string_fields():
+    server = HangmanServer(rng=random.Random(1))
+    for request in ({"id": 1, "action": 5},
+                    {"id": 2, "action": "start", "difficulty": ["Easy"]},
+                    {"id": 3, "action": "start", "category": 1},
+                    {"id": 4, "action": "guess", "session": {}}):
+        out = server.handle(request)
+        assert out["ok"] is False and out["id"] == request["id"], out
+    assert server.handle([1, 2]) == {"id": None, "ok": False, "error": "request must be a JSON object"}
+
+    sid = server.handle({"action": "start"})["session"]
+    out = server.handle({"action": "guess", "session": sid, "guess": 7})
+    assert out == {"id": None, "ok": False, "error": "'guess' must be a string"}
+    assert server.stats["errors"] == 6
+
+
+def test_server_normalises_a_guess_before_choosing_letter_or_word():
+    server = HangmanServer(rng=random.Random(1))
+    sid = server.handle({"action": "start"})["session"]
+    out = server.handle({"action": "guess", "session": sid, "guess": "E\u0301"})     # e + combining acute
+    assert out["ok"] and out["guessed"] == "e"
+    again = server.handle({"action": "guess", "session": sid, "guess": "e"})
+    assert again["error"] == "You already guessed 'e'."
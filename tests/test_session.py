@@ -0,0 +1,23 @@
+from hangman_alphabet import get_alphabet
+from hangman_engine import HangmanEngine
+from hangman_session import RECORD, SessionRecord
+
+RU = get_alphabet("ru")
+
+
+def test_session_record_round_trip():
+    record = SessionRecord.new(12, "кот", "Extreme", "Mixed", 5, RU)
+    game = record.load(HangmanEngine(alphabet=RU), {12: "кот"})
+    game.guess_letter("к")
+    game.guess_letter("я")
+    record.store(game)
+    record.paused = True
+    record.add_hint()
+    buf = bytearray(RECORD.size * 2)
+    record.pack_into(buf, RECORD.size)
+    copy = SessionRecord.from_bytes(buf, RECORD.size)
+    assert copy == record
+    assert SessionRecord.from_bytes(record.to_bytes()) == record
+    assert (copy.difficulty, copy.category, copy.max_attempts) == ("Extreme", "Mixed", 5)
+    assert (copy.wrong_attempts, copy.hints, copy.paused, copy.over) == (1, 1, True, False)
+    assert copy.guessed_mask == RU.word_mask("кя")
@@ -0,0 +1,31 @@
+from hangman_engine import HangmanEngine
+from hangman_solver import Solver, smart_hint
+from hangman_words import WORD_INDEX
+
+WORDS = ["banana", "bandit", "cabana", "kiwi", "lime", "pear", "plum", "apple", "grape", "mango"]
+
+
+def test_candidates():
+    solver = Solver(WORDS)
+    assert sorted(solver.candidates("_a_a_a")) == ["banana", "cabana"]
+    assert solver.candidates("_a_a_a", wrong="c") == ["banana"]
+    assert solver.candidates("p___", wrong="") == ["pear", "plum"]
+    assert solver.count("______") == 3
+
+
+def test_opening_scores_match_a_full_scan():
+    # the opening state is precomputed; it must agree with scoring the candidates
+    solver = Solver(WORD_INDEX.words)
+    for n, bucket in solver.buckets.items():
+        letters = solver.alphabet.letters
+        assert solver.letter_scores("_" * n) == solver._scores(bucket, bucket.all, list(range(n)), letters)
+    scores = solver.letter_scores("_____", allowed="aeiou")
+    assert set(scores) <= set("aeiou")
+
+
+def test_smart_hint_is_a_missing_letter():
+    solver = Solver(WORDS)
+    game = HangmanEngine("banana")
+    game.guess_letter("a")
+    assert smart_hint(solver, game) in ("b", "n")
+    assert solver.suggest("zzzzzz") is None
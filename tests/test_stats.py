@@ -0,0 +1,17 @@
+import logging
+
+from hangman_stats import GameResult, StatsStore
+
+
+def test_stats_bad_record_does_not_block_flush(tmp_path, caplog):
+    store = StatsStore(str(tmp_path / "stats.db"), flush_interval=0.01)
+    result = GameResult("plum", "Easy", "Fruits", 5, 0, 1, 12.5, True, "Ann")
+    with caplog.at_level(logging.ERROR, logger="hangman_stats"):
+        store.record(result._replace(wrong_attempts=None, guesses=object()))
+        assert store.flush(timeout=5)
+    store.record(result)
+    assert store.flush(timeout=5)
+    store.close()
+    assert (store.written, store.errors) == (1, 1)
+    assert "couldn't save" in caplog.text
+    assert store.win_rates()
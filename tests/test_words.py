@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from hangman_loader import load_index
+
+from hangman_words import (CATEGORY_FLAGS, DIFFICULTY_FLAGS, MIXED, WORD_INDEX, WORD_LISTS, WordIndex,
+                           any_categories, base_keys, pair_flags, pool_keys)
+
+
+def test_pools_match_the_word_lists():
+    for (d, c), words in WORD_LISTS.items():
+        assert sorted(WORD_INDEX.pool_words(d, c)) == sorted(words)
+    easy = set(WORD_LISTS[("Easy", "Fruits")]) | set(WORD_LISTS[("Easy", "Vegetables")])
+    assert sorted(WORD_INDEX.pool_words("Easy", MIXED)) == sorted(easy)
+
+
+def test_pools_are_read_only():
+    with pytest.raises(TypeError):
+        WORD_INDEX.pool("Easy", "Fruits")[0] = 1
+
+
+def test_fallbacks():
+    index = WordIndex.from_lists({("Easy", "Fruits"): ["apple"], ("Medium", "Vegetables"): ["leek"]})
+    assert index.pool_words("Medium", "Fruits") == ["apple"]
+    assert index.pool_words("Hard", "Vegetables") == ["leek"]
+    assert index.pool_words("Extreme", MIXED) == ["apple"]      # no Extreme or Hard words: Easy/Mixed
+    assert index.pool_words("Nope", "Fruits") == index.pool_words("Easy", MIXED)
+
+
+def test_word_listed_under_two_pairs_is_in_just_those_pools():
+    index = WordIndex.from_lists({("Easy", "Fruits"): ["plum", "apple"], ("Hard", "Vegetables"): ["plum"],
+                                  ("Easy", "Vegetables"): ["leek"], ("Hard", "Fruits"): ["kiwi"]})
+    assert sorted(index.pool_words("Easy", "Fruits")) == ["apple", "plum"]
+    assert index.pool_words("Easy", "Vegetables") == ["leek"]
+    assert index.pool_words("Hard", "Fruits") == ["kiwi"]
+    assert index.pool_words("Hard", "Vegetables") == ["plum"]
+    assert sorted(index.pool_words("Hard", MIXED)) == ["kiwi", "plum"]
+
+
+def test_loaded_word_keeps_its_pairs(tmp_path):
+    # also for words merged from several lines or files (loader, reload)
+    path = tmp_path / "words.txt"
+    path.write_text("plum\tEasy\tFruits\nleek\tEasy\tVegetables\nplum\tHard\tVegetables\n", encoding="utf-8")
+    index, _ = load_index([str(path)])
+    assert index.pool_words("Easy", "Vegetables") == ["leek"]
+    assert index.pool_words("Hard", "Vegetables") == ["plum"]
+    assert index.pool_words("Hard", "Fruits") == ["plum"]     # falls back to Easy/Fruits, not a plum of its own
+    assert index.pool("Hard", "Fruits").obj is index.pool("Easy", "Fruits").obj
+
+
+def test_pair_flags():
+    easy, hard = DIFFICULTY_FLAGS["Easy"], DIFFICULTY_FLAGS["Hard"]
+    fruits, vegetables = CATEGORY_FLAGS["Fruits"], CATEGORY_FLAGS["Vegetables"]
+    cf = pair_flags(easy, fruits) | pair_flags(hard, vegetables)
+    assert any_categories(cf) == fruits | vegetables
+    assert base_keys(easy | hard, cf) == (("Easy", MIXED), ("Easy", "Fruits"),
+                                         ("Hard", MIXED), ("Hard", "Vegetables"))
+    assert base_keys(easy | hard, pair_flags(easy | hard, fruits)) == (
+        ("Easy", MIXED), ("Easy", "Fruits"), ("Hard", MIXED), ("Hard", "Fruits"))
+
+
+def test_choose_draws_from_the_pool():
+    rng = random.Random(5)
+    for key in pool_keys():
+        assert WORD_INDEX.choose(*key, rng=rng) in WORD_INDEX.pool_words(*key)